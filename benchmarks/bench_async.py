@@ -0,0 +1,68 @@
+"""
+Задержка цикла событий при одновременном изменении категории.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_async [количество корутин]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from src.aio import AsyncCategory
+from src.models import Category, Product, quiet
+
+
+def slow_policy(product, old_price: float, new_price: float) -> bool:
+    """Политика, имитирующая долгое подтверждение."""
+    time.sleep(0.05)
+    return True
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.001) -> list:
+    """Измеряет запаздывание пробуждений задачи относительно интервала."""
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+async def run(tasks: int):
+    """Запускает нагрузку и возвращает задержки и время работы."""
+    with quiet():
+        products = [Product(f"Товар {i}", "", 100.0, 1000)
+                    for i in range(100)]
+        extra = [Product(f"Новый {i}", "", 10.0, 1) for i in range(100_000)]
+    facade = AsyncCategory(
+        Category("Товары", "Нагрузка", products), price_policy=slow_policy
+    )
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(stop))
+    start = time.perf_counter()
+    with quiet():
+        await asyncio.gather(
+            facade.add_products(extra),
+            *(facade.update_stock(products[i % 100], -1)
+              for i in range(tasks)),
+            *(facade.set_price(products[i], 90.0) for i in range(10)),
+        )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return await lag_task, elapsed
+
+
+def main(tasks: int = 10_000):
+    """Выводит задержки цикла событий под нагрузкой."""
+    lags, elapsed = asyncio.run(run(tasks))
+    lags.sort()
+    print(f"Корутин: {tasks}, время: {elapsed:.2f} с")
+    print(f"Задержка цикла: медиана {statistics.median(lags) * 1000:.2f} мс, "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1000:.2f} мс, "
+          f"максимум {lags[-1] * 1000:.2f} мс")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,52 @@
+"""
+Фасетная фильтрация по индексу против перебора товаров.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_facets [количество]
+"""
+import sys
+import time
+
+from benchmarks.bench_snapshot import build_catalog
+from src.facets import FacetIndex
+
+
+def main(count: int = 1_000_000):
+    """Выводит время фильтрации и подсчета значений полей."""
+    categories = build_catalog(count)
+    products = [p for c in categories for p in c.products_objects]
+
+    start = time.perf_counter()
+    index = FacetIndex(categories)
+    built = time.perf_counter() - start
+    print(f"Товаров: {len(index)}, построение индекса: {built:.2f} с")
+
+    start = time.perf_counter()
+    scanned = [
+        p for p in products
+        if getattr(p, 'model', None) in ('M3', 'M7')
+        and getattr(p, 'color', None) == 'Серый'
+    ]
+    scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = index.filter(model=['M3', 'M7'], color='Серый')
+    indexed = time.perf_counter() - start
+    assert found == scanned
+
+    start = time.perf_counter()
+    index.filter(model='M3', memory=512)
+    empty = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.facet_counts(['model', 'memory'], model='M3')
+    counted = time.perf_counter() - start
+
+    print(f"Перебор: {scan * 1000:.1f} мс, индекс: {indexed * 1000:.1f} мс "
+          f"({len(found)} товаров)")
+    print(f"Пустой результат: {empty * 1000:.3f} мс")
+    print(f"Подсчет значений: {counted * 1000:.1f} мс")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
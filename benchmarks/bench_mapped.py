@@ -0,0 +1,52 @@
+"""
+Время запуска с отображенным в память каталогом против загрузки снимка.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_mapped [количество]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_snapshot import build_catalog
+from src.mapped import MappedCatalog, write_mapped_catalog
+from src.snapshot import load_snapshot, save_snapshot
+
+
+def main(count: int = 1_000_000):
+    """Выводит время открытия каталога и первых обращений к товарам."""
+    categories = build_catalog(count)
+    with tempfile.TemporaryDirectory() as directory:
+        mapped_path = os.path.join(directory, 'catalog.map')
+        snapshot_path = os.path.join(directory, 'catalog.bin')
+        write_mapped_catalog(mapped_path, categories)
+        save_snapshot(snapshot_path, categories)
+
+        start = time.perf_counter()
+        catalog = MappedCatalog(mapped_path)
+        opened = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for row in range(0, len(catalog), max(1, len(catalog) // 1000)):
+            str(catalog[row])
+        accessed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        total = catalog.total_quantity()
+        summed = time.perf_counter() - start
+        catalog.close()
+
+        start = time.perf_counter()
+        load_snapshot(snapshot_path)
+        loaded = time.perf_counter() - start
+
+    print(f"Товаров: {count}, остаток: {total}")
+    print(f"Открытие отображенного каталога: {opened * 1000:.1f} мс")
+    print(f"1000 обращений к товарам: {accessed * 1000:.1f} мс")
+    print(f"Сумма остатков по колонке: {summed * 1000:.1f} мс")
+    print(f"Загрузка снимка в объекты: {loaded:.2f} с")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,86 @@
+"""
+Сравнение объема памяти на один товар: слоты против словаря экземпляра.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_memory [количество]
+"""
+import sys
+import tracemalloc
+
+from src.models import LawnGrass, Product, Smartphone, quiet
+
+
+class DictProduct:
+    """Товар с атрибутами в словаре экземпляра, как до перехода на слоты."""
+
+    def __init__(self, name, description, price, quantity):
+        self.name = name
+        self.description = description
+        self.__price = price
+        self.quantity = quantity
+
+
+class DictSmartphone(DictProduct):
+    """Смартфон с атрибутами в словаре экземпляра."""
+
+    def __init__(self, name, description, price, quantity,
+                 efficiency, model, memory, color):
+        super().__init__(name, description, price, quantity)
+        self.efficiency = efficiency
+        self.model = model
+        self.memory = memory
+        self.color = color
+
+
+class DictLawnGrass(DictProduct):
+    """Газонная трава с атрибутами в словаре экземпляра."""
+
+    def __init__(self, name, description, price, quantity,
+                 country, germination_period, color):
+        super().__init__(name, description, price, quantity)
+        self.country = country
+        self.germination_period = germination_period
+        self.color = color
+
+
+CASES = [
+    ('Product', DictProduct, Product, ()),
+    ('Smartphone', DictSmartphone, Smartphone, (95.5, 'M1', 256, 'Gray')),
+    ('LawnGrass', DictLawnGrass, LawnGrass, ('Россия', '7 дней', 'Green')),
+]
+
+
+def bytes_per_object(factory, extra, count: int) -> float:
+    """
+    Измеряет средний объем памяти на один объект.
+
+    Строки и числа общие для всех объектов, поэтому учитывается только
+    размер самих экземпляров.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        with quiet():
+            objects = [
+                factory('Товар', 'Описание', 100.0, 1, *extra)
+                for _ in range(count)
+            ]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main(count: int = 100_000):
+    """Выводит таблицу с объемом памяти на товар."""
+    print(f"{'Класс':<12}{'__dict__':>12}{'__slots__':>12}{'Экономия':>10}")
+    for name, dict_class, slot_class, extra in CASES:
+        before = bytes_per_object(dict_class, extra, count)
+        after = bytes_per_object(slot_class, extra, count)
+        saving = 100 * (before - after) / before
+        print(f"{name:<12}{before:>12.1f}{after:>12.1f}{saving:>9.0f}%")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,62 @@
+"""
+Масштабирование параллельной загрузки каталога по числу процессов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_parallel [количество строк]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from src.loader import load_catalog, load_catalog_parallel
+
+
+def write_feed(path: str, count: int):
+    """Записывает файл поставщика с `count` строками и дубликатами."""
+    with open(path, 'w', encoding='utf-8') as file:
+        for i in range(count):
+            if i % 2:
+                row = {
+                    'type': 'Smartphone', 'category': 'Смартфоны',
+                    'name': f"Смартфон {i % (count // 4 or 1)}",
+                    'description': "256GB, Серый цвет",
+                    'price': 1000.0 + i % 100, 'quantity': 1,
+                    'efficiency': 90.5, 'model': 'M1', 'memory': 256,
+                    'color': 'Серый',
+                }
+            else:
+                row = {
+                    'type': 'LawnGrass', 'category': 'Сад',
+                    'name': f"Газон {i}", 'description': "Элитная трава",
+                    'price': 500.0, 'quantity': 10, 'country': 'Россия',
+                    'germination_period': '7 дней', 'color': 'Зеленый',
+                }
+            file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+def main(count: int = 200_000):
+    """Выводит время загрузки в одном и нескольких процессах."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'feed.jsonl')
+        write_feed(path, count)
+
+        start = time.perf_counter()
+        load_catalog(path)
+        sequential = time.perf_counter() - start
+        print(f"Строк: {count}")
+        print(f"Последовательно: {sequential:.2f} с")
+
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            start = time.perf_counter()
+            load_catalog_parallel(path, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(
+                f"Процессов: {workers}: {elapsed:.2f} с, "
+                f"ускорение {sequential / elapsed:.2f}x"
+            )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
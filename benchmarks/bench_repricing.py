@@ -0,0 +1,77 @@
+"""
+Массовое изменение цен по правилам против перебора товаров с сеттером.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_repricing [количество]
+"""
+import sys
+import time
+
+from benchmarks.bench_snapshot import build_catalog
+from src.models import LawnGrass, Smartphone, approve_all, price_policy
+from src.repricing import Rule, plan_repricing
+
+
+def scan_prices(category) -> list:
+    """Вычисляет новые цены перебором с проверками каждого товара."""
+    changes = []
+    for product in category.products_objects:
+        if isinstance(product, Smartphone) and product.model in ('M3', 'M7'):
+            changes.append((product, round(product.price * 0.9, 2)))
+        elif (isinstance(product, LawnGrass)
+              and product.country == 'Россия'):
+            changes.append((product, round(product.price * 1.05, 2)))
+    return changes
+
+
+def main(count: int = 1_000_000):
+    """
+    Выводит время составления и применения плана изменений.
+
+    Время применения включает обновление индекса цен категорий.
+    """
+    categories = build_catalog(count)
+    rules = [
+        Rule.percent(-10, Smartphone, model=lambda model: model in (
+            'M3', 'M7'
+        )),
+        Rule.percent(5, LawnGrass, country='Россия'),
+    ]
+
+    start = time.perf_counter()
+    for category in categories:
+        scan_prices(category)
+    scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plans = [plan_repricing(category, rules) for category in categories]
+    planned = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with price_policy(approve_all):
+        for plan in plans:
+            for change in plan.changes:
+                change.product.price = change.new_price
+    for category in categories:
+        category.products_in_price_range(1000.0, 2000.0)
+    setter = time.perf_counter() - start
+
+    # Возвращаем цены, чтобы применить тот же план через reprice
+    with price_policy(approve_all):
+        for plan in plans:
+            for change in plan.changes:
+                change.product.price = change.old_price
+
+    start = time.perf_counter()
+    applied = sum(len(plan.apply().applied) for plan in plans)
+    for category in categories:
+        category.products_in_price_range(1000.0, 2000.0)
+    bulk = time.perf_counter() - start
+
+    print(f"Товаров: {count}, изменений: {applied}")
+    print(f"Перебор с проверками: {scan:.2f} с, план: {planned:.2f} с")
+    print(f"Применение сеттером: {setter:.2f} с, через reprice: {bulk:.2f} с")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
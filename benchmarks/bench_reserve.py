@@ -0,0 +1,71 @@
+"""
+Пропускная способность резервирования товаров при конкуренции потоков.
+
+Сравнивает блокировки остатков по отдельным товарам с одной общей
+блокировкой на все оформление заказа.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_reserve [количество заказов на поток]
+"""
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from src.models import Category, Product
+
+
+def build_category(count: int = 1000) -> Category:
+    """Создает категорию с большим запасом каждого товара."""
+    products = [
+        Product._restore((f"Товар {i}", "Описание", 100.0, 10 ** 9))
+        for i in range(count)
+    ]
+    return Category("Товары", "Нагрузка", products)
+
+
+def checkout(category: Category, orders: int, seed: int, lock) -> int:
+    """Оформляет заказы из трех случайных товаров."""
+    products = category.products_objects
+    generator = random.Random(seed)
+    done = 0
+    for _ in range(orders):
+        order = {product: 1 for product in generator.sample(products, 3)}
+        with lock:
+            if category.reserve(order):
+                category.commit(order)
+                done += 1
+    return done
+
+
+def run(threads: int, orders: int, lock) -> float:
+    """Возвращает количество заказов в секунду."""
+    category = build_category()
+    before = category.total_quantity
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        done = sum(executor.map(
+            lambda seed: checkout(category, orders, seed, lock),
+            range(threads)
+        ))
+    elapsed = time.perf_counter() - start
+    # Каждый заказ списывает ровно три единицы
+    assert before - category.total_quantity == 3 * done
+    return done / elapsed
+
+
+def main(orders: int = 5000):
+    """Выводит пропускную способность для разного числа потоков."""
+    for threads in (1, 2, 4, 8):
+        striped = run(threads, orders, nullcontext())
+        single = run(threads, orders, threading.Lock())
+        print(
+            f"Потоков: {threads}: по товарам {striped:,.0f} заказов/с, "
+            f"общая блокировка {single:,.0f} заказов/с"
+        )
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
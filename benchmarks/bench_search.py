@@ -0,0 +1,40 @@
+"""
+Время построения поискового индекса и выполнения запросов.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_search [количество]
+"""
+import sys
+import time
+
+from benchmarks.bench_snapshot import build_catalog
+from src.search import SearchIndex
+
+QUERIES = (
+    "Смартфон 4242",
+    "газон 99",
+    "товар 12345",
+    "серый смарт",
+    "элитн",
+)
+
+
+def main(count: int = 1_000_000):
+    """Выводит время построения индекса и запросов."""
+    categories = build_catalog(count)
+
+    start = time.perf_counter()
+    index = SearchIndex(categories)
+    built = time.perf_counter() - start
+    print(f"Товаров: {len(index)}, построение индекса: {built:.2f} с")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        results = index.search(query)
+        elapsed = time.perf_counter() - start
+        print(f"{query!r}: {len(results)} результатов, "
+              f"{elapsed * 1000:.1f} мс")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,67 @@
+"""
+Время сохранения и загрузки снимка каталога.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_snapshot [количество]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.models import Category, LawnGrass, Product, Smartphone
+from src.snapshot import load_snapshot, save_snapshot
+
+
+def build_catalog(count: int) -> list:
+    """Создает три категории с `count` товарами в сумме."""
+    third = count // 3
+    phones = [
+        Smartphone._restore((
+            f"Смартфон {i}", "256GB, Серый цвет", 1000.0 + i, i % 50,
+            90.5, f"M{i % 10}", 256, "Серый"
+        ))
+        for i in range(third)
+    ]
+    grass = [
+        LawnGrass._restore((
+            f"Газон {i}", "Элитная трава", 500.0 + i, i % 50,
+            "Россия", "7 дней", "Зеленый"
+        ))
+        for i in range(third)
+    ]
+    other = [
+        Product._restore((f"Товар {i}", "Описание", 100.0 + i, i % 50))
+        for i in range(count - 2 * third)
+    ]
+    return [
+        Category("Смартфоны", "Техника", phones),
+        Category("Сад", "Растения", grass),
+        Category("Разное", "Прочие товары", other),
+    ]
+
+
+def main(count: int = 1_000_000):
+    """Выводит время сохранения и загрузки каталога."""
+    categories = build_catalog(count)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'catalog.bin')
+
+        start = time.perf_counter()
+        save_snapshot(path, categories)
+        saved = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_snapshot(path)
+        loaded = time.perf_counter() - start
+
+        size = os.path.getsize(path)
+
+    print(f"Товаров: {count}")
+    print(f"Размер файла: {size / 2 ** 20:.1f} МБ")
+    print(f"Сохранение: {saved:.2f} с")
+    print(f"Загрузка: {loaded:.2f} с")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
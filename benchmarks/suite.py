@@ -0,0 +1,269 @@
+"""
+Набор замеров горячих путей моделей с сохранением базовых значений.
+
+Запуск из корня проекта:
+    python -m benchmarks.suite [--save] [--threshold 0.2] [--quick]
+
+Результаты сравниваются с базовым файлом JSON. Если какой-либо замер
+стал медленнее базового больше чем на порог, программа завершается с
+кодом 1. С флагом `--save` текущие результаты записываются как новые
+базовые значения.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from contextlib import nullcontext, redirect_stdout
+
+from src.models import (Category, CategoryIterator, Product, ProductIndex,
+                        Smartphone, quiet)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Количество товаров для замеров `new_product` с поиском дубликатов
+DEDUP_SIZES = (1_000, 100_000, 1_000_000)
+
+# Замеры: название, признак тихого режима и функция подготовки,
+# возвращающая замеряемую функцию без аргументов
+CASES = []
+
+
+def case(name: str, quiet_mode: bool = True):
+    """Регистрирует функцию подготовки замера."""
+    def register(setup):
+        CASES.append((name, quiet_mode, setup))
+        return setup
+
+    return register
+
+
+def make_products(count: int) -> list:
+    """Создает `count` товаров без вызова конструктора."""
+    return [
+        Product._restore((f"Товар {i}", "Описание", 100.0 + i, 10))
+        for i in range(count)
+    ]
+
+
+def make_phone() -> Smartphone:
+    """Создает смартфон для замеров."""
+    with quiet():
+        return Smartphone(
+            "Samsung Galaxy S23 Ultra", "256GB, Серый цвет, 200MP камера",
+            180000.0, 5, 95.5, "S23 Ultra", 256, "Серый"
+        )
+
+
+@case('product_init_print', quiet_mode=False)
+@case('product_init_quiet')
+def _product_init():
+    return lambda: Product("Товар", "Описание", 100.0, 10)
+
+
+def _new_product_case(size: int):
+    """Регистрирует замер `new_product` для индекса из `size` товаров."""
+    @case(f'new_product_dedup_{size}')
+    def setup():
+        index = ProductIndex(make_products(size))
+        data = {
+            'name': f"ТОВАР {size // 2}", 'description': "Описание",
+            'price': 1.0, 'quantity': 1,
+        }
+        return lambda: Product.new_product(data, index)
+
+
+for _size in DEDUP_SIZES:
+    _new_product_case(_size)
+
+
+@case('new_product_list_1000')
+def _new_product_list():
+    products = make_products(1000)
+    data = {
+        'name': "Товар 999", 'description': "Описание",
+        'price': 1.0, 'quantity': 1,
+    }
+    return lambda: Product.new_product(data, products)
+
+
+@case('category_str')
+def _category_str():
+    category = Category("Товары", "Описание", make_products(1000))
+    return lambda: str(category)
+
+
+@case('category_products_cached')
+def _category_products():
+    category = Category("Товары", "Описание", make_products(1000))
+    return lambda: category.products
+
+
+@case('category_products_rebuild')
+def _category_products_rebuild():
+    category = Category("Товары", "Описание", make_products(1000))
+    product = category.products_objects[0]
+
+    def run():
+        product.quantity += 1
+        return category.products
+
+    return run
+
+
+@case('category_iterator_1000')
+def _category_iterator():
+    category = Category("Товары", "Описание", make_products(1000))
+
+    def run():
+        for _ in CategoryIterator(category):
+            pass
+
+    return run
+
+
+@case('product_repr')
+def _product_repr():
+    phone = make_phone()
+    return lambda: repr(phone)
+
+
+@case('product_add')
+def _product_add():
+    first, second = make_phone(), make_phone()
+    return lambda: first + second
+
+
+def measure(function, repeat: int = 5) -> float:
+    """
+    Замеряет время одного вызова функции.
+
+    Returns:
+        float: Лучшее из `repeat` измерений в секундах на вызов.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_suite(selected: str = None, quick: bool = False) -> dict:
+    """
+    Выполняет замеры.
+
+    Args:
+        selected (str, optional): Подстрока названия замеров для запуска.
+        quick (bool): Пропустить замер на миллионе товаров.
+
+    Returns:
+        dict: Время одного вызова в секундах по названию замера.
+    """
+    results = {}
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        for name, quiet_mode, setup in CASES:
+            if selected and selected not in name:
+                continue
+            if quick and name.endswith(str(DEDUP_SIZES[-1])):
+                continue
+            function = setup()
+            # Вывод сообщений замеряется, но не попадает в терминал
+            with quiet() if quiet_mode else nullcontext():
+                with redirect_stdout(devnull):
+                    results[name] = measure(function)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Сравнивает результаты с базовыми значениями.
+
+    Args:
+        results (dict): Текущие результаты.
+        baseline (dict): Базовые результаты.
+        threshold (float): Допустимое замедление, например 0.2 для 20 %.
+
+    Returns:
+        list: Названия замеров, замедлившихся больше порога.
+    """
+    return [
+        name for name, seconds in results.items()
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
+
+
+def missing(results: dict, baseline: dict) -> list:
+    """Названия замеров, для которых нет базовых значений."""
+    return [name for name in results if name not in baseline]
+
+
+def load_baseline(path: str) -> dict:
+    """Читает базовые результаты или возвращает пустой словарь."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['results']
+
+
+def save_baseline(path: str, results: dict):
+    """Записывает результаты как базовые."""
+    data = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def report(results: dict, baseline: dict):
+    """Выводит таблицу результатов с изменением относительно базовых."""
+    for name, seconds in results.items():
+        line = f"{name:<28} {seconds * 1e6:12.3f} мкс"
+        if name in baseline:
+            change = (seconds / baseline[name] - 1) * 100
+            line += (
+                f"  базовое {baseline[name] * 1e6:12.3f} мкс {change:+.1f} %"
+            )
+        print(line)
+
+
+def main(argv: list = None) -> int:
+    """
+    Запускает набор замеров из командной строки.
+
+    Returns:
+        int: Код завершения: 1, если обнаружено замедление.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('-k', dest='selected')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.selected, args.quick)
+    baseline = load_baseline(args.baseline)
+    report(results, baseline)
+
+    if args.save:
+        save_baseline(args.baseline, {**baseline, **results})
+        print(f"Базовые значения сохранены: {args.baseline}")
+        return 0
+
+    unknown = missing(results, baseline)
+    if unknown:
+        print(f"Нет базовых значений, замеры не проверены: "
+              f"{', '.join(unknown)}")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Замедление больше {args.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
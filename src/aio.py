@@ -0,0 +1,156 @@
+"""
+Асинхронный интерфейс категории для сервисов на asyncio.
+
+Изменения категории и товаров выполняются под `asyncio.Lock`, а
+подтверждение понижения цены ожидается асинхронно и не блокирует цикл
+событий, в том числе при использовании политики с `input()`.
+"""
+import asyncio
+import inspect
+
+from .models import Category, _announce, approve_all, get_price_policy
+
+
+def async_policy(policy):
+    """
+    Превращает политику подтверждения понижения цены в асинхронную.
+
+    Асинхронная политика возвращается без изменений, а обычная
+    вызывается в отдельном потоке через `asyncio.to_thread`.
+
+    Args:
+        policy: Функция `(product, old_price, new_price) -> bool`.
+
+    Returns:
+        callable: Корутина-функция с теми же аргументами.
+    """
+    if inspect.iscoroutinefunction(policy):
+        return policy
+
+    async def confirm(product, old_price: float, new_price: float) -> bool:
+        return await asyncio.to_thread(policy, product, old_price, new_price)
+
+    return confirm
+
+
+class AsyncCategory:
+    """
+    Асинхронный фасад над `Category`.
+
+    Множество корутин может одновременно добавлять товары и менять
+    остатки и цены: каждое изменение выполняется под `asyncio.Lock` и
+    не блокирует цикл событий.
+    """
+
+    def __init__(self, category: Category, price_policy=None):
+        """
+        Конструктор фасада.
+
+        Args:
+            category (Category): Категория для изменения.
+            price_policy (optional): Обычная или асинхронная политика
+                подтверждения понижения цены. По умолчанию используется
+                политика текущего контекста, см. `set_price_policy`.
+        """
+        self.category = category
+        self.price_policy = price_policy
+        self.__lock = asyncio.Lock()
+
+    def __str__(self):
+        """Строковое представление категории."""
+        return str(self.category)
+
+    @property
+    def products(self) -> list:
+        """Список строк с информацией о товарах категории."""
+        return self.category.products
+
+    async def add_product(self, product):
+        """
+        Добавляет товар в категорию.
+
+        Args:
+            product (Product): Товар для добавления.
+        """
+        async with self.__lock:
+            self.category.add_product(product)
+
+    async def add_products(self, products, batch_size: int = 100) -> int:
+        """
+        Добавляет товары в категорию пакетами.
+
+        Между пакетами управление возвращается циклу событий, поэтому
+        добавление большого числа товаров не задерживает другие задачи.
+
+        Args:
+            products: Итерируемый набор товаров.
+            batch_size (int): Количество товаров в одном пакете.
+
+        Returns:
+            int: Количество добавленных товаров.
+        """
+        added = 0
+        batch = []
+        for product in products:
+            batch.append(product)
+            if len(batch) >= batch_size:
+                added += await self.__add_batch(batch)
+                batch = []
+        if batch:
+            added += await self.__add_batch(batch)
+        return added
+
+    async def update_stock(self, product, delta: int) -> int:
+        """
+        Изменяет остаток товара на `delta`.
+
+        Args:
+            product (Product): Товар категории.
+            delta (int): Изменение количества, может быть отрицательным.
+
+        Returns:
+            int: Новое количество товара.
+
+        Raises:
+            ValueError: Если остаток станет отрицательным.
+        """
+        async with self.__lock:
+            quantity = product.quantity + delta
+            if quantity < 0:
+                raise ValueError("Недостаточно товара на складе")
+            product.quantity = quantity
+            return quantity
+
+    async def set_price(self, product, new_price: float) -> bool:
+        """
+        Устанавливает цену товара с асинхронным подтверждением понижения.
+
+        Подтверждение ожидается без блокировки, поэтому другие корутины
+        продолжают работу. Если за это время цена изменилась, понижение
+        подтверждается заново.
+
+        Args:
+            product (Product): Товар категории.
+            new_price (float): Новая цена.
+
+        Returns:
+            bool: True, если цена изменена.
+        """
+        policy = async_policy(self.price_policy or get_price_policy())
+        while True:
+            old_price = product.price
+            if 0 < new_price < old_price:
+                if not await policy(product, old_price, new_price):
+                    _announce("Изменение цены отменено")
+                    return False
+            async with self.__lock:
+                if product.price == old_price:
+                    return product._set_price(new_price, approve_all)
+
+    async def __add_batch(self, batch: list) -> int:
+        """Добавляет пакет товаров и уступает цикл событий."""
+        async with self.__lock:
+            for product in batch:
+                self.category.add_product(product)
+        await asyncio.sleep(0)
+        return len(batch)
@@ -0,0 +1,327 @@
+"""
+Каталог: все категории магазина и общий реестр товаров.
+
+Товары с одинаковым без учета регистра названием в каталоге
+представлены одним объектом. Реестр разбит на части по CRC32 названия,
+и массовые операции выполняются по частям параллельно.
+"""
+import contextvars
+import json
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .models import (Category, InventoryValuation, Product, ProductIndex,
+                     RepriceResult, _group_by_class, inventory_value, reprice)
+
+
+class Catalog:
+    """
+    Каталог категорий с общим реестром товаров.
+
+    Каждая часть реестра — `ProductIndex` со своей блокировкой, поэтому
+    добавление товаров с разными названиями и массовые операции над
+    разными частями не мешают друг другу.
+    """
+
+    def __init__(self, shard_count: int = 16, workers: int = None):
+        """
+        Конструктор каталога.
+
+        Args:
+            shard_count (int): Количество частей реестра товаров.
+            workers (int, optional): Количество потоков для массовых
+                операций. По умолчанию — по числу частей.
+        """
+        self.shard_count = shard_count
+        self.workers = workers or shard_count
+        self.__categories = {}
+        self.__lock = threading.Lock()
+        self.__shards = [ProductIndex() for _ in range(shard_count)]
+        self.__shard_locks = [threading.Lock() for _ in range(shard_count)]
+
+    def __len__(self) -> int:
+        """Количество уникальных товаров в каталоге."""
+        return sum(len(shard) for shard in self.__shards)
+
+    def __contains__(self, name: str) -> bool:
+        """Проверяет наличие товара с указанным названием."""
+        return self.get(name) is not None
+
+    def __iter__(self):
+        """Перебирает товары по частям реестра."""
+        for shard in self.__shards:
+            yield from list(shard)
+
+    @property
+    def categories(self) -> list:
+        """Список категорий каталога."""
+        return list(self.__categories.values())
+
+    def shard_of(self, name: str) -> int:
+        """
+        Номер части реестра для названия товара.
+
+        Args:
+            name (str): Название товара.
+
+        Returns:
+            int: Номер части от 0 до `shard_count - 1`.
+        """
+        key = ProductIndex.key(name).encode('utf-8')
+        return zlib.crc32(key) % self.shard_count
+
+    def shard(self, number: int) -> list:
+        """Возвращает товары одной части реестра."""
+        with self.__shard_locks[number]:
+            return list(self.__shards[number])
+
+    def get(self, name: str):
+        """
+        Ищет товар каталога по названию без учета регистра.
+
+        Returns:
+            Product | None: Товар или None.
+        """
+        return self.__shards[self.shard_of(name)].get(name)
+
+    def add_category(self, category: Category) -> Category:
+        """
+        Добавляет категорию и регистрирует ее товары в реестре.
+
+        Args:
+            category (Category): Категория.
+
+        Returns:
+            Category: Та же категория.
+
+        Raises:
+            ValueError: Если категория с таким названием уже есть или в
+                каталоге либо самой категории есть разные объекты товаров
+                с одним названием.
+        """
+        products = category.products_objects
+        with self.__lock:
+            if category.name in self.__categories:
+                raise ValueError(f"Категория уже есть: {category.name}")
+            seen = ProductIndex()
+            for product in products:
+                existing = seen.get(product.name) or self.get(product.name)
+                if existing is not None and existing is not product:
+                    raise ValueError(
+                        f"В каталоге уже есть товар {product.name}"
+                    )
+                seen.add(product)
+            self.__categories[category.name] = category
+            added = [
+                product for product in seen if self.__register(product)
+            ]
+        Product._subscribe_all(added, self)
+        category._subscribe(self)
+        return category
+
+    def category(self, name: str, description: str = '') -> Category:
+        """
+        Возвращает категорию по названию, создавая ее при отсутствии.
+
+        Args:
+            name (str): Название категории.
+            description (str): Описание новой категории.
+
+        Returns:
+            Category: Категория каталога.
+        """
+        category = self.__categories.get(name)
+        if category is None:
+            category = Category(name, description)
+            try:
+                self.add_category(category)
+            except ValueError:
+                # Категорию успел добавить другой поток
+                return self.__categories[name]
+        return category
+
+    def add_product(self, category_name: str, product_data: dict,
+                    product_class=Product):
+        """
+        Добавляет товар в категорию с поиском дубликатов по всему каталогу.
+
+        Дубликаты объединяются по правилам `Product.new_product`: товар
+        с тем же названием из любой категории получает сумму количеств
+        и максимальную цену.
+
+        Args:
+            category_name (str): Название категории.
+            product_data (dict): Данные товара.
+            product_class (optional): Класс нового товара.
+
+        Returns:
+            Product: Новый или существующий товар.
+        """
+        category = self.category(category_name)
+        number = self.shard_of(product_data['name'])
+        shard = self.__shards[number]
+        with self.__shard_locks[number]:
+            known = len(shard)
+            product = product_class.new_product(product_data, shard)
+            created = len(shard) > known
+        if created:
+            product._subscribe(self)
+        if category.find(product.name) is not product:
+            category.add_product(product)
+        return product
+
+    def map_shards(self, function) -> list:
+        """
+        Применяет функцию к товарам каждой части реестра параллельно.
+
+        Функция выполняется в копии контекста вызывающего потока, поэтому
+        `quiet()` и `price_policy()` действуют и в рабочих потоках.
+
+        Args:
+            function: Функция от списка товаров одной части.
+
+        Returns:
+            list: Результаты в порядке номеров частей.
+        """
+        contexts = [
+            contextvars.copy_context() for _ in range(self.shard_count)
+        ]
+        with ThreadPoolExecutor(self.workers) as executor:
+            return list(executor.map(
+                lambda number: contexts[number].run(
+                    function, self.shard(number)
+                ),
+                range(self.shard_count)
+            ))
+
+    def inventory_value(self, group_by=_group_by_class) -> InventoryValuation:
+        """
+        Считает стоимость всех товаров каталога по частям.
+
+        Товар, входящий в несколько категорий, учитывается один раз.
+
+        Args:
+            group_by (optional): Функция группировки, как в
+                `inventory_value`.
+
+        Returns:
+            InventoryValuation: Общая стоимость и стоимость по группам.
+        """
+        result = InventoryValuation()
+        for part in self.map_shards(
+                lambda products: inventory_value(products, group_by)
+        ):
+            result.total += part.total
+            for key, value in part.groups.items():
+                result.groups[key] = result.groups.get(key, 0.0) + value
+        return result
+
+    def reprice(self, rule, policy=None) -> RepriceResult:
+        """
+        Массово изменяет цены товаров каталога по частям.
+
+        Args:
+            rule: Функция от товара, возвращающая новую цену или None,
+                если цена не меняется.
+            policy (optional): Политика подтверждения понижения цены.
+
+        Returns:
+            RepriceResult: Примененные и отклоненные изменения.
+        """
+        def reprice_shard(products):
+            changes = []
+            for product in products:
+                new_price = rule(product)
+                if new_price is not None:
+                    changes.append((product, new_price))
+            return reprice(changes, policy)
+
+        result = RepriceResult()
+        for part in self.map_shards(reprice_shard):
+            result.applied.extend(part.applied)
+            result.rejected.extend(part.rejected)
+        return result
+
+    def export(self, directory: str) -> list:
+        """
+        Записывает товары в файлы JSON Lines, по одному на часть.
+
+        Строки файлов можно загрузить через `src.loader`.
+
+        Args:
+            directory (str): Каталог для файлов.
+
+        Returns:
+            list: Пути к записанным файлам.
+        """
+        os.makedirs(directory, exist_ok=True)
+        width = len(str(self.shard_count - 1))
+
+        def export_shard(number):
+            path = os.path.join(directory, f"shard-{number:0{width}}.jsonl")
+            with open(path, 'w', encoding='utf-8') as file:
+                for product in self.shard(number):
+                    row = {'type': type(product).__name__}
+                    for field in product._fields:
+                        row[field] = getattr(product, field)
+                    file.write(json.dumps(row, ensure_ascii=False) + '\n')
+            return path
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            return list(executor.map(export_shard, range(self.shard_count)))
+
+    def _check_product(self, category, product):
+        """
+        Проверяет товар перед добавлением в категорию каталога.
+
+        Raises:
+            ValueError: Если в каталоге есть другой объект товара с тем
+                же названием. Такой товар добавляется через
+                `add_product`, который объединяет дубликаты.
+        """
+        existing = self.get(product.name)
+        if existing is not None and existing is not product:
+            raise ValueError(f"В каталоге уже есть товар {product.name}")
+
+    def _product_added(self, category, product):
+        """Регистрирует товар, добавленный в категорию каталога."""
+        if self.__register(product):
+            product._subscribe(self)
+
+    def _product_changed(self, product, field: str, old, new):
+        """
+        Переносит переименованный товар в реестре.
+
+        Raises:
+            ValueError: Если новое название занято другим товаром
+                каталога. Название товара при этом возвращается к
+                прежнему с уведомлением наблюдателей.
+        """
+        if field != 'name':
+            return
+        existing = self.get(new)
+        if existing is not None and existing is not product:
+            product.name = old
+            raise ValueError(f"В каталоге уже есть товар {new}")
+        number = self.shard_of(old)
+        with self.__shard_locks[number]:
+            removed = self.__shards[number].remove(product, name=old)
+        if removed:
+            self.__register(product)
+
+    def __register(self, product) -> bool:
+        """
+        Добавляет товар в реестр, если название еще не занято.
+
+        Returns:
+            bool: True, если товар добавлен.
+        """
+        number = self.shard_of(product.name)
+        with self.__shard_locks[number]:
+            shard = self.__shards[number]
+            if product.name in shard:
+                return False
+            shard.add(product)
+            return True
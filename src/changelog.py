@@ -0,0 +1,173 @@
+"""
+Журнал изменений каталога в формате JSON Lines.
+
+Экспортер подписывается на шину событий `src.models.event_bus`,
+накапливает события, объединяет изменения одного поля одного товара и
+записывает их пакетами через буферизованный файл. Потребители читают
+журнал и применяют изменения вместо полной выгрузки каталога.
+"""
+import itertools
+import json
+import os
+import threading
+import weakref
+
+from .models import (NameChanged, PriceChanged, ProductAdded,
+                     QuantityChanged, coalesce, event_bus)
+
+# Название события в журнале по типу события
+EVENT_NAMES = {
+    PriceChanged: 'price',
+    QuantityChanged: 'quantity',
+    NameChanged: 'name',
+    ProductAdded: 'added',
+}
+
+# Журналы, открытые экспортерами процесса
+_OPEN_PATHS = set()
+_OPEN_LOCK = threading.Lock()
+
+
+def _last_numbers(path: str) -> tuple:
+    """
+    Возвращает последние номер записи и номер товара в журнале.
+
+    Returns:
+        tuple: Наибольшие `seq` и `id` или нули, если журнала нет.
+    """
+    seq = product_id = 0
+    try:
+        file = open(path, encoding='utf-8')
+    except FileNotFoundError:
+        return seq, product_id
+    with file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                seq = max(seq, record['seq'])
+                product_id = max(product_id, record['id'])
+    return seq, product_id
+
+
+class ChangeLogExporter:
+    """
+    Экспортер событий изменения товаров в файл JSON Lines.
+
+    Каждый товар получает в журнале постоянный номер `id`, поэтому
+    записи остаются однозначными и после переименования товара. Запись
+    добавления содержит значения полей на момент записи, а записи
+    изменений — абсолютные старое и новое значения, поэтому их
+    повторное применение безопасно. При дописывании в существующий
+    журнал нумерация записей и товаров продолжается с последних
+    номеров в файле; товары, записанные прежними экспортерами, при этом
+    получают новые номера.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            batch_size: int = 1000,
+            buffer_size: int = 1 << 16,
+            bus=event_bus
+    ):
+        """
+        Открывает журнал и подписывается на события.
+
+        Args:
+            path (str): Путь к файлу журнала, записи дописываются в конец.
+            batch_size (int): Количество событий, после которого пакет
+                записывается в файл.
+            buffer_size (int): Размер буфера файла в байтах.
+            bus (EventBus): Шина событий.
+
+        Raises:
+            ValueError: Если в этот журнал уже пишет другой экспортер.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.__bus = bus
+        self.__key = os.path.abspath(path)
+        with _OPEN_LOCK:
+            if self.__key in _OPEN_PATHS:
+                raise ValueError(f"Журнал уже открыт: {path}")
+            _OPEN_PATHS.add(self.__key)
+        try:
+            seq, product_id = _last_numbers(path)
+            self.__file = open(
+                path, 'a', encoding='utf-8', buffering=buffer_size
+            )
+        except BaseException:
+            self.__release_path()
+            raise
+        self.__lock = threading.Lock()
+        self.__events = []
+        self.__ids = weakref.WeakKeyDictionary()
+        self.__next_id = itertools.count(product_id + 1)
+        self.__sequence = itertools.count(seq + 1)
+        bus.subscribe(self._handle, *EVENT_NAMES)
+
+    def __enter__(self):
+        """Возвращает экспортер для использования в `with`."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Записывает оставшиеся события и закрывает журнал."""
+        self.close()
+
+    def close(self):
+        """Отписывается от событий, записывает остаток и закрывает файл."""
+        self.__bus.unsubscribe(self._handle)
+        try:
+            self.flush()
+            self.__file.close()
+        finally:
+            self.__release_path()
+
+    def flush(self):
+        """Записывает накопленные события в файл."""
+        with self.__lock:
+            events, self.__events = self.__events, []
+            self.__file.writelines(
+                json.dumps(self.__record(event), ensure_ascii=False) + '\n'
+                for event in coalesce(events)
+            )
+            self.__file.flush()
+
+    def __release_path(self):
+        """Разрешает другим экспортерам писать в журнал."""
+        with _OPEN_LOCK:
+            _OPEN_PATHS.discard(self.__key)
+
+    def _handle(self, event):
+        """Принимает событие от шины."""
+        with self.__lock:
+            self.__events.append(event)
+            full = len(self.__events) >= self.batch_size
+        if full:
+            self.flush()
+
+    def __product_id(self, product) -> int:
+        """Постоянный номер товара в журнале."""
+        product_id = self.__ids.get(product)
+        if product_id is None:
+            product_id = self.__ids[product] = next(self.__next_id)
+        return product_id
+
+    def __record(self, event) -> dict:
+        """Преобразует событие в запись журнала."""
+        product = event.product
+        record = {
+            'seq': next(self.__sequence),
+            'event': EVENT_NAMES[type(event)],
+            'id': self.__product_id(product),
+        }
+        if type(event) is ProductAdded:
+            record['category'] = event.category.name
+            record['type'] = type(product).__name__
+            for field in product._fields:
+                record[field] = getattr(product, field)
+        else:
+            record['name'] = product.name
+            record['old'] = event.old
+            record['new'] = event.new
+        return record
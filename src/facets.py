@@ -0,0 +1,200 @@
+"""
+Фасетная фильтрация товаров по дополнительным полям.
+
+Для каждого значения поля, например `memory=256` у смартфона или
+`country='Россия'` у газонной травы, индекс хранит множество номеров
+товаров. Фильтр пересекает и объединяет эти множества, поэтому его
+стоимость зависит от размера результата, а не всего каталога.
+"""
+import threading
+
+# Поле с именем класса товара
+TYPE_FIELD = 'type'
+
+
+def _as_values(value) -> tuple:
+    """Возвращает значения условия: список означает «любое из»."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return (value,)
+
+
+class FacetIndex:
+    """
+    Индекс значений дополнительных полей товаров.
+
+    Индексируются поля `_fields` класса товара после названия,
+    описания, цены и количества, а также имя класса в поле `type`.
+    Товар, входящий в несколько категорий, индексируется один раз.
+    Дополнительные поля не уведомляют об изменениях, поэтому после
+    их изменения вызывается `reindex`.
+    """
+
+    def __init__(self, categories=()):
+        """
+        Конструктор индекса.
+
+        Args:
+            categories: Итерируемый набор категорий для индексации.
+        """
+        self.__lock = threading.RLock()
+        self.__doc_ids = {}
+        self.__products = []
+        self.__doc_values = []
+        # Множества номеров товаров по полю и значению
+        self.__postings = {}
+        for category in categories:
+            self.add_category(category)
+
+    def __len__(self) -> int:
+        """Количество проиндексированных товаров."""
+        return len(self.__products)
+
+    def add_category(self, category):
+        """
+        Индексирует товары категории и подписывается на ее изменения.
+
+        Args:
+            category (Category): Категория.
+        """
+        with self.__lock:
+            for product in category.products_objects:
+                self.__add(product)
+            category._subscribe(self)
+
+    def reindex(self, product):
+        """
+        Обновляет значения полей товара после их изменения.
+
+        Args:
+            product (Product): Проиндексированный товар.
+        """
+        with self.__lock:
+            doc = self.__doc_ids.get(product)
+            if doc is not None:
+                self.__remove_values(doc)
+                self.__index_values(doc, product)
+
+    def filter(self, **criteria) -> list:
+        """
+        Возвращает товары, удовлетворяющие всем условиям.
+
+        Условия по разным полям объединяются через И, а список значений
+        одного поля означает ИЛИ, например
+        `filter(type='Smartphone', memory=[256, 512], color='Серый')`.
+
+        Returns:
+            list: Товары в порядке индексации.
+        """
+        with self.__lock:
+            docs = self.__matching(criteria)
+            if docs is None:
+                return list(self.__products)
+            return [self.__products[doc] for doc in sorted(docs)]
+
+    def count(self, **criteria) -> int:
+        """Количество товаров, удовлетворяющих условиям `filter`."""
+        with self.__lock:
+            docs = self.__matching(criteria)
+            return len(self.__products) if docs is None else len(docs)
+
+    def facet_counts(self, fields=None, **criteria) -> dict:
+        """
+        Считает товары по значениям полей для фасетной навигации.
+
+        Количество по полю считается без условия на само это поле,
+        поэтому видно, сколько товаров даст выбор другого значения.
+
+        Args:
+            fields (optional): Поля для подсчета. По умолчанию все.
+            **criteria: Условия, как в `filter`.
+
+        Returns:
+            dict: Для каждого поля словарь значение — количество по
+                убыванию количества, без нулевых значений.
+        """
+        with self.__lock:
+            if fields is None:
+                fields = list(self.__postings)
+            return {
+                field: self.__field_counts(field, criteria)
+                for field in fields
+            }
+
+    def _product_added(self, category, product):
+        """Индексирует товар, добавленный в категорию."""
+        with self.__lock:
+            self.__add(product)
+
+    def __add(self, product):
+        """Добавляет товар в индекс, если его там еще нет."""
+        if product in self.__doc_ids:
+            return
+        doc = len(self.__products)
+        self.__doc_ids[product] = doc
+        self.__products.append(product)
+        self.__doc_values.append(())
+        self.__index_values(doc, product)
+
+    def __index_values(self, doc: int, product):
+        """Записывает значения полей товара в индекс."""
+        values = [(TYPE_FIELD, type(product).__name__)]
+        values.extend(
+            (field, getattr(product, field, None))
+            for field in product._fields[4:]
+        )
+        postings = self.__postings
+        for field, value in values:
+            postings.setdefault(field, {}).setdefault(value, set()).add(doc)
+        self.__doc_values[doc] = tuple(values)
+
+    def __remove_values(self, doc: int):
+        """Удаляет значения полей товара из индекса."""
+        for field, value in self.__doc_values[doc]:
+            by_value = self.__postings[field]
+            docs = by_value[value]
+            docs.discard(doc)
+            if not docs:
+                del by_value[value]
+        self.__doc_values[doc] = ()
+
+    def __union(self, field: str, value) -> set:
+        """Номера товаров с любым из значений поля."""
+        by_value = self.__postings.get(field, {})
+        sets = [by_value[v] for v in _as_values(value) if v in by_value]
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    def __matching(self, criteria: dict, skip: str = None):
+        """
+        Пересекает множества по условиям, начиная с самого маленького.
+
+        Returns:
+            set | None: Номера товаров или None, если условий нет.
+        """
+        groups = sorted(
+            (self.__union(field, value)
+             for field, value in criteria.items() if field != skip),
+            key=len
+        )
+        if not groups:
+            return None
+        result = groups[0]
+        for docs in groups[1:]:
+            if not result:
+                break
+            result = result & docs
+        return result
+
+    def __field_counts(self, field: str, criteria: dict) -> dict:
+        """Количество товаров по значениям одного поля."""
+        base = self.__matching(criteria, skip=field)
+        counts = {}
+        for value, docs in self.__postings.get(field, {}).items():
+            count = len(docs) if base is None else len(base & docs)
+            if count:
+                counts[value] = count
+        return dict(sorted(
+            counts.items(), key=lambda item: item[1], reverse=True
+        ))
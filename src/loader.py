@@ -0,0 +1,378 @@
+"""Потоковая загрузка каталога из файлов поставщиков (JSON Lines и CSV)."""
+import csv
+import json
+import os
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .models import (Category, LawnGrass, Product, ProductIndex, Smartphone,
+                     quiet)
+
+# Типы товаров, которые можно указать в колонке `type`
+PRODUCT_TYPES = {
+    'Product': Product,
+    'Smartphone': Smartphone,
+    'LawnGrass': LawnGrass,
+}
+
+# Преобразование значений из CSV, где все поля приходят строками
+FIELD_CONVERTERS = {
+    'price': float,
+    'quantity': int,
+    'efficiency': float,
+    'memory': int,
+}
+
+DEFAULT_CATEGORY = 'Без категории'
+
+
+def read_rows(path: str, fmt: str = None):
+    """
+    Построчно читает файл поставщика.
+
+    Args:
+        path (str): Путь к файлу.
+        fmt (str, optional): Формат `jsonl` или `csv`. По умолчанию
+            определяется по расширению файла.
+
+    Yields:
+        dict: Очередная строка файла.
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+    """
+    fmt = fmt or _detect_format(path)
+    with open(path, encoding='utf-8', newline='') as file:
+        if fmt == 'csv':
+            yield from csv.DictReader(file)
+        elif fmt == 'jsonl':
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Неподдерживаемый формат файла: {fmt}")
+
+
+def _detect_format(path: str) -> str:
+    """Определяет формат файла по расширению."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    raise ValueError(f"Не удалось определить формат файла: {path}")
+
+
+def parse_row(row: dict):
+    """
+    Разбирает строку файла на категорию, класс товара и его данные.
+
+    Args:
+        row (dict): Строка файла.
+
+    Returns:
+        tuple: Название категории, описание категории, класс товара и
+            словарь с данными для `new_product`.
+
+    Raises:
+        ValueError: Если указан неизвестный тип товара.
+    """
+    type_name = row.get('type') or 'Product'
+    product_class = PRODUCT_TYPES.get(type_name)
+    if product_class is None:
+        raise ValueError(f"Неизвестный тип товара: {type_name}")
+
+    product_data = {}
+    for field in product_class._fields:
+        value = row.get(field)
+        converter = FIELD_CONVERTERS.get(field)
+        if converter is not None and value is not None:
+            value = converter(value)
+        product_data[field] = value
+
+    category_name = row.get('category') or DEFAULT_CATEGORY
+    category_description = row.get('category_description') or ''
+    return category_name, category_description, product_class, product_data
+
+
+class LoadStats:
+    """Статистика загрузки каталога."""
+
+    def __init__(self):
+        """Конструктор статистики."""
+        self.rows = 0
+        self.products = 0
+        self.seconds = 0.0
+        self.peak_memory = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Скорость загрузки в строках в секунду."""
+        if not self.seconds:
+            return 0.0
+        return self.rows / self.seconds
+
+    def __str__(self):
+        """Строковое представление статистики."""
+        result = (
+            f"Строк: {self.rows}, товаров: {self.products}, "
+            f"{self.rows_per_sec:.0f} строк/с"
+        )
+        if self.peak_memory is not None:
+            result += f", пик памяти: {self.peak_memory / 1024:.0f} КБ"
+        return result
+
+
+class CatalogLoader:
+    """
+    Загрузчик каталога из файлов поставщиков.
+
+    Файл читается построчно, поэтому в памяти находятся только
+    созданные товары и категории. Дубликаты внутри категории
+    объединяются по правилам `Product.new_product`. Товары создаются в
+    тихом режиме, без вывода в stdout.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        """
+        Конструктор загрузчика.
+
+        Args:
+            track_memory (bool): Измерять пиковое потребление памяти
+                через `tracemalloc` (замедляет загрузку).
+        """
+        self.track_memory = track_memory
+        self.categories = {}
+        self.stats = LoadStats()
+        self.__indexes = {}
+
+    def load(self, path: str, fmt: str = None) -> dict:
+        """
+        Загружает файл и заполняет категории.
+
+        Args:
+            path (str): Путь к файлу.
+            fmt (str, optional): Формат `jsonl` или `csv`.
+
+        Returns:
+            dict: Категории по названию.
+        """
+        return self.load_rows(read_rows(path, fmt))
+
+    def load_rows(self, rows) -> dict:
+        """
+        Заполняет категории из итерируемого набора строк.
+
+        Args:
+            rows: Итерируемый набор словарей с данными товаров.
+
+        Returns:
+            dict: Категории по названию.
+        """
+        started_tracing = False
+        if self.track_memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            with quiet():
+                for row in rows:
+                    self.add_row(row)
+        finally:
+            self.stats.seconds += time.perf_counter() - start
+            if self.track_memory:
+                self.stats.peak_memory = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+        return self.categories
+
+    def add_row(self, row: dict):
+        """
+        Добавляет в каталог одну строку файла.
+
+        Args:
+            row (dict): Строка файла.
+
+        Returns:
+            Product: Новый или существующий товар.
+        """
+        name, description, product_class, product_data = parse_row(row)
+        category, index = self.__category(name, description)
+        known = len(index)
+        product = product_class.new_product(product_data, index)
+        if len(index) > known:
+            category.add_product(product)
+            self.stats.products += 1
+
+        self.stats.rows += 1
+        return product
+
+    def merge(self, partial: list):
+        """
+        Добавляет в каталог товары, загруженные другим загрузчиком.
+
+        Дубликаты объединяются по правилам `Product.new_product`, поэтому
+        слияние частей в порядке строк файла дает тот же каталог, что и
+        последовательная загрузка.
+
+        Args:
+            partial (list): Результат `export` другого загрузчика.
+        """
+        with quiet():
+            for name, description, products in partial:
+                category, index = self.__category(name, description)
+                for class_name, values in products:
+                    self.__merge_product(
+                        category, index, PRODUCT_TYPES[class_name], values
+                    )
+
+    def export(self) -> list:
+        """
+        Возвращает категории в виде простых значений для передачи
+        между процессами.
+
+        Returns:
+            list: Кортежи из названия и описания категории и списка пар
+                из имени класса товара и значений его полей.
+        """
+        return [
+            (name, category.description, [
+                (type(product).__name__,
+                 tuple(getattr(product, field) for field in product._fields))
+                for product in category.products_objects
+            ])
+            for name, category in self.categories.items()
+        ]
+
+    def __category(self, name: str, description: str):
+        """Возвращает категорию и ее индекс, создавая их при отсутствии."""
+        category = self.categories.get(name)
+        if category is None:
+            category = Category(name, description)
+            self.categories[name] = category
+            self.__indexes[name] = ProductIndex()
+        return category, self.__indexes[name]
+
+    def __merge_product(self, category, index, product_class, values):
+        """Добавляет товар части каталога или объединяет его с дубликатом."""
+        if values[0] in index:
+            product_class.new_product(
+                dict(zip(product_class._fields, values)), index
+            )
+            return
+        # Товар уже проверен конструктором в процессе-обработчике
+        product = product_class._restore(values)
+        index.add(product)
+        category.add_product(product)
+        self.stats.products += 1
+
+
+def load_catalog(path: str, fmt: str = None, track_memory: bool = False):
+    """
+    Загружает каталог из файла поставщика.
+
+    Args:
+        path (str): Путь к файлу.
+        fmt (str, optional): Формат `jsonl` или `csv`.
+        track_memory (bool): Измерять пиковое потребление памяти.
+
+    Returns:
+        tuple: Категории по названию и статистика загрузки.
+    """
+    loader = CatalogLoader(track_memory=track_memory)
+    categories = loader.load(path, fmt)
+    return categories, loader.stats
+
+
+def load_catalog_parallel(
+        path: str,
+        fmt: str = None,
+        workers: int = None,
+        chunk_size: int = 10_000
+):
+    """
+    Загружает каталог из файла поставщика в нескольких процессах.
+
+    Строки файла делятся на части по `chunk_size`, каждая часть
+    разбирается и превращается в товары в отдельном процессе, а затем
+    части объединяются в порядке следования в файле. Поэтому результат
+    не зависит от того, какой процесс закончил работу раньше, и
+    совпадает с результатом `load_catalog`. Файл читается по мере
+    обработки: в работе одновременно не больше `2 * workers` частей.
+
+    Args:
+        path (str): Путь к файлу.
+        fmt (str, optional): Формат `jsonl` или `csv`.
+        workers (int, optional): Количество процессов. По умолчанию
+            равно количеству процессоров.
+        chunk_size (int): Количество строк в одной части.
+
+    Returns:
+        tuple: Категории по названию и статистика загрузки.
+    """
+    fmt = fmt or _detect_format(path)
+    if fmt == 'jsonl':
+        # Строки JSON разбираются в процессах-обработчиках
+        source = _read_lines(path)
+    else:
+        source = read_rows(path, fmt)
+
+    workers = workers or os.cpu_count() or 1
+    loader = CatalogLoader()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as executor:
+        # Executor.map до Python 3.14 читает все части заранее, поэтому
+        # части отправляются окном, а результаты забираются по порядку
+        pending = deque()
+        for chunk in _chunks(source, chunk_size):
+            pending.append(executor.submit(_load_chunk, chunk, fmt))
+            if len(pending) >= 2 * workers:
+                _merge_part(loader, pending.popleft())
+        while pending:
+            _merge_part(loader, pending.popleft())
+    loader.stats.seconds = time.perf_counter() - start
+    return loader.categories, loader.stats
+
+
+def _merge_part(loader, future):
+    """Дожидается части и добавляет ее в общий каталог."""
+    partial, rows = future.result()
+    loader.merge(partial)
+    loader.stats.rows += rows
+
+
+def _read_lines(path: str):
+    """Построчно читает файл без разбора строк."""
+    with open(path, encoding='utf-8') as file:
+        yield from file
+
+
+def _chunks(rows, size: int):
+    """Делит строки на списки по `size` штук."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _load_chunk(rows: list, fmt: str):
+    """
+    Загружает часть строк в процессе-обработчике.
+
+    Args:
+        rows (list): Словари строк CSV или текстовые строки JSON Lines.
+        fmt (str): Формат файла.
+
+    Returns:
+        tuple: Результат `CatalogLoader.export` и количество строк.
+    """
+    if fmt == 'jsonl':
+        rows = (json.loads(line) for line in rows if line.strip())
+    loader = CatalogLoader()
+    loader.load_rows(rows)
+    return loader.export(), loader.stats.rows
@@ -0,0 +1,359 @@
+"""
+Каталог только для чтения, отображаемый в память через `mmap`.
+
+Файл содержит колонки фиксированной ширины для цены, количества, класса
+товара и признака целой цены и таблицу строк со смещениями для
+названий, описаний и дополнительных полей. Процессы, открывшие один
+файл, используют общую копию страниц в кэше ОС, а объекты товаров
+создаются только при обращении к ним.
+"""
+import json
+import mmap
+import operator
+import struct
+from array import array
+
+MAGIC = b'OPMAP\x02\x00\x00'
+
+# Магия, количество товаров, количество членств в категориях и
+# смещения секций: цены, количества, классы, признаки целой цены, индекс
+# строк, членства, строки, метаданные и длина метаданных
+_HEADER = struct.Struct('<8sQQQQQQQQQQQ')
+
+# Строковые поля каждого товара в таблице строк
+_STRINGS_PER_PRODUCT = 3
+
+
+def write_mapped_catalog(path: str, categories) -> int:
+    """
+    Записывает категории в файл для отображения в память.
+
+    Товар, входящий в несколько категорий, записывается один раз.
+
+    Args:
+        path (str): Путь к файлу.
+        categories: Итерируемый набор категорий.
+
+    Returns:
+        int: Количество записанных товаров.
+    """
+    categories = list(categories)
+    rows = {}
+    products = []
+    members = array('q')
+    meta = {'classes': [], 'categories': []}
+    for category in categories:
+        start = len(members)
+        for product in category.products_objects:
+            row = rows.get(id(product))
+            if row is None:
+                row = rows[id(product)] = len(products)
+                products.append(product)
+            members.append(row)
+        meta['categories'].append(
+            [category.name, category.description, start, len(members)]
+        )
+
+    prices = array('d', (product.price for product in products))
+    quantities = array('q', (product.quantity for product in products))
+    classes = array('B', (
+        _class_code(meta['classes'], product) for product in products
+    ))
+    # Цена 100 выводится как «100 руб.», а 100.0 — как «100.0 руб.»
+    int_prices = array('B', (
+        type(product.price) is int for product in products
+    ))
+    offsets, strings = _string_table(products)
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+
+    sections = [
+        prices, quantities, classes, int_prices, offsets, members, strings
+    ]
+    layout = []
+    position = _HEADER.size
+    for section in sections:
+        layout.append(position)
+        position = _align(position + _nbytes(section))
+
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(
+            MAGIC, len(products), len(members), *layout,
+            position, len(meta_bytes)
+        ))
+        for offset, section in zip(layout, sections):
+            file.seek(offset)
+            file.write(section)
+        file.seek(position)
+        file.write(meta_bytes)
+    return len(products)
+
+
+def _class_code(classes: list, product) -> int:
+    """Возвращает номер класса товара, добавляя класс в список."""
+    name = type(product).__name__
+    if name not in classes:
+        classes.append(name)
+    return classes.index(name)
+
+
+def _string_table(products: list):
+    """
+    Собирает таблицу строк товаров.
+
+    Returns:
+        tuple: Массив смещений в байтах и данные строк.
+    """
+    offsets = array('Q', [0])
+    chunks = []
+    position = 0
+    for product in products:
+        extra = {
+            field: getattr(product, field) for field in product._fields[4:]
+        }
+        for text in (product.name, product.description,
+                     json.dumps(extra, ensure_ascii=False)):
+            data = text.encode('utf-8')
+            chunks.append(data)
+            position += len(data)
+            offsets.append(position)
+    return offsets, b''.join(chunks)
+
+
+def _nbytes(section) -> int:
+    """Размер секции в байтах."""
+    if isinstance(section, array):
+        return len(section) * section.itemsize
+    return len(section)
+
+
+def _align(position: int) -> int:
+    """Выравнивает смещение по 8 байтам."""
+    return (position + 7) & ~7
+
+
+class MappedCatalog:
+    """
+    Каталог, отображенный в память только для чтения.
+
+    Поддерживает `len`, доступ по номеру и перебор товаров, которые
+    возвращаются в виде `ProductView`.
+    """
+
+    def __init__(self, path: str):
+        """
+        Открывает файл каталога.
+
+        Args:
+            path (str): Путь к файлу, записанному `write_mapped_catalog`.
+
+        Raises:
+            ValueError: Если файл не является каталогом.
+        """
+        with open(path, 'rb') as file:
+            self.__mmap = mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        (magic, count, member_count, prices, quantities, classes,
+         int_prices, offsets, members, strings, meta,
+         meta_size) = _HEADER.unpack_from(self.__mmap)
+        if magic != MAGIC:
+            self.__mmap.close()
+            raise ValueError(f"Файл не является каталогом: {path}")
+
+        view = self.__view = memoryview(self.__mmap)
+        self.prices = view[prices:prices + 8 * count].cast('d')
+        self.quantities = view[quantities:quantities + 8 * count].cast('q')
+        self.__classes = view[classes:classes + count]
+        self.__int_prices = view[int_prices:int_prices + count]
+        size = 8 * (_STRINGS_PER_PRODUCT * count + 1)
+        self.__offsets = view[offsets:offsets + size].cast('Q')
+        self.__members = view[members:members + 8 * member_count].cast('q')
+        self.__strings = strings
+
+        meta = json.loads(self.__mmap[meta:meta + meta_size])
+        self.__class_names = meta['classes']
+        self.categories = [
+            MappedCategory(self, name, description, start, stop)
+            for name, description, start, stop in meta['categories']
+        ]
+
+    def __len__(self) -> int:
+        """Количество товаров в каталоге."""
+        return len(self.prices)
+
+    def __getitem__(self, row: int):
+        """Возвращает представление товара по номеру."""
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("Номер товара вне каталога")
+        return ProductView(self, row)
+
+    def __iter__(self):
+        """Перебирает представления всех товаров."""
+        for row in range(len(self)):
+            yield ProductView(self, row)
+
+    def __enter__(self):
+        """Возвращает каталог для использования в `with`."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Закрывает каталог при выходе из `with`."""
+        self.close()
+
+    def close(self):
+        """Освобождает отображение файла."""
+        for view in (self.prices, self.quantities, self.__classes,
+                     self.__int_prices, self.__offsets, self.__members):
+            view.release()
+        for category in self.categories:
+            category._release()
+        self.__view.release()
+        self.__mmap.close()
+
+    def total_quantity(self) -> int:
+        """Общее количество товаров на складе."""
+        return sum(self.quantities)
+
+    def inventory_value(self) -> float:
+        """Общая стоимость товаров: сумма цена × количество."""
+        return float(sum(map(operator.mul, self.prices, self.quantities)))
+
+    def _string(self, row: int, column: int) -> str:
+        """Возвращает строку товара из таблицы строк."""
+        index = row * _STRINGS_PER_PRODUCT + column
+        start = self.__strings + self.__offsets[index]
+        stop = self.__strings + self.__offsets[index + 1]
+        return self.__mmap[start:stop].decode('utf-8')
+
+    def _price(self, row: int):
+        """Возвращает цену товара с исходным типом int или float."""
+        price = self.prices[row]
+        return int(price) if self.__int_prices[row] else price
+
+    def _class_name(self, row: int) -> str:
+        """Возвращает имя класса товара."""
+        return self.__class_names[self.__classes[row]]
+
+    def _members(self, start: int, stop: int):
+        """Возвращает номера товаров категории."""
+        return self.__members[start:stop]
+
+
+class MappedCategory:
+    """Категория отображенного в память каталога."""
+
+    def __init__(self, catalog, name, description, start, stop):
+        """
+        Конструктор категории.
+
+        Args:
+            catalog (MappedCatalog): Каталог.
+            name (str): Название категории.
+            description (str): Описание категории.
+            start (int): Начало списка товаров в таблице членств.
+            stop (int): Конец списка товаров в таблице членств.
+        """
+        self.catalog = catalog
+        self.name = name
+        self.description = description
+        self.__rows = catalog._members(start, stop)
+
+    def __len__(self) -> int:
+        """Количество товаров в категории."""
+        return len(self.__rows)
+
+    def __iter__(self):
+        """Перебирает представления товаров категории."""
+        for row in self.__rows:
+            yield ProductView(self.catalog, row)
+
+    def __str__(self):
+        """Строковое представление категории."""
+        return f"{self.name}, количество продуктов: {self.total_quantity} шт."
+
+    @property
+    def total_quantity(self) -> int:
+        """Общее количество товаров категории на складе."""
+        quantities = self.catalog.quantities
+        return sum(quantities[row] for row in self.__rows)
+
+    @property
+    def products(self) -> list:
+        """Список строк с информацией о товарах."""
+        return [str(product) for product in self]
+
+    def _release(self):
+        """Освобождает представление таблицы членств."""
+        self.__rows.release()
+
+
+class ProductView:
+    """
+    Представление товара из отображенного в память каталога.
+
+    Повторяет интерфейс `Product` для чтения; значения читаются из файла
+    при каждом обращении.
+    """
+
+    __slots__ = ('_catalog', '_row')
+
+    def __init__(self, catalog, row: int):
+        """
+        Конструктор представления.
+
+        Args:
+            catalog (MappedCatalog): Каталог.
+            row (int): Номер товара.
+        """
+        self._catalog = catalog
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        """Название товара."""
+        return self._catalog._string(self._row, 0)
+
+    @property
+    def description(self) -> str:
+        """Описание товара."""
+        return self._catalog._string(self._row, 1)
+
+    @property
+    def price(self) -> float:
+        """Цена товара; целая цена возвращается как int, как в `Product`."""
+        return self._catalog._price(self._row)
+
+    @property
+    def quantity(self) -> int:
+        """Количество товара в наличии."""
+        return self._catalog.quantities[self._row]
+
+    @property
+    def product_class(self) -> str:
+        """Имя класса товара, например `Smartphone`."""
+        return self._catalog._class_name(self._row)
+
+    @property
+    def attributes(self) -> dict:
+        """Дополнительные поля товара, например `memory` у смартфона."""
+        return json.loads(self._catalog._string(self._row, 2))
+
+    def __getattr__(self, name: str):
+        """Возвращает дополнительное поле товара."""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attributes = self.attributes
+        if name in attributes:
+            return attributes[name]
+        raise AttributeError(name)
+
+    def __str__(self):
+        """Строковое представление товара."""
+        return f"{self.name}, {self.price} руб. Остаток: {self.quantity} шт."
+
+    def __repr__(self):
+        """Представление для отладки."""
+        return f"ProductView({self.product_class}, {self._row})"
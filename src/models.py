@@ -1,29 +1,444 @@
+import logging
+import operator
+import threading
+import weakref
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, islice
+from collections import namedtuple
+from collections.abc import Sequence
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# Печатать ли сообщения о создании товаров и изменении цены
+_verbose = True
+# Переопределение режима для текущего потока или задачи asyncio
+_verbose_override = ContextVar('verbose_override', default=None)
+
+
+# Пул блокировок товаров: товар использует блокировку по своему id, что
+# не требует отдельного объекта блокировки на каждый товар
+_PRODUCT_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+def _product_lock(product):
+    """Возвращает блокировку из пула для товара."""
+    return _PRODUCT_LOCKS[(id(product) >> 4) % len(_PRODUCT_LOCKS)]
+
+
+# Отдельный пул блокировок для остатков и резервов. Под этими
+# блокировками уведомляются наблюдатели, которые берут блокировку
+# категории и блокировки из `_PRODUCT_LOCKS`, поэтому они всегда
+# захватываются первыми
+_STOCK_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+
+def _stock_lock_index(product) -> int:
+    """Возвращает номер блокировки остатка товара в пуле."""
+    return (id(product) >> 4) % len(_STOCK_LOCKS)
+
+
+# Количество зарезервированных единиц по товару. В таблице есть только
+# товары с открытыми резервами; записи меняются под блокировкой остатка
+# товара
+_RESERVATIONS = {}
+
+
+def _add_reserved(product, amount: int):
+    """Изменяет резерв товара, удаляя запись при нулевом резерве."""
+    reserved = _RESERVATIONS.get(product, 0) + amount
+    if reserved:
+        _RESERVATIONS[product] = reserved
+    else:
+        del _RESERVATIONS[product]
+
+
+@contextmanager
+def _stock_locks(products):
+    """
+    Захватывает блокировки остатков нескольких товаров.
+
+    Блокировки захватываются в порядке номеров, поэтому одновременные
+    пакетные операции над пересекающимися наборами товаров не
+    блокируют друг друга навсегда.
+    """
+    with ExitStack() as stack:
+        for index in sorted({_stock_lock_index(p) for p in products}):
+            stack.enter_context(_STOCK_LOCKS[index])
+        yield
+
+
+def set_verbose(verbose: bool):
+    """
+    Включает или отключает вывод сообщений в stdout для всего модуля.
+
+    В тихом режиме сообщения передаются в логгер `src.models`.
+    """
+    global _verbose
+    _verbose = verbose
+
+
+def is_verbose() -> bool:
+    """Возвращает True, если сообщения выводятся в stdout."""
+    override = _verbose_override.get()
+    return _verbose if override is None else override
+
+
+@contextmanager
+def quiet():
+    """Контекстный менеджер для создания товаров без вывода в stdout."""
+    token = _verbose_override.set(False)
+    try:
+        yield
+    finally:
+        _verbose_override.reset(token)
+
+
+def _announce(message: str, *args, level: int = logging.INFO):
+    """
+    Выводит сообщение в stdout или передает его в логгер.
+
+    Аргументы подставляются в сообщение только при выводе, поэтому в
+    тихом режиме с выключенным логгером строка не форматируется.
+    """
+    if is_verbose():
+        print(message % args if args else message)
+    else:
+        logger.log(level, message, *args)
+
+
+# Маркер отсутствующего значения поля
+_MISSING = object()
+
+
+def _values_getter(fields: tuple):
+    """Возвращает функцию, читающую значения полей объекта в кортеж."""
+    if len(fields) > 1:
+        return operator.attrgetter(*fields)
+    if fields:
+        getter = operator.attrgetter(fields[0])
+        return lambda obj: (getter(obj),)
+    return lambda obj: ()
+
+
+def _format_value(value) -> str:
+    """Форматирует значение поля: строки выводятся в кавычках."""
+    if isinstance(value, str):
+        return f"'{value}'"
+    return str(value)
 
 
 class ReprMixin:
-    """Миксин для вывода информации о создании объекта."""
+    """
+    Миксин для вывода информации о создании объекта.
+
+    Функция чтения полей из `_fields` составляется один раз для каждого
+    подкласса. Если у объекта есть слот `_render`, готовая строка
+    хранится в нем вместе со значениями полей и используется повторно,
+    пока поля ссылаются на те же объекты. Значения сравниваются по
+    тождеству: равные 256 и 256.0 выводятся по-разному.
+    """
+
+    __slots__ = ()
+
+    # Поля для вывода в порядке параметров конструктора
+    _fields = ()
+
+    _repr_values = staticmethod(_values_getter(_fields))
+
+    def __init_subclass__(cls, **kwargs):
+        """Составляет функцию чтения полей для подкласса."""
+        super().__init_subclass__(**kwargs)
+        cls._repr_values = staticmethod(_values_getter(cls._fields))
 
     def __repr__(self):
         """Возвращает строковое представление
          объекта с параметрами конструктора."""
+        try:
+            values = self._repr_values(self)
+        except AttributeError:
+            # Часть полей еще не задана в конструкторе
+            return self.__partial_repr()
+
+        # Кэш отображения: строка `__str__`, значения полей и `repr`
+        render = getattr(self, '_render', None)
+        if render is not None and render[1] is not None and all(
+                map(operator.is_, render[1], values)
+        ):
+            return render[2]
+
+        text = (
+            f"{type(self).__name__}({', '.join(map(_format_value, values))})"
+        )
+        try:
+            self._render = (render and render[0], values, text)
+        except AttributeError:
+            pass
+        return text
+
+    def __partial_repr(self):
+        """Представление объекта только по заданным полям."""
         params = []
-        for key, value in self.__dict__.items():
-            # Исключаем приватные атрибуты, начинающиеся с __
-            if not key.startswith('_'):
-                # Обрабатываем строки - добавляем кавычки
-                if isinstance(value, str):
-                    params.append(f"'{value}'")
-                else:
-                    params.append(str(value))
+        for key in self._fields:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                params.append(_format_value(value))
+        return f"{type(self).__name__}({', '.join(params)})"
+
+
+def interactive_policy(product, old_price: float, new_price: float) -> bool:
+    """Запрашивает подтверждение понижения цены у пользователя."""
+    confirmation = input(
+        f"Цена понижается с {old_price} до {new_price}."
+        f" Подтвердите (y/n): "
+    )
+    return confirmation.lower() == 'y'
+
+
+def approve_all(product, old_price: float, new_price: float) -> bool:
+    """Подтверждает любое понижение цены."""
+    return True
+
+
+def reject_all(product, old_price: float, new_price: float) -> bool:
+    """Отклоняет любое понижение цены."""
+    return False
+
+
+def max_drop_policy(percent: float):
+    """
+    Создает политику, подтверждающую понижение не более чем на `percent`.
+
+    Args:
+        percent (float): Допустимое понижение цены в процентах.
+
+    Returns:
+        callable: Политика подтверждения понижения цены.
+    """
+    def policy(product, old_price: float, new_price: float) -> bool:
+        return (old_price - new_price) * 100 <= old_price * percent
+
+    return policy
+
+
+# Политика подтверждения понижения цены: вызывается с товаром, старой и
+# новой ценой и возвращает True, если изменение разрешено
+_price_policy = interactive_policy
+_price_policy_override = ContextVar('price_policy_override', default=None)
+
+
+def set_price_policy(policy):
+    """
+    Устанавливает политику подтверждения понижения цены для модуля.
+
+    Args:
+        policy: Функция `(product, old_price, new_price) -> bool`.
+    """
+    global _price_policy
+    _price_policy = policy
+
+
+def get_price_policy():
+    """Возвращает политику подтверждения для текущего контекста."""
+    override = _price_policy_override.get()
+    return _price_policy if override is None else override
 
-        class_name = self.__class__.__name__
-        return f"{class_name}({', '.join(params)})"
+
+@contextmanager
+def price_policy(policy):
+    """Контекстный менеджер для временной смены политики подтверждения."""
+    token = _price_policy_override.set(policy)
+    try:
+        yield
+    finally:
+        _price_policy_override.reset(token)
+
+
+# События изменения товаров и категорий
+PriceChanged = namedtuple('PriceChanged', 'product old new')
+QuantityChanged = namedtuple('QuantityChanged', 'product old new')
+NameChanged = namedtuple('NameChanged', 'product old new')
+ProductAdded = namedtuple('ProductAdded', 'category product')
+
+# Событие изменения по названию поля товара
+_FIELD_EVENTS = {
+    'price': PriceChanged,
+    'quantity': QuantityChanged,
+    'name': NameChanged,
+}
+
+
+class EventBus:
+    """
+    Шина событий изменения цен, количеств и названий товаров и
+    добавления товаров в категории.
+
+    Пока нет подписчиков, `active` равно False, и товары не создают
+    объекты событий.
+    """
+
+    def __init__(self):
+        """Конструктор шины."""
+        self.active = False
+        self.__lock = threading.Lock()
+        # Обработчики по типу события; ключ None — все события
+        self.__handlers = {}
+
+    def subscribe(self, handler, *event_types):
+        """
+        Подписывает обработчик на события.
+
+        Args:
+            handler: Функция, вызываемая с событием.
+            *event_types: Типы событий, например `PriceChanged`. Без
+                типов обработчик получает все события.
+
+        Returns:
+            Тот же обработчик.
+        """
+        with self.__lock:
+            for event_type in event_types or (None,):
+                handlers = self.__handlers.get(event_type, ())
+                self.__handlers[event_type] = handlers + (handler,)
+            self.active = True
+        return handler
+
+    def unsubscribe(self, handler):
+        """Отписывает обработчик от всех событий."""
+        with self.__lock:
+            remaining = {}
+            for event_type, handlers in self.__handlers.items():
+                handlers = tuple(h for h in handlers if h != handler)
+                if handlers:
+                    remaining[event_type] = handlers
+            self.__handlers = remaining
+            self.active = bool(remaining)
+
+    def publish(self, event):
+        """Передает событие подписанным обработчикам."""
+        handlers = self.__handlers
+        for handler in handlers.get(type(event), ()):
+            handler(event)
+        for handler in handlers.get(None, ()):
+            handler(event)
+
+
+# Шина событий модуля
+event_bus = EventBus()
+
+
+def coalesce(events) -> list:
+    """
+    Объединяет изменения одного поля одного товара в одно событие.
+
+    У объединенного события старое значение берется из первого
+    изменения, а новое — из последнего; изменения, вернувшие поле к
+    исходному значению, отбрасываются. События добавления товаров не
+    объединяются. Объединенное событие занимает место последнего
+    изменения, поэтому изменение после добавления товара в категорию
+    остается после события добавления.
+
+    Args:
+        events: Итерируемый набор событий.
+
+    Returns:
+        list: Объединенные события.
+    """
+    merged = {}
+    for position, event in enumerate(events):
+        if type(event) is ProductAdded:
+            merged[position] = event
+            continue
+        key = (type(event), id(event.product))
+        first = merged.pop(key, None)
+        merged[key] = event if first is None else first._replace(
+            new=event.new
+        )
+    return [
+        event for event in merged.values()
+        if type(event) is ProductAdded or event.old != event.new
+    ]
+
+
+class ProductIndex:
+    """
+    Индекс товаров по названию без учета регистра.
+
+    Позволяет находить дубликаты в `Product.new_product` за O(1) вместо
+    линейного просмотра списка товаров.
+    """
+
+    def __init__(self, products: list = None):
+        """
+        Конструктор индекса.
+
+        Args:
+            products (list, optional): Товары для начального заполнения.
+        """
+        self.__products = {}
+        for product in products or []:
+            self.add(product)
+
+    @staticmethod
+    def key(name: str) -> str:
+        """Ключ индекса для названия товара."""
+        return name.lower()
+
+    def add(self, product):
+        """
+        Добавляет товар в индекс.
+
+        Если товар с таким названием уже есть, сохраняется первый из них,
+        как и при поиске по списку.
+        """
+        self.__products.setdefault(self.key(product.name), product)
+
+    def remove(self, product, name: str = None) -> bool:
+        """
+        Удаляет товар из индекса.
+
+        Args:
+            product (Product): Товар для удаления.
+            name (str, optional): Название, под которым товар был
+                добавлен. По умолчанию текущее название товара.
+
+        Returns:
+            bool: True, если товар был в индексе под этим названием.
+        """
+        key = self.key(product.name if name is None else name)
+        if self.__products.get(key) is product:
+            del self.__products[key]
+            return True
+        return False
+
+    def get(self, name: str):
+        """Возвращает товар по названию или None."""
+        return self.__products.get(self.key(name))
+
+    def __contains__(self, name: str) -> bool:
+        """Проверяет наличие товара с указанным названием."""
+        return self.key(name) in self.__products
+
+    def __len__(self) -> int:
+        """Количество уникальных названий в индексе."""
+        return len(self.__products)
+
+    def __iter__(self):
+        """Перебирает товары в порядке добавления."""
+        return iter(self.__products.values())
 
 
 class BaseProduct(ABC):
     """Абстрактный базовый класс для всех продуктов."""
 
+    # Атрибуты хранятся в слотах без словаря экземпляра, что заметно
+    # уменьшает объем памяти на один товар. Название и количество
+    # доступны через свойства `name` и `quantity` наследника.
+    __slots__ = ('_name', 'description', '__price', '_quantity', '__weakref__')
+
     @abstractmethod
     def __init__(
             self,
@@ -78,6 +493,15 @@ class BaseProduct(ABC):
 class Product(BaseProduct, ReprMixin):
     """Класс для представления товара."""
 
+    # Слабые ссылки на наблюдателей за изменением названия, цены и
+    # количества и общий кэш строкового представления и `repr`.
+    # Резервы хранятся отдельно в `_RESERVATIONS`, чтобы не занимать
+    # место в каждом товаре
+    __slots__ = ('_observers', '_render')
+
+    # Параметры конструктора в порядке их передачи
+    _fields = ('name', 'description', 'price', 'quantity')
+
     def __init__(
             self, name: str,
             description: str,
@@ -93,9 +517,11 @@ class Product(BaseProduct, ReprMixin):
             price (float): Цена товара.
             quantity (int): Количество товара в наличии.
         """
+        self._observers = None
+        self._render = None
         super().__init__(name, description, price, quantity)
         # Выводим информацию о создании объекта
-        print(f"Создан объект: {repr(self)}")
+        _announce("Создан объект: %r", self, level=logging.DEBUG)
 
     @classmethod
     def new_product(cls, product_data: dict, products_list: list = None):
@@ -104,30 +530,105 @@ class Product(BaseProduct, ReprMixin):
 
         Args:
             product_data (dict): Словарь с данными товара.
-            products_list (list, optional): Список существующих товаров для
-                проверки дубликатов.
+            products_list (list | ProductIndex, optional): Список
+                существующих товаров или индекс для проверки дубликатов.
+                Новый товар добавляется в индекс, список не изменяется.
 
         Returns:
             Product: Новый или существующий товар.
         """
         name = product_data.get('name')
-        description = product_data.get('description')
         price = product_data.get('price')
         quantity = product_data.get('quantity')
 
         # Проверка на дубликаты
+        existing_product = cls._find_duplicate(name, products_list)
+        if existing_product is not None:
+            with _STOCK_LOCKS[_stock_lock_index(existing_product)]:
+                # Объединяем количества
+                existing_product.quantity += quantity
+                # Выбираем максимальную цену
+                if price > existing_product.price:
+                    existing_product.price = price
+            return existing_product
+
+        # Если дубликат не найден, создаем новый товар
+        product = cls(
+            **{field: product_data.get(field) for field in cls._fields}
+        )
+        if isinstance(products_list, ProductIndex):
+            products_list.add(product)
+        return product
+
+    @classmethod
+    def _restore(cls, values):
+        """
+        Восстанавливает товар из значений полей без вызова `__init__`.
+
+        Не выводит сообщений, не проверяет цену и не запрашивает
+        подтверждений. Используется при загрузке сохраненного каталога.
+
+        Args:
+            values: Значения полей в порядке `_fields`.
+
+        Returns:
+            Product: Восстановленный товар.
+        """
+        product = cls.__new__(cls)
+        product._observers = None
+        product._render = None
+        product._name = values[0]
+        product.description = values[1]
+        product._BaseProduct__price = values[2]
+        product._quantity = values[3]
+        for field, value in zip(cls._fields[4:], values[4:]):
+            setattr(product, field, value)
+        return product
+
+    @classmethod
+    def bulk_create(cls, rows, index: ProductIndex = None) -> list:
+        """
+        Создает товары из набора словарей без вывода в stdout.
+
+        Дубликаты объединяются по правилам `new_product`.
+
+        Args:
+            rows: Итерируемый набор словарей с данными товаров.
+            index (ProductIndex, optional): Индекс существующих товаров.
+
+        Returns:
+            list: Созданные товары в порядке первого появления.
+        """
+        index = ProductIndex() if index is None else index
+        created = []
+        with quiet():
+            for row in rows:
+                known = len(index)
+                product = cls.new_product(row, index)
+                if len(index) > known:
+                    created.append(product)
+        return created
+
+    @staticmethod
+    def _find_duplicate(name: str, products_list):
+        """
+        Ищет товар с тем же названием без учета регистра.
+
+        Args:
+            name (str): Название нового товара.
+            products_list (list | ProductIndex): Существующие товары.
+
+        Returns:
+            Product | None: Найденный товар или None.
+        """
+        if isinstance(products_list, ProductIndex):
+            return products_list.get(name)
         if products_list:
+            key = name.lower()
             for existing_product in products_list:
-                if existing_product.name.lower() == name.lower():
-                    # Объединяем количества
-                    existing_product.quantity += quantity
-                    # Выбираем максимальную цену
-                    if price > existing_product.price:
-                        existing_product.price = price
+                if existing_product.name.lower() == key:
                     return existing_product
-
-        # Если дубликат не найден, создаем новый товар
-        return cls(name, description, price, quantity)
+        return None
 
     @property
     def price(self):
@@ -142,28 +643,235 @@ class Product(BaseProduct, ReprMixin):
         Args:
             new_price (float): Новая цена товара.
 
+        Понижение цены подтверждается текущей политикой, см.
+        `set_price_policy`.
+
         Raises:
             ValueError: Если цена равна или меньше нуля.
         """
+        self._set_price(new_price, get_price_policy())
+
+    def _set_price(self, new_price: float, policy) -> bool:
+        """
+        Устанавливает цену с проверкой валидности.
+
+        Args:
+            new_price (float): Новая цена товара.
+            policy: Политика подтверждения понижения цены.
+
+        Returns:
+            bool: True, если цена изменена.
+        """
         if new_price <= 0:
-            print("Цена не должна быть нулевая или отрицательная")
-            return
+            _announce(
+                "Цена не должна быть нулевая или отрицательная",
+                level=logging.WARNING
+            )
+            return False
 
         # Подтверждение понижения цены
-        if new_price < self._BaseProduct__price:
-            confirmation = input(
-                f"Цена понижается с {self._BaseProduct__price} до {new_price}."
-                f" Подтвердите (y/n): "
-            )
-            if confirmation.lower() != 'y':
-                print("Изменение цены отменено")
-                return
+        old_price = self._BaseProduct__price
+        if new_price < old_price and not policy(self, old_price, new_price):
+            _announce("Изменение цены отменено")
+            return False
 
         self._BaseProduct__price = new_price
+        # Сбрасываем и `repr`: равные цены 100 и 100.0 выводятся
+        # по-разному
+        self._render = None
+        if self._observers or event_bus.active:
+            self._changed('price', old_price, new_price)
+        return True
+
+    @property
+    def name(self):
+        """Геттер для названия товара."""
+        return self._name
+
+    @name.setter
+    def name(self, new_name: str):
+        """
+        Сеттер для названия с уведомлением наблюдателей.
+
+        Args:
+            new_name (str): Новое название товара.
+        """
+        self._render = None
+        if self._observers or event_bus.active:
+            # В конструкторе название задается впервые
+            old_name = getattr(self, '_name', _MISSING)
+            self._name = new_name
+            if old_name is not _MISSING:
+                self._changed('name', old_name, new_name)
+        else:
+            self._name = new_name
+
+    @property
+    def quantity(self):
+        """Геттер для количества товара."""
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, new_quantity: int):
+        """
+        Сеттер для количества с уведомлением наблюдателей.
+
+        Args:
+            new_quantity (int): Новое количество товара.
+        """
+        self._render = None
+        if self._observers or event_bus.active:
+            old_quantity = getattr(self, '_quantity', _MISSING)
+            self._quantity = new_quantity
+            if old_quantity is not _MISSING:
+                self._changed('quantity', old_quantity, new_quantity)
+        else:
+            self._quantity = new_quantity
+
+    @property
+    def reserved(self) -> int:
+        """Количество зарезервированных единиц товара."""
+        return _RESERVATIONS.get(self, 0)
+
+    @property
+    def available(self) -> int:
+        """Количество единиц товара, доступных для резервирования."""
+        return self._quantity - _RESERVATIONS.get(self, 0)
+
+    def reserve(self, amount: int) -> bool:
+        """
+        Резервирует единицы товара.
+
+        Args:
+            amount (int): Количество единиц.
+
+        Returns:
+            bool: True, если товар зарезервирован, и False, если
+                доступного количества не хватает.
+
+        Raises:
+            ValueError: Если количество не положительное.
+        """
+        _check_amount(amount)
+        with _STOCK_LOCKS[_stock_lock_index(self)]:
+            if self.available < amount:
+                return False
+            _add_reserved(self, amount)
+            return True
+
+    def commit(self, amount: int):
+        """
+        Списывает зарезервированные единицы товара со склада.
+
+        Args:
+            amount (int): Количество единиц.
+
+        Raises:
+            ValueError: Если количество не положительное или больше
+                зарезервированного.
+        """
+        with _STOCK_LOCKS[_stock_lock_index(self)]:
+            self._check_reserved(amount)
+            _add_reserved(self, -amount)
+            self.quantity = self._quantity - amount
+
+    def release(self, amount: int):
+        """
+        Снимает резерв с единиц товара.
+
+        Args:
+            amount (int): Количество единиц.
+
+        Raises:
+            ValueError: Если количество не положительное или больше
+                зарезервированного.
+        """
+        with _STOCK_LOCKS[_stock_lock_index(self)]:
+            self._check_reserved(amount)
+            _add_reserved(self, -amount)
+
+    def _check_reserved(self, amount: int):
+        """Проверяет, что `amount` не больше зарезервированного."""
+        _check_amount(amount)
+        reserved = _RESERVATIONS.get(self, 0)
+        if amount > reserved:
+            raise ValueError(
+                f"Зарезервировано только {reserved} шт. товара "
+                f"{self._name}"
+            )
+
+    def _subscribe(self, observer):
+        """
+        Подписывает наблюдателя на изменения товара.
+
+        Товар хранит слабую ссылку, поэтому не продлевает жизнь
+        наблюдателя. При изменении вызывается метод наблюдателя
+        `_product_changed(product, field, old, new)`.
+        """
+        Product._subscribe_all((self,), observer)
+
+    @staticmethod
+    def _subscribe_all(products, observer):
+        """
+        Подписывает наблюдателя на изменения всех товаров.
+
+        Ссылки хранятся в неизменяемом кортеже, поэтому товары с одним
+        набором наблюдателей используют один общий кортеж.
+        """
+        references = (weakref.ref(observer),)
+        locks = _PRODUCT_LOCKS
+        size = len(locks)
+        for product in products:
+            with locks[(id(product) >> 4) % size]:
+                observers = product._observers
+                if observers is None:
+                    product._observers = references
+                else:
+                    product._observers = observers + references
+
+    def _unsubscribe(self, observer):
+        """Отписывает наблюдателя от изменений товара."""
+        with _product_lock(self):
+            if self._observers:
+                self._observers = tuple(
+                    ref for ref in self._observers
+                    if ref() is not None and ref() is not observer
+                ) or None
+
+    def _changed(self, field: str, old, new):
+        """Уведомляет наблюдателей и шину событий об изменении поля."""
+        if event_bus.active:
+            event_bus.publish(_FIELD_EVENTS[field](self, old, new))
+        if not self._observers:
+            return
+        alive = False
+        for ref in self._observers:
+            observer = ref()
+            if observer is not None:
+                alive = True
+                observer._product_changed(self, field, old, new)
+        if not alive:
+            with _product_lock(self):
+                if not any(ref() is not None for ref in self._observers):
+                    self._observers = None
 
     def __str__(self):
-        """Строковое представление товара."""
-        return f"{self.name}, {self.price} руб. Остаток: {self.quantity} шт."
+        """
+        Строковое представление товара.
+
+        Строка кэшируется до изменения названия, цены или количества.
+        """
+        render = self._render
+        if render is not None and render[0] is not None:
+            return render[0]
+        line = (
+            f"{self._name}, {self._BaseProduct__price} руб. "
+            f"Остаток: {self._quantity} шт."
+        )
+        self._render = (line, None, None) if render is None else (
+            (line,) + render[1:]
+        )
+        return line
 
     def __add__(self, other):
         """
@@ -187,10 +895,163 @@ class Product(BaseProduct, ReprMixin):
 
         return (self.price * self.quantity) + (other.price * other.quantity)
 
+    def __radd__(self, other):
+        """
+        Сложение числа с товаром - прибавляет стоимость товара.
+
+        Позволяет считать общую стоимость через `sum(products)` и
+        цепочки `product1 + product2 + product3`.
+
+        Args:
+            other (int | float): Накопленная стоимость.
+
+        Returns:
+            float: Накопленная стоимость с учетом товара.
+        """
+        if isinstance(other, (int, float)):
+            return other + self.price * self.quantity
+        return NotImplemented
+
+
+class InventoryValuation:
+    """Стоимость товаров на складе: общая и по группам."""
+
+    def __init__(self, total: float = 0.0, groups: dict = None):
+        """
+        Конструктор оценки.
+
+        Args:
+            total (float): Общая стоимость.
+            groups (dict, optional): Стоимость по группам.
+        """
+        self.total = total
+        self.groups = groups if groups is not None else {}
+
+    def __str__(self):
+        """Строковое представление оценки."""
+        return f"Стоимость товаров: {self.total} руб."
+
+
+_get_price = operator.attrgetter('price')
+_get_quantity = operator.attrgetter('quantity')
+
+
+def _sum_value(products: list) -> float:
+    """Сумма цена × количество по списку товаров."""
+    return float(sum(map(
+        operator.mul,
+        map(_get_price, products),
+        map(_get_quantity, products)
+    )))
+
+
+def _group_by_class(product) -> type:
+    """Группировка товаров по классу."""
+    return type(product)
+
+
+def inventory_value(
+        products,
+        group_by=_group_by_class,
+        strict: bool = False
+) -> InventoryValuation:
+    """
+    Считает стоимость товаров за один проход.
+
+    Args:
+        products: Итерируемый набор товаров.
+        group_by (optional): Функция от товара, возвращающая ключ группы.
+            По умолчанию товары группируются по классу; None отключает
+            группировку.
+        strict (bool): Требовать, чтобы все товары были одного класса,
+            как при сложении через `+`.
+
+    Returns:
+        InventoryValuation: Общая стоимость и стоимость по группам.
+
+    Raises:
+        TypeError: Если передан не товар или, в строгом режиме, товары
+            разных классов.
+    """
+    total = 0.0
+    groups = {}
+    first_class = None
+    for product in products:
+        if not isinstance(product, Product):
+            raise TypeError("Можно складывать только объекты класса Product")
+        if strict:
+            first_class = first_class or type(product)
+            if type(product) is not first_class:
+                raise TypeError("Нельзя складывать товары разных классов")
+
+        value = product.price * product.quantity
+        total += value
+        if group_by is not None:
+            key = group_by(product)
+            groups[key] = groups.get(key, 0.0) + value
+    return InventoryValuation(total, groups)
+
+
+PriceChange = namedtuple('PriceChange', 'product old_price new_price')
+
+
+class RepriceResult:
+    """Результат массового изменения цен."""
+
+    def __init__(self):
+        """Конструктор результата."""
+        self.applied = []
+        self.rejected = []
+
+    def __str__(self):
+        """Строковое представление результата."""
+        return (
+            f"Применено: {len(self.applied)}, "
+            f"отклонено: {len(self.rejected)}"
+        )
+
+
+def reprice(changes, policy=None) -> RepriceResult:
+    """
+    Массово изменяет цены товаров без вывода в stdout.
+
+    Args:
+        changes: Словарь `{товар: новая цена}` или набор пар
+            `(товар, новая цена)`.
+        policy (optional): Политика подтверждения понижения цены. По
+            умолчанию используется текущая политика.
+
+    Returns:
+        RepriceResult: Примененные и отклоненные изменения.
+    """
+    policy = get_price_policy() if policy is None else policy
+    if hasattr(changes, 'items'):
+        changes = changes.items()
+
+    result = RepriceResult()
+    with quiet():
+        for product, new_price in changes:
+            change = PriceChange(product, product.price, new_price)
+            if product._set_price(new_price, policy):
+                result.applied.append(change)
+            else:
+                result.rejected.append(change)
+    return result
+
+
+def _check_amount(amount: int):
+    """Проверяет, что количество для резервирования положительное."""
+    if amount <= 0:
+        raise ValueError("Количество должно быть положительным")
+
 
 class Smartphone(Product):
     """Класс для представления смартфона."""
 
+    __slots__ = ('efficiency', 'model', 'memory', 'color')
+
+    _fields = Product._fields + ('efficiency', 'model', 'memory', 'color')
+
     def __init__(
             self,
             name: str,
@@ -225,6 +1086,10 @@ class Smartphone(Product):
 class LawnGrass(Product):
     """Класс для представления газонной травы."""
 
+    __slots__ = ('country', 'germination_period', 'color')
+
+    _fields = Product._fields + ('country', 'germination_period', 'color')
+
     def __init__(
             self,
             name: str,
@@ -253,14 +1118,288 @@ class LawnGrass(Product):
         self.color = color
 
 
+class PriceIndex:
+    """
+    Отсортированный по цене индекс товаров для запросов по диапазону.
+
+    Цены и товары хранятся в параллельных списках, позиция находится
+    двоичным поиском `bisect`. Изменения цен накапливаются и
+    применяются перед следующим запросом: несколько изменений — по
+    одному, много изменений — одной пересортировкой.
+    """
+
+    # Доля измененных товаров, начиная с которой индекс пересортируется
+    REBUILD_RATIO = 64
+
+    def __init__(self, products=()):
+        """
+        Конструктор индекса.
+
+        Args:
+            products: Товары для начального заполнения.
+        """
+        # Начальное заполнение одной сортировкой вместо вставки по одному
+        products = sorted(products, key=_get_price)
+        self.__prices = [product.price for product in products]
+        self.__products = products
+        # Цены, с которыми в индексе записаны товары с новой ценой
+        self.__moved = {}
+
+    def add(self, product):
+        """Добавляет товар в индекс."""
+        self.__apply_moves()
+        position = bisect_right(self.__prices, product.price)
+        self.__prices.insert(position, product.price)
+        self.__products.insert(position, product)
+
+    def remove(self, product, price: float = None) -> bool:
+        """
+        Удаляет товар из индекса.
+
+        Args:
+            product (Product): Товар для удаления.
+            price (float, optional): Цена, с которой товар был
+                добавлен. По умолчанию текущая цена товара.
+
+        Returns:
+            bool: True, если товар был найден.
+        """
+        self.__apply_moves()
+        price = product.price if price is None else price
+        position = bisect_left(self.__prices, price)
+        while (position < len(self.__prices)
+               and self.__prices[position] == price):
+            if self.__products[position] is product:
+                del self.__prices[position]
+                del self.__products[position]
+                return True
+            position += 1
+        return False
+
+    def move(self, product, old_price: float):
+        """
+        Отмечает изменение цены товара.
+
+        Args:
+            product (Product): Товар из индекса.
+            old_price (float): Прежняя цена товара.
+        """
+        self.__moved.setdefault(product, old_price)
+
+    def range(self, min_price: float = None, max_price: float = None):
+        """
+        Возвращает товары с ценой в диапазоне по возрастанию цены.
+
+        Args:
+            min_price (float, optional): Нижняя граница включительно.
+            max_price (float, optional): Верхняя граница включительно.
+
+        Returns:
+            list: Список товаров.
+        """
+        self.__apply_moves()
+        start = 0
+        if min_price is not None:
+            start = bisect_left(self.__prices, min_price)
+        stop = len(self.__prices)
+        if max_price is not None:
+            stop = bisect_right(self.__prices, max_price)
+        return self.__products[start:stop]
+
+    def __len__(self) -> int:
+        """Количество товаров в индексе."""
+        return len(self.__products)
+
+    def __apply_moves(self):
+        """Переносит товары с измененной ценой на новые позиции."""
+        moved = self.__moved
+        if not moved:
+            return
+        self.__moved = {}
+        if len(moved) * self.REBUILD_RATIO < len(self.__products):
+            for product, old_price in moved.items():
+                # Товар, добавленный в категорию несколько раз, занимает
+                # в индексе несколько позиций
+                count = 0
+                while self.remove(product, old_price):
+                    count += 1
+                for _ in range(count):
+                    self.add(product)
+            return
+        # Сортировка почти упорядоченного списка близка к линейной
+        self.__products.sort(key=_get_price)
+        self.__prices = [product.price for product in self.__products]
+
+
+class ProductColumns:
+    """
+    Колоночное хранилище цен и количеств товаров категории.
+
+    Цены и количества хранятся в компактных массивах `array`, поэтому
+    агрегаты вычисляются встроенными функциями без обращения к объектам
+    товаров. Массивы поддерживают протокол буфера и при необходимости
+    передаются в NumPy без копирования через `numpy.frombuffer`.
+    """
+
+    def __init__(self, products=()):
+        """
+        Конструктор хранилища.
+
+        Args:
+            products: Товары для начального заполнения.
+        """
+        self.prices = array('d')
+        self.quantities = array('q')
+        self.__rows = {}
+        for product in products:
+            self.append(product)
+
+    def append(self, product):
+        """Добавляет строку с ценой и количеством товара."""
+        self.__rows.setdefault(id(product), []).append(len(self.prices))
+        self.prices.append(product.price)
+        self.quantities.append(product.quantity)
+
+    def update(self, product, field: str, value):
+        """
+        Обновляет значение поля во всех строках товара.
+
+        Args:
+            product (Product): Измененный товар.
+            field (str): `price` или `quantity`.
+            value: Новое значение.
+        """
+        column = self.prices if field == 'price' else self.quantities
+        for row in self.__rows.get(id(product), ()):
+            column[row] = value
+
+    def __len__(self) -> int:
+        """Количество строк в хранилище."""
+        return len(self.prices)
+
+    def total_stock(self) -> int:
+        """Общее количество товаров на складе."""
+        return sum(self.quantities)
+
+    def inventory_value(self) -> float:
+        """Общая стоимость товаров: сумма цена × количество."""
+        return sum(map(operator.mul, self.prices, self.quantities))
+
+    def min_price(self):
+        """Минимальная цена или None для пустого хранилища."""
+        return min(self.prices, default=None)
+
+    def max_price(self):
+        """Максимальная цена или None для пустого хранилища."""
+        return max(self.prices, default=None)
+
+    def mean_price(self):
+        """Средняя цена или None для пустого хранилища."""
+        if not self.prices:
+            return None
+        return sum(self.prices) / len(self.prices)
+
+    def sum_where(
+            self,
+            column: str = 'quantity',
+            min_price: float = None,
+            max_price: float = None
+    ):
+        """
+        Сумма по колонке для строк с ценой в заданном диапазоне.
+
+        Args:
+            column (str): `quantity`, `price` или `value` (цена ×
+                количество).
+            min_price (float, optional): Нижняя граница цены включительно.
+            max_price (float, optional): Верхняя граница цены включительно.
+
+        Returns:
+            float | int: Сумма по отобранным строкам.
+
+        Raises:
+            ValueError: Если указана неизвестная колонка.
+        """
+        if column == 'quantity':
+            values = self.quantities
+        elif column == 'price':
+            values = self.prices
+        elif column == 'value':
+            values = map(operator.mul, self.prices, self.quantities)
+        else:
+            raise ValueError(f"Неизвестная колонка: {column}")
+
+        low = float('-inf') if min_price is None else min_price
+        high = float('inf') if max_price is None else max_price
+        mask = (low <= price <= high for price in self.prices)
+        return sum(compress(values, mask))
+
+
+class ProductLinesView(Sequence):
+    """Ленивая последовательность строк товаров категории."""
+
+    def __init__(self, products: list):
+        """
+        Конструктор представления.
+
+        Args:
+            products (list): Список товаров категории.
+        """
+        self.__products = products
+
+    def __len__(self) -> int:
+        """Количество товаров."""
+        return len(self.__products)
+
+    def __getitem__(self, index):
+        """
+        Возвращает строку товара или список строк для среза.
+
+        Args:
+            index (int | slice): Номер товара или срез.
+        """
+        if isinstance(index, slice):
+            return [str(product) for product in self.__products[index]]
+        return str(self.__products[index])
+
+
+class _counter:
+    """
+    Свойство счетчика, доступное и у класса, и у экземпляра.
+
+    Функция вызывается с классом и экземпляром (None при обращении
+    через класс), поэтому значение всегда актуально.
+    """
+
+    def __init__(self, getter):
+        """Конструктор свойства."""
+        self.getter = getter
+        self.__doc__ = getter.__doc__
+
+    def __get__(self, category, owner):
+        """Возвращает текущее значение счетчика."""
+        return self.getter(owner, category)
+
+
 class Category:
     """Класс для представления категории товаров в интернет-магазине."""
 
-    # Атрибуты класса
+    # Атрибуты класса: число созданных категорий и добавленных товаров
     total_categories = 0
     total_products = 0
 
-    def __init__(self, name: str, description: str, products: list = None):
+    # Блокировка для изменения счетчиков класса из разных потоков
+    _counter_lock = threading.Lock()
+    # Реестр существующих категорий со слабыми ссылками
+    _registry = weakref.WeakSet()
+
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            products: list = None,
+            columnar: bool = False
+    ):
         """
         Конструктор класса Category.
 
@@ -268,14 +1407,38 @@ class Category:
             name (str): Название категории.
             description (str): Описание категории.
             products (list): Список товаров в этой категории.
+            columnar (bool): Хранить цены и количества в колоночном
+                хранилище `ProductColumns` для быстрых агрегатов.
         """
         self.name = name
         self.description = description
         self.__products = products if products else []
+        self.__columns = None
+        if columnar:
+            self.__columns = ProductColumns(self.__products)
+        self.__lock = threading.RLock()
+        # Кэш списка строк товаров для свойства `products`
+        self.__lines = None
+        # Слабые ссылки на наблюдателей за добавлением товаров
+        self.__observers = ()
+        # Индексы по названию, цене и типу товара
+        self.__names = ProductIndex(self.__products)
+        self.__prices = PriceIndex(self.__products)
+        self.__types = {}
+
+        # Итоги поддерживаются по уведомлениям от товаров
+        self.__total_quantity = sum(map(_get_quantity, self.__products))
+        self.__total_value = _sum_value(self.__products)
+        types = self.__types
+        for product in self.__products:
+            types.setdefault(type(product), []).append(product)
+        Product._subscribe_all(self.__products, self)
 
         # Обновляем атрибуты класса
-        Category.total_categories += 1
-        Category.total_products += len(self.__products)
+        with Category._counter_lock:
+            Category.total_categories += 1
+            Category.total_products += len(self.__products)
+            Category._registry.add(self)
 
     def __str__(self):
         """
@@ -284,8 +1447,9 @@ class Category:
         Returns:
             str: Строка с информацией о категории и общем количестве товаров.
         """
-        total_quantity = sum(product.quantity for product in self.__products)
-        return f"{self.name}, количество продуктов: {total_quantity} шт."
+        return (
+            f"{self.name}, количество продуктов: {self.__total_quantity} шт."
+        )
 
     def add_product(self, product):
         """
@@ -296,26 +1460,387 @@ class Category:
 
         Raises:
             TypeError: Если передан не объект класса Product.
+            ValueError: Если добавление запретил наблюдатель категории,
+                например каталог с другим товаром того же названия.
         """
         # Проверка типа
         if not isinstance(product, Product):
             raise TypeError("Можно добавлять только объекты класса Product")
 
+        # Наблюдатели могут запретить добавление до изменения категории
+        for ref in self.__observers:
+            check = getattr(ref(), '_check_product', None)
+            if check is not None:
+                check(self, product)
+
         # Добавление в приватный список
-        self.__products.append(product)
+        with self.__lock:
+            self.__products.append(product)
+            if self.__columns is not None:
+                self.__columns.append(product)
+            self.__names.add(product)
+            self.__prices.add(product)
+            self.__track(product)
+            self.__lines = None
 
         # Обновление счетчика
-        Category.total_products += 1
+        with Category._counter_lock:
+            Category.total_products += 1
+
+        for ref in self.__observers:
+            observer = ref()
+            if observer is not None:
+                observer._product_added(self, product)
+        if event_bus.active:
+            event_bus.publish(ProductAdded(self, product))
+
+    def _subscribe(self, observer):
+        """
+        Подписывает наблюдателя на добавление товаров в категорию.
+
+        Категория хранит слабую ссылку на наблюдателя. После добавления
+        вызывается метод наблюдателя `_product_added(category, product)`,
+        а до добавления — метод `_check_product(category, product)`, если
+        он есть у наблюдателя; исключение из него отменяет добавление.
+        """
+        with self.__lock:
+            self.__observers = tuple(
+                ref for ref in self.__observers if ref() is not None
+            ) + (weakref.ref(observer),)
 
     @property
     def products(self):
         """
         Геттер для списка товаров в виде форматированных строк.
 
+        Список кэшируется до добавления товара или изменения названия,
+        цены или количества одного из товаров.
+
         Returns:
             list: Список строк с информацией о товарах.
         """
-        return [str(product) for product in self.__products]
+        lines = self.__lines
+        if lines is None:
+            lines = self.__lines = [
+                str(product) for product in self.__products
+            ]
+        return list(lines)
+
+    @property
+    def products_view(self):
+        """
+        Геттер для ленивого представления строк товаров.
+
+        Строки форматируются только при обращении к элементам, поэтому
+        для вывода одной страницы не нужно строить весь список.
+
+        Returns:
+            ProductLinesView: Последовательность строк товаров.
+        """
+        return ProductLinesView(self.__products)
+
+    def products_page(self, offset: int = 0, limit: int = None) -> list:
+        """
+        Возвращает строки товаров для одной страницы.
+
+        Args:
+            offset (int): Номер первого товара.
+            limit (int, optional): Максимальное количество строк.
+
+        Returns:
+            list: Список строк с информацией о товарах.
+        """
+        stop = None if limit is None else offset + limit
+        return self.products_view[offset:stop]
+
+    def __track(self, product):
+        """
+        Учитывает товар в итогах и индексе типов и подписывается на его
+        изменения.
+        """
+        self.__total_quantity += product.quantity
+        self.__total_value += product.price * product.quantity
+        self.__types.setdefault(type(product), []).append(product)
+        product._subscribe(self)
+
+    def __rename(self, product, old_name: str):
+        """Обновляет индекс названий после переименования товара."""
+        if self.__names.remove(product, old_name):
+            # Название могло остаться у другого товара категории
+            key = ProductIndex.key(old_name)
+            for other in self.__products:
+                if ProductIndex.key(other.name) == key:
+                    self.__names.add(other)
+                    break
+        self.__names.add(product)
+
+    def _product_changed(self, product, field: str, old, new):
+        """Обрабатывает изменение цены или количества товара."""
+        with self.__lock:
+            self.__lines = None
+            if field == 'quantity':
+                self.__total_quantity += new - old
+                self.__total_value += product.price * (new - old)
+            elif field == 'price':
+                self.__total_value += (new - old) * product.quantity
+                self.__prices.move(product, old)
+            elif field == 'name':
+                self.__rename(product, old)
+            # Колонки хранят только цены и количества
+            if self.__columns is not None and field != 'name':
+                self.__columns.update(product, field, new)
+
+    def __iter__(self):
+        """Перебирает товары категории."""
+        return iter(self.__products)
+
+    def iter_snapshot(self):
+        """
+        Перебирает товары, которые были в категории на момент вызова.
+
+        Товары только добавляются в конец списка, поэтому снимок не
+        требует копирования: перебираются первые N товаров.
+        """
+        return islice(self.__products, len(self.__products))
+
+    def iter_filtered(self, predicate):
+        """
+        Перебирает товары, для которых `predicate(product)` истинно.
+
+        Args:
+            predicate: Функция от товара, возвращающая bool.
+        """
+        return filter(predicate, self.__products)
+
+    def iter_by_type(self, product_class, exact: bool = False):
+        """
+        Перебирает товары указанного класса в порядке добавления.
+
+        Args:
+            product_class (type): Класс товара.
+            exact (bool): Не включать товары подклассов.
+        """
+        for product in self.__products:
+            if (type(product) is product_class if exact
+                    else isinstance(product, product_class)):
+                yield product
+
+    def iter_price_range(
+            self,
+            min_price: float = None,
+            max_price: float = None
+    ):
+        """
+        Перебирает товары с ценой в диапазоне в порядке добавления.
+
+        Args:
+            min_price (float, optional): Нижняя граница включительно.
+            max_price (float, optional): Верхняя граница включительно.
+        """
+        low = float('-inf') if min_price is None else min_price
+        high = float('inf') if max_price is None else max_price
+        for product in self.__products:
+            if low <= product.price <= high:
+                yield product
+
+    def iter_in_stock(self):
+        """Перебирает товары с ненулевым остатком."""
+        for product in self.__products:
+            if product.quantity > 0:
+                yield product
+
+    def find(self, name: str):
+        """
+        Ищет товар категории по названию без учета регистра.
+
+        Args:
+            name (str): Название товара.
+
+        Returns:
+            Product | None: Первый товар с таким названием или None.
+        """
+        return self.__names.get(name)
+
+    def products_in_price_range(
+            self,
+            min_price: float = None,
+            max_price: float = None
+    ) -> list:
+        """
+        Возвращает товары с ценой в диапазоне по возрастанию цены.
+
+        Args:
+            min_price (float, optional): Нижняя граница включительно.
+            max_price (float, optional): Верхняя граница включительно.
+
+        Returns:
+            list: Список товаров.
+        """
+        with self.__lock:
+            return self.__prices.range(min_price, max_price)
+
+    def products_by_type(self, product_class, exact: bool = False) -> list:
+        """
+        Возвращает товары указанного класса.
+
+        Args:
+            product_class (type): Класс товара, например `Smartphone`.
+            exact (bool): Не включать товары подклассов.
+
+        Returns:
+            list: Список товаров.
+        """
+        if exact:
+            return list(self.__types.get(product_class, ()))
+        result = []
+        for cls, products in list(self.__types.items()):
+            if issubclass(cls, product_class):
+                result.extend(products)
+        return result
+
+    def total_value(self, strict: bool = False) -> float:
+        """
+        Общая стоимость товаров категории.
+
+        Значение берется из поддерживаемого итога и не требует прохода
+        по товарам.
+
+        Args:
+            strict (bool): Требовать, чтобы все товары были одного класса.
+
+        Returns:
+            float: Сумма цена × количество по всем товарам.
+
+        Raises:
+            TypeError: Если в строгом режиме в категории товары разных
+                классов.
+        """
+        if strict and len(self.__types) > 1:
+            raise TypeError("Нельзя складывать товары разных классов")
+        return self.__total_value
+
+    def valuation(
+            self,
+            group_by=_group_by_class,
+            strict: bool = False
+    ) -> InventoryValuation:
+        """
+        Стоимость товаров категории по группам.
+
+        Args:
+            group_by (optional): Функция от товара, возвращающая ключ
+                группы. По умолчанию группировка по классу.
+            strict (bool): Требовать, чтобы все товары были одного класса.
+
+        Returns:
+            InventoryValuation: Общая стоимость и стоимость по группам.
+        """
+        if group_by is not _group_by_class:
+            return inventory_value(self.__products, group_by, strict)
+
+        # Группы по классу уже есть в индексе типов, стоимость каждой
+        # считается встроенными функциями без цикла на Python
+        self.total_value(strict)
+        with self.__lock:
+            groups = {
+                cls: _sum_value(products)
+                for cls, products in self.__types.items()
+            }
+        return InventoryValuation(sum(groups.values()), groups)
+
+    @property
+    def total_quantity(self):
+        """
+        Геттер для общего количества товаров на складе.
+
+        Returns:
+            int: Сумма остатков всех товаров категории.
+        """
+        return self.__total_quantity
+
+    @property
+    def inventory_value(self):
+        """
+        Геттер для общей стоимости товаров категории.
+
+        Returns:
+            float: Сумма цена × количество по всем товарам.
+        """
+        return self.__total_value
+
+    def reserve(self, items) -> bool:
+        """
+        Резервирует несколько товаров по принципу «все или ничего».
+
+        Блокируются только остатки переданных товаров, поэтому заказы с
+        разными товарами обрабатываются параллельно.
+
+        Args:
+            items: Словарь или пары товар и количество.
+
+        Returns:
+            bool: True, если зарезервированы все товары, и False, если
+                хотя бы одного не хватает; тогда резерв не меняется.
+
+        Raises:
+            ValueError: Если количество не положительное.
+        """
+        amounts = _merge_amounts(items)
+        with _stock_locks(amounts):
+            for product, amount in amounts.items():
+                if product.available < amount:
+                    return False
+            for product, amount in amounts.items():
+                _add_reserved(product, amount)
+        return True
+
+    def commit(self, items):
+        """
+        Списывает зарезервированные товары со склада.
+
+        Args:
+            items: Словарь или пары товар и количество.
+
+        Raises:
+            ValueError: Если количество больше зарезервированного; тогда
+                ни один товар не списывается.
+        """
+        amounts = _merge_amounts(items)
+        with _stock_locks(amounts):
+            for product, amount in amounts.items():
+                product._check_reserved(amount)
+            for product, amount in amounts.items():
+                _add_reserved(product, -amount)
+                product.quantity = product.quantity - amount
+
+    def release(self, items):
+        """
+        Снимает резерв с нескольких товаров.
+
+        Args:
+            items: Словарь или пары товар и количество.
+
+        Raises:
+            ValueError: Если количество больше зарезервированного; тогда
+                ни один резерв не снимается.
+        """
+        amounts = _merge_amounts(items)
+        with _stock_locks(amounts):
+            for product, amount in amounts.items():
+                product._check_reserved(amount)
+            for product, amount in amounts.items():
+                _add_reserved(product, -amount)
+
+    @property
+    def columns(self):
+        """
+        Геттер для колоночного хранилища.
+
+        Returns:
+            ProductColumns | None: Хранилище или None, если категория
+                создана без `columnar=True`.
+        """
+        return self.__columns
 
     @property
     def products_objects(self):
@@ -327,29 +1852,76 @@ class Category:
         """
         return self.__products
 
-    @property
-    def product_count(self):
+    @_counter
+    def product_count(cls, category=None):
         """
-        Геттер для количества товаров в категории.
+        Количество товаров в категории.
+
+        У класса возвращает общее количество добавленных товаров.
 
         Returns:
-            int: Количество товаров в категории.
+            int: Количество товаров.
         """
-        return len(self.__products)
+        if category is None:
+            return cls.total_products
+        return len(category.__products)
 
-    @property
-    def category_count(self):
+    @_counter
+    def category_count(cls, category=None):
+        """
+        Общее количество созданных категорий.
+
+        Returns:
+            int: Количество категорий.
+        """
+        return cls.total_categories
+
+    @classmethod
+    def live_categories(cls) -> list:
         """
-        Геттер для общего количества категорий.
+        Возвращает существующие в данный момент категории.
+
+        Реестр хранит слабые ссылки, поэтому удаленные категории в нем
+        не учитываются.
 
         Returns:
-            int: Общее количество созданных категорий.
+            list: Список категорий.
         """
-        return Category.total_categories
+        with cls._counter_lock:
+            return list(cls._registry)
+
+    @classmethod
+    def live_category_count(cls) -> int:
+        """Количество существующих в данный момент категорий."""
+        return len(cls.live_categories())
+
+    @classmethod
+    def live_product_count(cls) -> int:
+        """Количество товаров в существующих в данный момент категориях."""
+        return sum(
+            category.product_count for category in cls.live_categories()
+        )
+
+
+def _merge_amounts(items) -> dict:
+    """Складывает количества одного товара из списка пар или словаря."""
+    if isinstance(items, dict):
+        items = items.items()
+    amounts = {}
+    for product, amount in items:
+        _check_amount(amount)
+        amounts[product] = amounts.get(product, 0) + amount
+    return amounts
 
 
 class CategoryIterator:
-    """Итератор для перебора товаров в категории."""
+    """
+    Итератор для перебора товаров в категории.
+
+    Товары в категорию только добавляются, поэтому длина списка служит
+    версией категории: если во время перебора был вызван
+    `add_product`, итератор выбрасывает RuntimeError.
+    """
 
     def __init__(self, category):
         """
@@ -360,6 +1932,8 @@ class CategoryIterator:
         """
         self.category = category
         self.index = 0
+        self.__products = category.products_objects
+        self.__length = len(self.__products)
 
     def __iter__(self):
         """Возвращает сам итератор."""
@@ -374,14 +1948,12 @@ class CategoryIterator:
 
         Raises:
             StopIteration: Когда товары закончились.
+            RuntimeError: Если категория изменилась во время перебора.
         """
-        if self.index < len(self.category.products_objects):
-            product = self.category.products_objects[self.index]
+        if len(self.__products) != self.__length:
+            raise RuntimeError("Категория изменилась во время перебора")
+        if self.index < self.__length:
+            product = self.__products[self.index]
             self.index += 1
             return product
         raise StopIteration
-
-
-# Для обратной совместимости с main.py добавляем атрибуты класса как свойства
-Category.category_count = Category.total_categories
-Category.product_count = Category.total_products
\ No newline at end of file
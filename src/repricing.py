@@ -0,0 +1,248 @@
+"""
+Массовое изменение цен по правилам с предварительным просмотром.
+
+Правило отбирает товары по классу и значениям полей и задает
+преобразование цены, например «все `Smartphone` с памятью от 512 −10 %».
+Условия проверяются по колонкам: сначала берутся товары нужного класса
+из индекса типов категории, затем для каждого поля читается колонка
+значений и товары отфильтровываются `itertools.compress`. План
+изменений можно просмотреть до применения.
+"""
+import operator
+from itertools import compress, repeat
+
+from .models import Category, PriceChange, Product, approve_all, reprice
+
+
+class Rule:
+    """Правило изменения цены."""
+
+    def __init__(
+            self,
+            name: str,
+            transform,
+            product_class=Product,
+            **conditions
+    ):
+        """
+        Конструктор правила.
+
+        Args:
+            name (str): Название правила для отчета.
+            transform: Функция от текущей цены, возвращающая новую цену.
+            product_class (type): Класс товаров, к которым применяется
+                правило, включая подклассы.
+            **conditions: Условия на поля товара: значение для проверки
+                на равенство или функция от значения, возвращающая bool.
+        """
+        self.name = name
+        self.transform = transform
+        self.product_class = product_class
+        self.conditions = conditions
+
+    @classmethod
+    def percent(
+            cls,
+            percent: float,
+            product_class=Product,
+            name: str = None,
+            **conditions
+    ):
+        """
+        Создает правило изменения цены на процент с округлением до копеек.
+
+        Args:
+            percent (float): Изменение в процентах, например -10.
+            product_class (type): Класс товаров.
+            name (str, optional): Название правила.
+            **conditions: Условия на поля товара.
+
+        Returns:
+            Rule: Правило.
+        """
+        factor = 1 + percent / 100
+        if name is None:
+            name = f"{product_class.__name__} {percent:+g} %"
+        return cls(
+            name,
+            lambda price: round(price * factor, 2),
+            product_class,
+            **conditions
+        )
+
+    def select(self, products: list) -> list:
+        """
+        Отбирает товары, удовлетворяющие условиям правила.
+
+        Args:
+            products (list): Товары класса правила.
+
+        Returns:
+            list: Отобранные товары в исходном порядке.
+        """
+        for field, condition in self.conditions.items():
+            if not products:
+                break
+            values = map(operator.attrgetter(field), products)
+            if callable(condition):
+                mask = map(condition, values)
+            else:
+                mask = map(operator.eq, values, repeat(condition))
+            products = list(compress(products, mask))
+        return products
+
+    def __repr__(self):
+        """Представление для отладки."""
+        return f"Rule({self.name!r})"
+
+
+class PlannedChange:
+    """Запланированное изменение цены товара."""
+
+    __slots__ = ('product', 'old_price', 'new_price', 'rules')
+
+    def __init__(self, product, old_price: float):
+        """
+        Конструктор изменения.
+
+        Args:
+            product (Product): Товар.
+            old_price (float): Текущая цена.
+        """
+        self.product = product
+        self.old_price = old_price
+        self.new_price = old_price
+        self.rules = []
+
+    @property
+    def percent(self) -> float:
+        """Изменение цены в процентах."""
+        return (self.new_price / self.old_price - 1) * 100
+
+    def __str__(self):
+        """Строка отчета об изменении."""
+        return (
+            f"{self.product.name}: {self.old_price} -> {self.new_price} "
+            f"({self.percent:+.1f} %) [{', '.join(self.rules)}]"
+        )
+
+
+class RepricingPlan:
+    """
+    План массового изменения цен.
+
+    Содержит допустимые изменения и изменения, отклоненные проверкой
+    цены: как и сеттер `Product.price`, план не допускает нулевых и
+    отрицательных цен.
+    """
+
+    def __init__(self, changes: list, invalid: list):
+        """
+        Конструктор плана.
+
+        Args:
+            changes (list): Допустимые изменения `PlannedChange`.
+            invalid (list): Изменения с ценой не больше нуля.
+        """
+        self.changes = changes
+        self.invalid = invalid
+
+    def __len__(self) -> int:
+        """Количество допустимых изменений."""
+        return len(self.changes)
+
+    def __str__(self):
+        """Краткая сводка плана."""
+        return (
+            f"Изменений цен: {len(self.changes)}, "
+            f"отклонено проверкой: {len(self.invalid)}"
+        )
+
+    def report(self) -> str:
+        """
+        Отчет о всех изменениях без их применения.
+
+        Returns:
+            str: Строки изменений, затем отклоненные изменения.
+        """
+        lines = [str(change) for change in self.changes]
+        if self.invalid:
+            lines.append("Цена должна быть больше нуля:")
+            lines.extend(f"  {change}" for change in self.invalid)
+        lines.append(str(self))
+        return '\n'.join(lines)
+
+    def apply(self, policy=approve_all):
+        """
+        Применяет допустимые изменения через `reprice`.
+
+        Изменения товаров, цена которых изменилась после составления
+        плана, не применяются и попадают в отклоненные.
+
+        Args:
+            policy (optional): Политика подтверждения понижения цены. По
+                умолчанию понижения подтверждаются, так как план уже
+                просмотрен.
+
+        Returns:
+            RepriceResult: Примененные и отклоненные изменения.
+        """
+        current = []
+        stale = []
+        for change in self.changes:
+            product = change.product
+            if product.price == change.old_price:
+                current.append((product, change.new_price))
+            else:
+                stale.append(
+                    PriceChange(product, product.price, change.new_price)
+                )
+        result = reprice(current, policy)
+        result.rejected.extend(stale)
+        return result
+
+
+def plan_repricing(products, rules) -> RepricingPlan:
+    """
+    Составляет план изменения цен без изменения товаров.
+
+    Правила применяются по порядку: если товар подходит под несколько
+    правил, преобразования выполняются одно за другим. Товар, который
+    встречается в наборе несколько раз, изменяется каждым правилом
+    один раз.
+
+    Args:
+        products: Категория или итерируемый набор товаров.
+        rules: Правила в порядке применения.
+
+    Returns:
+        RepricingPlan: План изменений.
+    """
+    if isinstance(products, Category):
+        by_class = products.products_by_type
+    else:
+        products = list(products)
+
+        def by_class(product_class):
+            return [p for p in products if isinstance(p, product_class)]
+
+    planned = {}
+    for rule in rules:
+        selected = rule.select(by_class(rule.product_class))
+        for product in dict.fromkeys(selected):
+            change = planned.get(product)
+            if change is None:
+                change = planned[product] = PlannedChange(
+                    product, product.price
+                )
+            change.new_price = rule.transform(change.new_price)
+            change.rules.append(rule.name)
+
+    changes = []
+    invalid = []
+    for change in planned.values():
+        if change.new_price <= 0:
+            invalid.append(change)
+        elif change.new_price != change.old_price:
+            changes.append(change)
+    return RepricingPlan(changes, invalid)
@@ -0,0 +1,283 @@
+"""
+Полнотекстовый поиск по названиям и описаниям товаров.
+
+Индекс хранит для каждого слова товары, в которых оно встречается, и
+отсортированный словарь слов для поиска по префиксу через `bisect`.
+Индекс подписывается на категории и товары и обновляется при
+добавлении товаров и изменении их названий.
+"""
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left, insort
+
+from .models import Product
+
+# Вес вхождения слова в название и в описание товара
+NAME_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Множитель веса для слов, найденных только по префиксу
+PREFIX_FACTOR = 0.5
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит текст к виду для поиска: без учета регистра и с «е»
+    вместо «ё».
+    """
+    return text.casefold().replace('ё', 'е')
+
+
+def tokenize(text: str) -> list:
+    """
+    Разбивает текст на слова.
+
+    Словами считаются последовательности букв любого алфавита, цифр и
+    подчеркиваний, например «256gb» или «серый».
+
+    Args:
+        text (str): Текст.
+
+    Returns:
+        list: Нормализованные слова в порядке следования.
+    """
+    if not text:
+        return []
+    return _WORD.findall(normalize(text))
+
+
+class SearchIndex:
+    """
+    Инвертированный индекс товаров одной или нескольких категорий.
+
+    Товар, входящий в несколько категорий, индексируется один раз.
+    Изменения описаний не отслеживаются, для них вызывается `reindex`.
+    """
+
+    def __init__(self, categories=()):
+        """
+        Конструктор индекса.
+
+        Args:
+            categories: Итерируемый набор категорий для индексации.
+        """
+        self.__lock = threading.RLock()
+        # Номер документа по товару и товары по номеру
+        self.__doc_ids = {}
+        self.__products = []
+        # Веса слов документа и документы с весами по слову
+        self.__doc_terms = []
+        self.__postings = {}
+        # Отсортированный словарь для поиска по префиксу
+        self.__terms = []
+        for category in categories:
+            self.add_category(category)
+
+    def __len__(self) -> int:
+        """Количество проиндексированных товаров."""
+        return len(self.__products)
+
+    def add_category(self, category):
+        """
+        Индексирует товары категории и подписывается на ее изменения.
+
+        Args:
+            category (Category): Категория.
+        """
+        with self.__lock:
+            added = []
+            new_terms = []
+            for product in category.products_objects:
+                if product not in self.__doc_ids:
+                    new_terms.extend(self.__add(product))
+                    added.append(product)
+            self.__merge_terms(new_terms)
+            Product._subscribe_all(added, self)
+            category._subscribe(self)
+
+    def reindex(self, product):
+        """
+        Обновляет слова товара, например после изменения описания.
+
+        Args:
+            product (Product): Проиндексированный товар.
+        """
+        with self.__lock:
+            doc = self.__doc_ids.get(product)
+            if doc is not None:
+                self.__remove_terms(doc)
+                self.__index_terms(doc, product)
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True):
+        """
+        Ищет товары, содержащие все слова запроса.
+
+        Args:
+            query (str): Текст запроса.
+            limit (int): Максимальное количество результатов.
+            prefix (bool): Искать слова запроса также как префиксы,
+                например «смарт» найдет «смартфон».
+
+        Returns:
+            list: Товары по убыванию релевантности.
+        """
+        return [product for product, _ in self.search_scored(
+            query, limit, prefix
+        )]
+
+    def search_scored(self, query: str, limit: int = 10,
+                      prefix: bool = True):
+        """
+        Ищет товары и возвращает их вместе с оценкой релевантности.
+
+        Оценка слова запроса равна весу вхождения, умноженному на
+        обратную частоту слова в индексе. Совпадения по префиксу
+        учитываются с множителем `PREFIX_FACTOR`.
+
+        Returns:
+            list: Пары товар и оценка по убыванию оценки; при равных
+                оценках раньше идут товары, проиндексированные раньше.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self.__lock:
+            # Начинаем с самого редкого слова, чтобы дальше проверять
+            # только найденные по нему товары
+            groups = sorted(
+                ((token, self.__expand(token, prefix)) for token in tokens),
+                key=lambda group: self.__size(group[1])
+            )
+            scores = self.__match(*groups[0])
+            for token, terms in groups[1:]:
+                scores = self.__narrow(scores, token, terms)
+            best = heapq.nlargest(
+                limit, scores.items(), key=lambda item: (item[1], -item[0])
+            )
+            return [(self.__products[doc], score) for doc, score in best]
+
+    def _product_added(self, category, product):
+        """Индексирует товар, добавленный в категорию."""
+        with self.__lock:
+            if product in self.__doc_ids:
+                return
+            for term in self.__add(product):
+                insort(self.__terms, term)
+            product._subscribe(self)
+
+    def _product_changed(self, product, field: str, old, new):
+        """Переиндексирует товар после изменения названия."""
+        if field == 'name':
+            self.reindex(product)
+
+    def __add(self, product) -> list:
+        """
+        Добавляет товар в индекс.
+
+        Returns:
+            list: Слова, которых раньше не было в словаре.
+        """
+        doc = len(self.__products)
+        self.__doc_ids[product] = doc
+        self.__products.append(product)
+        self.__doc_terms.append({})
+        return self.__index_terms(doc, product, sort=False)
+
+    def __index_terms(self, doc: int, product, sort: bool = True) -> list:
+        """Записывает слова товара в индекс и возвращает новые слова."""
+        weights = {}
+        for term in tokenize(product.name):
+            weights[term] = weights.get(term, 0.0) + NAME_WEIGHT
+        for term in tokenize(product.description):
+            weights[term] = weights.get(term, 0.0) + DESCRIPTION_WEIGHT
+        self.__doc_terms[doc] = weights
+
+        new_terms = []
+        postings = self.__postings
+        for term, weight in weights.items():
+            documents = postings.get(term)
+            if documents is None:
+                documents = postings[term] = {}
+                new_terms.append(term)
+                if sort:
+                    insort(self.__terms, term)
+            documents[doc] = weight
+        return new_terms
+
+    def __remove_terms(self, doc: int):
+        """Удаляет слова документа из индекса."""
+        for term in self.__doc_terms[doc]:
+            documents = self.__postings[term]
+            del documents[doc]
+            if not documents:
+                del self.__postings[term]
+                del self.__terms[bisect_left(self.__terms, term)]
+        self.__doc_terms[doc] = {}
+
+    def __merge_terms(self, new_terms):
+        """Добавляет в словарь много новых слов одной сортировкой."""
+        if new_terms:
+            self.__terms.extend(new_terms)
+            self.__terms.sort()
+
+    def __expand(self, token: str, prefix: bool) -> list:
+        """Возвращает слова словаря, совпадающие с токеном запроса."""
+        if not prefix:
+            return [token] if token in self.__postings else []
+        terms = self.__terms
+        position = bisect_left(terms, token)
+        matched = []
+        while position < len(terms) and terms[position].startswith(token):
+            matched.append(terms[position])
+            position += 1
+        return matched
+
+    def __size(self, terms: list) -> int:
+        """Количество вхождений слов в индексе."""
+        return sum(len(self.__postings[term]) for term in terms)
+
+    def __factor(self, token: str, term: str) -> float:
+        """Множитель веса слова словаря для токена запроса."""
+        factor = math.log(
+            1 + len(self.__products) / len(self.__postings[term])
+        )
+        return factor if term == token else factor * PREFIX_FACTOR
+
+    def __match(self, token: str, terms: list) -> dict:
+        """Возвращает оценки всех документов со словами токена."""
+        scores = {}
+        for term in terms:
+            factor = self.__factor(token, term)
+            for doc, weight in self.__postings[term].items():
+                score = weight * factor
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def __narrow(self, scores: dict, token: str, terms: list) -> dict:
+        """Оставляет документы со словами токена и суммирует оценки."""
+        if len(scores) * len(terms) >= self.__size(terms):
+            other = self.__match(token, terms)
+            return {
+                doc: score + other[doc]
+                for doc, score in scores.items() if doc in other
+            }
+
+        weighted = [
+            (self.__postings[term], self.__factor(token, term))
+            for term in terms
+        ]
+        result = {}
+        for doc, score in scores.items():
+            best = 0.0
+            for documents, factor in weighted:
+                weight = documents.get(doc, 0.0) * factor
+                if weight > best:
+                    best = weight
+            if best:
+                result[doc] = score + best
+        return result
@@ -0,0 +1,229 @@
+"""
+Сохранение и загрузка каталога в компактном двоичном формате.
+
+Товары группируются по классу, и каждое поле класса хранится отдельной
+колонкой: числа в виде массивов `array`, строки в виде одной строки
+UTF-8 с таблицей смещений. Поэтому загрузка сводится к нескольким
+чтениям больших блоков, а товары восстанавливаются без вызова
+`__init__`, то есть без вывода сообщений и проверок.
+"""
+import gc
+import marshal
+import struct
+from array import array
+
+from .models import Category, Product
+
+MAGIC = b'OPCAT\x01'
+
+_LENGTH = struct.Struct('<Q')
+
+# Виды колонок
+_STR = b's'
+_INT = b'q'
+_FLOAT = b'd'
+_OBJECT = b'o'
+
+
+def product_classes() -> dict:
+    """
+    Возвращает все классы товаров по имени.
+
+    Returns:
+        dict: `Product` и его подклассы.
+    """
+    classes = {}
+    pending = [Product]
+    while pending:
+        cls = pending.pop()
+        classes[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def save_snapshot(path: str, categories) -> int:
+    """
+    Сохраняет категории и их товары в файл.
+
+    Товар, входящий в несколько категорий, сохраняется один раз.
+
+    Args:
+        path (str): Путь к файлу.
+        categories: Итерируемый набор категорий.
+
+    Returns:
+        int: Количество сохраненных товаров.
+    """
+    categories = list(categories)
+    groups = {}
+    seen = set()
+    for category in categories:
+        for product in category.products_objects:
+            if id(product) not in seen:
+                seen.add(id(product))
+                groups.setdefault(type(product), []).append(product)
+
+    # Номера товаров в порядке групп, в котором они будут загружены
+    rows = {}
+    for products in groups.values():
+        for product in products:
+            rows[id(product)] = len(rows)
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        _write_blob(file, marshal.dumps(len(groups)))
+        for cls, products in groups.items():
+            _write_group(file, cls, products)
+
+        _write_blob(file, marshal.dumps(len(categories)))
+        for category in categories:
+            _write_blob(file, marshal.dumps((
+                category.name,
+                category.description,
+                category.columns is not None,
+            )))
+            members = array('q', (
+                rows[id(product)] for product in category.products_objects
+            ))
+            _write_blob(file, members.tobytes())
+    return len(rows)
+
+
+def load_snapshot(path: str) -> list:
+    """
+    Загружает категории из файла.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        list: Список категорий в порядке сохранения.
+
+    Raises:
+        ValueError: Если файл не является сохраненным каталогом или
+            содержит неизвестный класс товара.
+    """
+    # Загрузка создает миллионы объектов без циклических ссылок, а
+    # сборщик мусора запускался бы на каждые несколько сотен из них
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, 'rb') as file:
+            return _read_snapshot(file, path)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _read_snapshot(file, path: str) -> list:
+    """Читает категории из открытого файла."""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"Файл не является снимком каталога: {path}")
+
+    classes = product_classes()
+    products = []
+    for _ in range(marshal.loads(_read_blob(file))):
+        products.extend(_read_group(file, classes))
+
+    categories = []
+    for _ in range(marshal.loads(_read_blob(file))):
+        name, description, columnar = marshal.loads(_read_blob(file))
+        members = array('q')
+        members.frombytes(_read_blob(file))
+        categories.append(Category(
+            name,
+            description,
+            [products[row] for row in members],
+            columnar=columnar
+        ))
+    return categories
+
+
+def _write_group(file, cls, products: list):
+    """Записывает товары одного класса по колонкам."""
+    _write_blob(file, marshal.dumps((cls.__name__, len(products))))
+    for field in cls._fields:
+        values = [getattr(product, field) for product in products]
+        kind, data = _encode_column(values)
+        file.write(kind)
+        _write_blob(file, data)
+
+
+def _read_group(file, classes: dict) -> list:
+    """Читает товары одного класса и восстанавливает их."""
+    class_name, count = marshal.loads(_read_blob(file))
+    cls = classes.get(class_name)
+    if cls is None:
+        raise ValueError(f"Неизвестный класс товара: {class_name}")
+
+    columns = []
+    for _ in cls._fields:
+        kind = file.read(1)
+        columns.append(_decode_column(kind, _read_blob(file)))
+    restore = cls._restore
+    products = [restore(values) for values in zip(*columns)]
+    if len(products) != count:
+        raise ValueError("Снимок каталога поврежден")
+    return products
+
+
+def _encode_column(values: list):
+    """
+    Кодирует колонку значений.
+
+    Returns:
+        tuple: Вид колонки и ее данные.
+    """
+    kinds = {type(value) for value in values}
+    if kinds == {str}:
+        offsets = array('q', [0])
+        position = 0
+        for value in values:
+            position += len(value)
+            offsets.append(position)
+        text = ''.join(values).encode('utf-8')
+        return _STR, _LENGTH.pack(len(offsets)) + offsets.tobytes() + text
+    if kinds == {float}:
+        return _FLOAT, array('d', values).tobytes()
+    if kinds == {int}:
+        try:
+            return _INT, array('q', values).tobytes()
+        except OverflowError:
+            pass
+    return _OBJECT, marshal.dumps(values)
+
+
+def _decode_column(kind: bytes, data: bytes) -> list:
+    """
+    Декодирует колонку значений.
+
+    Raises:
+        ValueError: Если вид колонки неизвестен.
+    """
+    if kind == _STR:
+        size = _LENGTH.unpack_from(data)[0] * 8
+        offsets = array('q')
+        offsets.frombytes(data[_LENGTH.size:_LENGTH.size + size])
+        text = data[_LENGTH.size + size:].decode('utf-8')
+        return [
+            text[start:end] for start, end in zip(offsets, offsets[1:])
+        ]
+    if kind in (_FLOAT, _INT):
+        column = array(kind.decode())
+        column.frombytes(data)
+        return column.tolist()
+    if kind == _OBJECT:
+        return marshal.loads(data)
+    raise ValueError(f"Неизвестный вид колонки: {kind!r}")
+
+
+def _write_blob(file, data: bytes):
+    """Записывает блок данных с длиной."""
+    file.write(_LENGTH.pack(len(data)))
+    file.write(data)
+
+
+def _read_blob(file) -> bytes:
+    """Читает блок данных с длиной."""
+    size = _LENGTH.unpack(file.read(_LENGTH.size))[0]
+    return file.read(size)
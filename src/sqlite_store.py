@@ -0,0 +1,404 @@
+"""
+Хранение категорий и товаров в SQLite.
+
+Хранилище подписывается на категории и товары и записывает добавление
+товаров, объединение количеств в `new_product` и изменение цен пакетами
+в одной транзакции вместо отдельного коммита на каждую строку.
+"""
+import json
+import sqlite3
+import threading
+import weakref
+
+from .models import Category, ProductIndex
+from .snapshot import product_classes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    class TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    description TEXT,
+    price NOT NULL,
+    quantity INTEGER NOT NULL,
+    attributes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS category_products (
+    category_id INTEGER NOT NULL REFERENCES categories (id),
+    position INTEGER NOT NULL,
+    product_id INTEGER NOT NULL REFERENCES products (id),
+    PRIMARY KEY (category_id, position)
+);
+CREATE INDEX IF NOT EXISTS products_name_key ON products (name_key);
+CREATE INDEX IF NOT EXISTS products_price ON products (price);
+"""
+
+
+class SQLiteStore:
+    """
+    Хранилище каталога в SQLite с пакетной записью изменений.
+
+    Изменения накапливаются и записываются, когда их число достигает
+    `batch_size`, а также перед каждым запросом, при вызове `flush` и
+    при выходе из блока `with`.
+    """
+
+    def __init__(self, path: str = ':memory:', batch_size: int = 1000):
+        """
+        Открывает базу данных и создает таблицы.
+
+        Args:
+            path (str): Путь к файлу базы данных.
+            batch_size (int): Количество изменений в одной транзакции.
+        """
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self.__lock = threading.RLock()
+        self.__ids = weakref.WeakKeyDictionary()
+        self.__products = weakref.WeakValueDictionary()
+        self.__categories = {}
+        # Подключенные объекты категорий по названию
+        self.__attached = weakref.WeakValueDictionary()
+        self.__positions = {}
+        self.__next_id = self.connection.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM products"
+        ).fetchone()[0]
+        self.__pending = 0
+        self.__inserts = []
+        self.__members = []
+        self.__updates = {}
+
+    def __enter__(self):
+        """Возвращает хранилище для использования в `with`."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Записывает изменения и закрывает базу данных."""
+        self.close()
+
+    def close(self):
+        """Записывает изменения и закрывает базу данных."""
+        self.flush()
+        self.connection.close()
+
+    def attach(self, category):
+        """
+        Сохраняет категорию и записывает ее дальнейшие изменения.
+
+        Повторное подключение той же категории ничего не делает.
+        Категория, уже сохраненная в базе данных, подключается через
+        `load_category`.
+
+        Args:
+            category (Category): Категория для сохранения.
+
+        Returns:
+            Category: Та же категория.
+
+        Raises:
+            ValueError: Если подключена другая категория с тем же
+                названием или категория с таким названием уже есть в
+                базе данных.
+        """
+        with self.__lock:
+            attached = self.__attached.get(category.name)
+            if attached is category:
+                return category
+            if attached is None and self.__is_stored(category.name):
+                raise ValueError(
+                    f"Категория {category.name} уже сохранена, "
+                    f"используйте load_category"
+                )
+            self.__attach(category)
+            self.__register(category, self.__category_id(category))
+            for product in category.products_objects:
+                self._product_added(category, product)
+            category._subscribe(self)
+        return category
+
+    def flush(self):
+        """Записывает накопленные изменения одной транзакцией."""
+        with self.__lock:
+            if not self.__pending:
+                return
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO products (id, class, name, name_key, "
+                    "description, price, quantity, attributes) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    self.__inserts
+                )
+                self.connection.executemany(
+                    "INSERT INTO category_products "
+                    "(category_id, position, product_id) VALUES (?, ?, ?)",
+                    self.__members
+                )
+                for field, values in self.__grouped_updates().items():
+                    self.connection.executemany(
+                        f"UPDATE products SET {field} = ? WHERE id = ?",
+                        values
+                    )
+            self.__inserts = []
+            self.__members = []
+            self.__updates = {}
+            self.__pending = 0
+
+    def _product_added(self, category, product):
+        """Записывает добавление товара в категорию."""
+        with self.__lock:
+            category_id = self.__categories.get(category.name)
+            if (category_id is None
+                    or self.__attached.get(category.name) is not category):
+                return
+            product_id = self.__product_id(product)
+            position = self.__positions[category_id]
+            self.__positions[category_id] = position + 1
+            self.__members.append((category_id, position, product_id))
+            self.__queued()
+
+    def _product_changed(self, product, field: str, old, new):
+        """Записывает изменение названия, цены или количества товара."""
+        with self.__lock:
+            product_id = self.__ids.get(product)
+            if product_id is None:
+                return
+            # Для каждого поля товара сохраняется только последнее значение
+            self.__updates[product_id, field] = new
+            self.__queued()
+
+    def products(self, category_name: str) -> list:
+        """
+        Возвращает строки товаров категории.
+
+        Args:
+            category_name (str): Название категории.
+
+        Returns:
+            list: Список строк с информацией о товарах.
+        """
+        return [
+            f"{name}, {price} руб. Остаток: {quantity} шт."
+            for name, price, quantity in self.__query(
+                "SELECT products.name, price, quantity "
+                "FROM category_products "
+                "JOIN products ON products.id = product_id "
+                "JOIN categories ON categories.id = category_id "
+                "WHERE categories.name = ? ORDER BY position",
+                (category_name,)
+            )
+        ]
+
+    def total_quantity(self, category_name: str) -> int:
+        """Общее количество товаров категории на складе."""
+        return self.__query(
+            "SELECT COALESCE(SUM(quantity), 0) FROM category_products "
+            "JOIN products ON products.id = product_id "
+            "JOIN categories ON categories.id = category_id "
+            "WHERE categories.name = ?", (category_name,)
+        )[0][0]
+
+    def inventory_value(self, category_name: str) -> float:
+        """Общая стоимость товаров категории."""
+        return self.__query(
+            "SELECT COALESCE(SUM(price * quantity), 0.0) "
+            "FROM category_products "
+            "JOIN products ON products.id = product_id "
+            "JOIN categories ON categories.id = category_id "
+            "WHERE categories.name = ?", (category_name,)
+        )[0][0]
+
+    def find(self, name: str):
+        """
+        Ищет товар по названию без учета регистра.
+
+        Args:
+            name (str): Название товара.
+
+        Returns:
+            Product | None: Первый сохраненный товар с таким названием.
+        """
+        rows = self.__query(
+            "SELECT * FROM products WHERE name_key = ? ORDER BY id LIMIT 1",
+            (ProductIndex.key(name),)
+        )
+        return self.__restore(rows[0]) if rows else None
+
+    def products_in_price_range(
+            self,
+            min_price: float = None,
+            max_price: float = None
+    ) -> list:
+        """
+        Возвращает товары с ценой в диапазоне по возрастанию цены.
+
+        Args:
+            min_price (float, optional): Нижняя граница включительно.
+            max_price (float, optional): Верхняя граница включительно.
+
+        Returns:
+            list: Список товаров.
+        """
+        low = float('-inf') if min_price is None else min_price
+        high = float('inf') if max_price is None else max_price
+        rows = self.__query(
+            "SELECT * FROM products WHERE price BETWEEN ? AND ? "
+            "ORDER BY price, id", (low, high)
+        )
+        return [self.__restore(row) for row in rows]
+
+    def category_names(self) -> list:
+        """Возвращает названия сохраненных категорий."""
+        return [row[0] for row in self.__query(
+            "SELECT name FROM categories ORDER BY id"
+        )]
+
+    def load_category(self, name: str):
+        """
+        Загружает категорию из базы данных и подключает ее к хранилищу.
+
+        Товары восстанавливаются без вызова `__init__`; товар, входящий
+        в несколько категорий, загружается одним объектом.
+
+        Args:
+            name (str): Название категории.
+
+        Returns:
+            Category: Загруженная категория.
+
+        Raises:
+            KeyError: Если категории нет в базе данных.
+            ValueError: Если подключена другая категория с тем же
+                названием.
+        """
+        found = self.__query(
+            "SELECT id, description FROM categories WHERE name = ?", (name,)
+        )
+        if not found:
+            raise KeyError(name)
+        category_id, description = found[0]
+        rows = self.__query(
+            "SELECT products.* FROM category_products "
+            "JOIN products ON products.id = product_id "
+            "WHERE category_id = ? ORDER BY position", (category_id,)
+        )
+        category = Category(
+            name, description, [self.__restore(row) for row in rows]
+        )
+        with self.__lock:
+            self.__attach(category)
+            self.__register(category, category_id)
+            category._subscribe(self)
+        return category
+
+    def __query(self, sql: str, parameters=()) -> list:
+        """Записывает изменения и выполняет запрос."""
+        with self.__lock:
+            self.flush()
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def __is_stored(self, name: str) -> bool:
+        """Проверяет, есть ли категория в базе данных."""
+        return name in self.__categories or bool(self.connection.execute(
+            "SELECT 1 FROM categories WHERE name = ?", (name,)
+        ).fetchone())
+
+    def __attach(self, category):
+        """
+        Запоминает объект категории.
+
+        Raises:
+            ValueError: Если подключена другая категория с тем же
+                названием.
+        """
+        if self.__attached.get(category.name) is not None:
+            raise ValueError(
+                f"Подключена другая категория {category.name}"
+            )
+        self.__attached[category.name] = category
+
+    def __register(self, category, category_id: int):
+        """Запоминает номер категории и следующую позицию товара."""
+        self.__categories[category.name] = category_id
+        self.__positions[category_id] = self.connection.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM category_products "
+            "WHERE category_id = ?", (category_id,)
+        ).fetchone()[0] + sum(
+            1 for member in self.__members if member[0] == category_id
+        )
+
+    def __queued(self):
+        """Учитывает изменение и записывает пакет при заполнении."""
+        self.__pending += 1
+        if self.__pending >= self.batch_size:
+            self.flush()
+
+    def __grouped_updates(self) -> dict:
+        """Группирует обновления по полям для `executemany`."""
+        grouped = {}
+        for (product_id, field), value in self.__updates.items():
+            values = grouped.setdefault(field, [])
+            values.append((value, product_id))
+            if field == 'name':
+                grouped.setdefault('name_key', []).append(
+                    (ProductIndex.key(value), product_id)
+                )
+        return grouped
+
+    def __category_id(self, category) -> int:
+        """Возвращает номер категории в базе данных, создавая ее."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO categories (name, description) "
+                "VALUES (?, ?)", (category.name, category.description)
+            )
+        return self.connection.execute(
+            "SELECT id FROM categories WHERE name = ?", (category.name,)
+        ).fetchone()[0]
+
+    def __product_id(self, product) -> int:
+        """Возвращает номер товара, ставя новый товар в очередь записи."""
+        product_id = self.__ids.get(product)
+        if product_id is not None:
+            return product_id
+
+        product_id = self.__next_id
+        self.__next_id += 1
+        self.__ids[product] = product_id
+        self.__products[product_id] = product
+        attributes = {
+            field: getattr(product, field) for field in product._fields[4:]
+        }
+        self.__inserts.append((
+            product_id, type(product).__name__, product.name,
+            ProductIndex.key(product.name), product.description,
+            product.price, product.quantity,
+            json.dumps(attributes, ensure_ascii=False)
+        ))
+        product._subscribe(self)
+        return product_id
+
+    def __restore(self, row):
+        """Восстанавливает товар из строки таблицы `products`."""
+        (product_id, class_name, name, _, description, price, quantity,
+         attributes) = row
+        product = self.__products.get(product_id)
+        if product is not None:
+            return product
+
+        cls = product_classes()[class_name]
+        extra = json.loads(attributes)
+        product = cls._restore(
+            (name, description, price, quantity)
+            + tuple(extra.get(field) for field in cls._fields[4:])
+        )
+        self.__ids[product] = product_id
+        self.__products[product_id] = product
+        product._subscribe(self)
+        return product
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src.aio import AsyncCategory, async_policy
+from src.models import Category, Product, quiet, reject_all
+
+
+def make_category(count: int = 1) -> Category:
+    with quiet():
+        products = [
+            Product(f"Товар {i}", "Описание", 100.0, 10) for i in range(count)
+        ]
+    return Category("Товары", "Разные товары", products)
+
+
+def test_async_update_stock_concurrently():
+    """Тест одновременного изменения остатков многими корутинами."""
+    category = make_category()
+    facade = AsyncCategory(category)
+    product = category.products_objects[0]
+
+    async def main():
+        await asyncio.gather(*(
+            facade.update_stock(product, 1) for _ in range(100)
+        ))
+        await asyncio.gather(*(
+            facade.update_stock(product, -2) for _ in range(50)
+        ))
+
+    asyncio.run(main())
+
+    assert product.quantity == 10
+    assert str(facade) == "Товары, количество продуктов: 10 шт."
+
+
+def test_async_update_stock_rejects_negative():
+    """Тест ошибки при уходе остатка в минус."""
+    category = make_category()
+    facade = AsyncCategory(category)
+    product = category.products_objects[0]
+
+    with pytest.raises(ValueError):
+        asyncio.run(facade.update_stock(product, -11))
+    assert product.quantity == 10
+
+
+def test_async_add_products_in_batches():
+    """Тест пакетного добавления товаров."""
+    category = make_category(0)
+    facade = AsyncCategory(category)
+    with quiet():
+        products = [Product(f"P{i}", "", 1.0, 1) for i in range(25)]
+
+    added = asyncio.run(facade.add_products(products, batch_size=10))
+
+    assert added == 25
+    assert len(facade.products) == 25
+    assert category.total_quantity == 25
+
+
+def test_async_set_price_with_async_policy():
+    """Тест асинхронного подтверждения понижения цены."""
+    category = make_category()
+    product = category.products_objects[0]
+    calls = []
+
+    async def confirm(product, old_price, new_price):
+        calls.append((old_price, new_price))
+        await asyncio.sleep(0)
+        return new_price >= 50.0
+
+    facade = AsyncCategory(category, price_policy=confirm)
+
+    async def main():
+        return (
+            await facade.set_price(product, 80.0),
+            await facade.set_price(product, 10.0),
+            await facade.set_price(product, 120.0),
+        )
+
+    with quiet():
+        results = asyncio.run(main())
+
+    assert results == (True, False, True)
+    assert calls == [(100.0, 80.0), (80.0, 10.0)]
+    assert product.price == 120.0
+
+
+def test_async_policy_runs_sync_policy_in_thread():
+    """Тест обычной политики, вызываемой из корутины."""
+    category = make_category()
+    product = category.products_objects[0]
+    policy = async_policy(reject_all)
+
+    assert asyncio.run(policy(product, 100.0, 50.0)) is False
+    assert async_policy(policy) is policy
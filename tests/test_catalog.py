@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+from src.catalog import Catalog
+from src.models import (Category, LawnGrass, Product, Smartphone, approve_all,
+                        price_policy, reject_all)
+
+
+@pytest.fixture
+def catalog():
+    catalog = Catalog(shard_count=4)
+    phone = Smartphone(
+        "Iphone 15", "512GB, Gray space", 210000.0, 8, 98.2, "15", 512,
+        "Gray space"
+    )
+    grass = LawnGrass(
+        "Газон", "Элитная трава", 500.0, 20, "Россия", "7 дней", "Зеленый"
+    )
+    catalog.add_category(Category("Смартфоны", "Техника", [phone]))
+    catalog.add_category(Category("Сад", "Растения", [grass]))
+    return catalog
+
+
+def test_catalog_global_dedup(catalog):
+    """Тест объединения дубликатов из разных категорий."""
+    product = catalog.add_product(
+        "Акции", {"name": "IPHONE 15", "description": "Скидка",
+                  "price": 220000.0, "quantity": 2}
+    )
+
+    phones = catalog.category("Смартфоны")
+    assert product is phones.products_objects[0]
+    assert catalog.category("Акции").products_objects == [product]
+    assert product.quantity == 10
+    assert product.price == 220000.0
+    assert phones.total_quantity == 10
+    assert len(catalog) == 2
+    assert "iphone 15" in catalog
+
+
+def test_catalog_rejects_conflicting_objects(catalog):
+    """Тест ошибки при добавлении другого объекта с тем же названием."""
+    other = Product("газон", "Другой", 100.0, 1)
+
+    with pytest.raises(ValueError):
+        catalog.add_category(Category("Другое", "Прочее", [other]))
+    with pytest.raises(ValueError):
+        catalog.add_category(Category("Сад", "Повтор"))
+    with pytest.raises(ValueError):
+        catalog.add_category(Category("Дубли", "Прочее", [
+            Product("A", "Desc", 1.0, 1), Product("a", "Desc", 12.0, 1)
+        ]))
+    assert "a" not in catalog
+
+    garden = catalog.category("Сад")
+    with pytest.raises(ValueError):
+        garden.add_product(other)
+    assert garden.products_objects == [catalog.get("газон")]
+
+
+def test_catalog_rejects_conflicting_rename(catalog):
+    """Тест отмены переименования в занятое название."""
+    phone = catalog.get("iphone 15")
+    phones = catalog.category("Смартфоны")
+    total = catalog.inventory_value().total
+
+    with pytest.raises(ValueError):
+        phone.name = "ГАЗОН"
+
+    assert phone.name == "Iphone 15"
+    assert catalog.get("iphone 15") is phone
+    assert phones.find("iphone 15") is phone
+    assert len(catalog) == 2
+    assert catalog.inventory_value().total == total
+
+    phone.name = "Iphone 15 Pro"
+    assert catalog.get("iphone 15 pro") is phone
+    assert len(catalog) == 2
+
+
+def test_catalog_subscribes_registered_products_once():
+    """Тест подписки каталога только на новые товары реестра."""
+    shared = Product("Общий", "Desc", 10.0, 1)
+    catalog = Catalog(shard_count=2)
+    catalog.add_category(Category("Первая", "Desc", [shared]))
+    catalog.add_category(Category("Вторая", "Desc", [shared, shared]))
+
+    observers = [ref() for ref in shared._observers]
+    assert observers.count(catalog) == 1
+
+
+def test_catalog_tracks_added_and_renamed_products(catalog):
+    """Тест реестра при добавлении товара в категорию и переименовании."""
+    case = Product("Чехол", "Кожаный", 1500.0, 3)
+    catalog.category("Смартфоны").add_product(case)
+    assert catalog.get("чехол") is case
+
+    case.name = "Бампер"
+    assert catalog.get("Чехол") is None
+    assert catalog.get("бампер") is case
+
+    created = catalog.add_product(
+        "Аксессуары", {"name": "Ремешок", "description": "", "price": 10.0,
+                       "quantity": 1}
+    )
+    created.name = "Браслет"
+    assert catalog.get("браслет") is created
+
+
+def test_catalog_sharded_bulk_operations(catalog, tmp_path):
+    """Тест оценки, изменения цен и выгрузки по частям."""
+    assert {catalog.shard_of("Газон"), catalog.shard_of("ГАЗОН")} == {
+        catalog.shard_of("газон")
+    }
+    assert sum(len(catalog.shard(n)) for n in range(4)) == 2
+
+    valuation = catalog.inventory_value()
+    assert valuation.total == 210000.0 * 8 + 500.0 * 20
+    assert valuation.groups[LawnGrass] == 10000.0
+
+    result = catalog.reprice(
+        lambda product: product.price * 0.9
+        if isinstance(product, Smartphone) else None,
+        policy=approve_all
+    )
+    assert len(result.applied) == 1
+    assert catalog.get("Iphone 15").price == 189000.0
+
+    paths = catalog.export(str(tmp_path))
+    rows = [
+        json.loads(line)
+        for path in paths for line in open(path, encoding="utf-8")
+    ]
+    assert len(paths) == 4
+    assert sorted(row["name"] for row in rows) == ["Iphone 15", "Газон"]
+    assert {row["type"] for row in rows} == {"Smartphone", "LawnGrass"}
+
+
+def test_catalog_bulk_operations_use_caller_context(catalog):
+    """Тест политики подтверждения из контекста вызывающего потока."""
+    with price_policy(reject_all):
+        result = catalog.reprice(lambda product: product.price / 2)
+
+    assert len(result.rejected) == 2
+    assert catalog.get("Газон").price == 500.0
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from src.changelog import ChangeLogExporter
+from src.models import Category, Product, event_bus, quiet
+
+
+def read_log(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_changelog_writes_coalesced_batches(tmp_path):
+    """Тест записи объединенных изменений пакетами."""
+    path = str(tmp_path / "changes.jsonl")
+    with quiet():
+        product = Product("Товар", "Desc", 100.0, 5)
+        category = Category("Cat", "Desc")
+
+        with ChangeLogExporter(path, batch_size=100) as exporter:
+            category.add_product(product)
+            for _ in range(3):
+                product.quantity -= 1
+            product.price = 150.0
+            product.name = "Товар 2"
+            assert read_log(path) == []
+
+            exporter.flush()
+            product.price = 160.0
+
+    assert not event_bus.active
+    assert read_log(path) == [
+        {"seq": 1, "event": "added", "id": 1, "category": "Cat",
+         "type": "Product", "name": "Товар 2", "description": "Desc",
+         "price": 150.0, "quantity": 2},
+        {"seq": 2, "event": "quantity", "id": 1, "name": "Товар 2",
+         "old": 5, "new": 2},
+        {"seq": 3, "event": "price", "id": 1, "name": "Товар 2",
+         "old": 100.0, "new": 150.0},
+        {"seq": 4, "event": "name", "id": 1, "name": "Товар 2",
+         "old": "Товар", "new": "Товар 2"},
+        {"seq": 5, "event": "price", "id": 1, "name": "Товар 2",
+         "old": 150.0, "new": 160.0},
+    ]
+
+
+def test_changelog_flushes_full_batch(tmp_path):
+    """Тест записи пакета при достижении его размера."""
+    path = str(tmp_path / "changes.jsonl")
+    with quiet():
+        products = [Product(f"P{i}", "", 10.0, 1) for i in range(3)]
+
+    exporter = ChangeLogExporter(path, batch_size=2)
+    try:
+        for product in products:
+            product.quantity = 0
+        assert [row["name"] for row in read_log(path)] == ["P0", "P1"]
+    finally:
+        exporter.close()
+    assert len(read_log(path)) == 3
+
+
+def test_changelog_continues_numbering(tmp_path):
+    """Тест продолжения нумерации при дописывании в журнал."""
+    path = str(tmp_path / "changes.jsonl")
+    with quiet():
+        first = Product("P", "", 10.0, 1)
+        second = Product("Q", "", 10.0, 1)
+
+    with ChangeLogExporter(path) as exporter:
+        first.quantity = 2
+        with pytest.raises(ValueError):
+            ChangeLogExporter(path)
+        exporter.flush()
+    with ChangeLogExporter(path):
+        second.quantity = 2
+
+    rows = read_log(path)
+    assert [(row["seq"], row["id"], row["name"]) for row in rows] == [
+        (1, 1, "P"), (2, 2, "Q")
+    ]
@@ -0,0 +1,65 @@
+from src.facets import FacetIndex
+from src.models import Category, LawnGrass, Product, Smartphone, quiet
+
+
+def make_category():
+    with quiet():
+        return Category("Товары", "Разные товары", [
+            Smartphone("A", "", 100.0, 1, 90.0, "S23", 256, "Серый"),
+            Smartphone("B", "", 200.0, 1, 95.0, "S23", 512, "Черный"),
+            Smartphone("C", "", 300.0, 1, 98.0, "15", 512, "Серый"),
+            LawnGrass("D", "", 50.0, 1, "Россия", "7 дней", "Зеленый"),
+            LawnGrass("E", "", 60.0, 1, "США", "5 дней", "Зеленый"),
+            Product("F", "", 10.0, 1),
+        ])
+
+
+def names(products):
+    return [product.name for product in products]
+
+
+def test_facet_filter_and_or():
+    """Тест фильтрации с условиями И и ИЛИ."""
+    index = FacetIndex([make_category()])
+
+    assert len(index) == 6
+    assert names(index.filter(memory=512)) == ["B", "C"]
+    assert names(index.filter(memory=512, color="Серый")) == ["C"]
+    assert names(index.filter(color=["Серый", "Зеленый"])) == [
+        "A", "C", "D", "E"
+    ]
+    assert names(index.filter(type="LawnGrass", country="США")) == ["E"]
+    assert names(index.filter(type="Product")) == ["F"]
+    assert index.filter(memory=1024) == []
+    assert index.filter(unknown=1) == []
+    assert index.count() == 6
+    assert index.count(model="S23") == 2
+
+
+def test_facet_counts_exclude_own_field():
+    """Тест подсчета значений полей для фасетной навигации."""
+    index = FacetIndex([make_category()])
+
+    counts = index.facet_counts(["memory", "color"], memory=512)
+
+    assert counts["memory"] == {512: 2, 256: 1}
+    assert counts["color"] == {"Серый": 1, "Черный": 1}
+    assert index.facet_counts(["type"])["type"] == {
+        "Smartphone": 3, "LawnGrass": 2, "Product": 1
+    }
+
+
+def test_facet_index_stays_current():
+    """Тест обновления индекса при добавлении и изменении товаров."""
+    category = make_category()
+    index = FacetIndex([category])
+
+    with quiet():
+        phone = Smartphone("G", "", 400.0, 1, 99.0, "16", 1024, "Белый")
+        category.add_product(phone)
+    assert index.filter(memory=1024) == [phone]
+
+    phone.color = "Серый"
+    index.reindex(phone)
+    assert names(index.filter(color="Серый")) == ["A", "C", "G"]
+    assert "Белый" not in index.facet_counts(["color"])["color"]
@@ -0,0 +1,220 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import loader as loader_module
+from src.loader import (CatalogLoader, load_catalog, load_catalog_parallel,
+                        parse_row, read_rows)
+from src.models import LawnGrass, Product, Smartphone
+
+CSV_FEED = (
+    "type,category,name,description,price,quantity,efficiency,model,"
+    "memory,color,country,germination_period\n"
+    "Smartphone,Смартфоны,Iphone 15,512GB,210000.0,8,98.2,15,512,Gray,,\n"
+    "Smartphone,Смартфоны,IPHONE 15,512GB,215000.0,2,98.2,15,512,Gray,,\n"
+    "LawnGrass,Сад,Газон,Элитный,500.0,20,,,,Зеленый,Россия,7 дней\n"
+)
+
+
+@pytest.fixture
+def csv_feed(tmp_path):
+    path = tmp_path / "feed.csv"
+    path.write_text(CSV_FEED, encoding="utf-8")
+    return path
+
+
+def test_read_rows_jsonl(tmp_path):
+    """Тест построчного чтения JSON Lines."""
+    path = tmp_path / "feed.jsonl"
+    path.write_text(
+        json.dumps({"name": "A"}) + "\n\n" + json.dumps({"name": "B"}) + "\n",
+        encoding="utf-8"
+    )
+
+    rows = read_rows(str(path))
+
+    assert next(rows) == {"name": "A"}
+    assert list(rows) == [{"name": "B"}]
+
+
+def test_read_rows_unknown_format(tmp_path):
+    """Тест ошибки для неизвестного формата."""
+    path = tmp_path / "feed.xml"
+    path.write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        list(read_rows(str(path)))
+
+
+def test_parse_row_converts_csv_values():
+    """Тест преобразования строковых значений CSV."""
+    row = {
+        "type": "Smartphone", "name": "Phone", "description": "Desc",
+        "price": "100.5", "quantity": "3", "efficiency": "90.0",
+        "model": "M1", "memory": "128", "color": "Black"
+    }
+
+    category, _, product_class, data = parse_row(row)
+
+    assert category == "Без категории"
+    assert product_class is Smartphone
+    assert data["price"] == 100.5
+    assert data["quantity"] == 3
+    assert data["memory"] == 128
+
+
+def test_parse_row_unknown_type():
+    """Тест ошибки для неизвестного типа товара."""
+    with pytest.raises(ValueError, match="Неизвестный тип товара"):
+        parse_row({"type": "Laptop", "name": "X"})
+
+
+def test_load_catalog_csv(csv_feed):
+    """Тест загрузки CSV с объединением дубликатов."""
+    categories, stats = load_catalog(str(csv_feed))
+
+    phones = categories["Смартфоны"].products_objects
+    assert len(phones) == 1
+    assert isinstance(phones[0], Smartphone)
+    assert phones[0].quantity == 10
+    assert phones[0].price == 215000.0
+
+    grass = categories["Сад"].products_objects
+    assert isinstance(grass[0], LawnGrass)
+    assert grass[0].country == "Россия"
+
+    assert stats.rows == 3
+    assert stats.products == 2
+    assert stats.rows_per_sec > 0
+
+
+def test_loader_tracks_memory(csv_feed):
+    """Тест измерения пикового потребления памяти."""
+    loader = CatalogLoader(track_memory=True)
+    loader.load(str(csv_feed))
+
+    assert loader.stats.peak_memory > 0
+    assert "пик памяти" in str(loader.stats)
+
+
+def test_loader_consumes_generator():
+    """Тест загрузки из генератора строк."""
+    rows = (
+        {"name": f"P{i % 2}", "description": "D", "price": 10.0,
+         "quantity": 1}
+        for i in range(4)
+    )
+    loader = CatalogLoader()
+    categories = loader.load_rows(rows)
+
+    products = categories["Без категории"].products_objects
+    assert [product.quantity for product in products] == [2, 2]
+    assert all(type(product) is Product for product in products)
+
+
+def test_load_catalog_parallel_matches_sequential(tmp_path):
+    """Тест совпадения параллельной и последовательной загрузки."""
+    path = tmp_path / "feed.jsonl"
+    rows = [
+        {"type": "Smartphone", "category": "Смартфоны",
+         "name": f"Phone {i % 5}" if i % 2 else f"PHONE {i % 5}",
+         "description": f"D{i}", "price": 100.0 + i % 7, "quantity": 1,
+         "efficiency": 90.0, "model": "M", "memory": 128, "color": "Black"}
+        for i in range(40)
+    ] + [
+        {"category": "Разное", "name": f"Товар {i % 3}", "description": "",
+         "price": 10.0 * (i % 4 + 1), "quantity": i}
+        for i in range(20)
+    ]
+    path.write_text(
+        "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows),
+        encoding="utf-8"
+    )
+
+    expected, _ = load_catalog(str(path))
+    categories, stats = load_catalog_parallel(
+        str(path), workers=2, chunk_size=7
+    )
+
+    assert list(categories) == list(expected)
+    for name, category in categories.items():
+        assert category.products == expected[name].products
+        assert [repr(product) for product in category.products_objects] == [
+            repr(product) for product in expected[name].products_objects
+        ]
+    assert stats.rows == 60
+    assert stats.products == 8
+
+
+def test_load_catalog_parallel_bounds_read_ahead(tmp_path, monkeypatch):
+    """Тест ограничения количества частей в работе."""
+    path = tmp_path / "feed.jsonl"
+    path.write_text(
+        "".join(
+            json.dumps({"name": f"Товар {i}", "description": "",
+                        "price": 10.0, "quantity": 1}) + "\n"
+            for i in range(50)
+        ),
+        encoding="utf-8"
+    )
+    counts = {"submitted": 0, "merged": 0, "window": 0}
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, *args):
+            counts["submitted"] += 1
+            counts["window"] = max(
+                counts["window"], counts["submitted"] - counts["merged"]
+            )
+            return super().submit(*args)
+
+    merge_part = loader_module._merge_part
+
+    def recording_merge(loader, future):
+        counts["merged"] += 1
+        merge_part(loader, future)
+
+    monkeypatch.setattr(loader_module, "ProcessPoolExecutor",
+                        RecordingExecutor)
+    monkeypatch.setattr(loader_module, "_merge_part", recording_merge)
+
+    categories, stats = load_catalog_parallel(
+        str(path), workers=2, chunk_size=2
+    )
+
+    assert stats.rows == 50
+    assert len(categories["Без категории"].products_objects) == 50
+    assert counts["submitted"] == 25
+    assert counts["window"] <= 4
+
+
+def test_loader_merge_sums_quantities_and_keeps_max_price():
+    """Тест слияния частей каталога по правилам new_product."""
+    first, second = CatalogLoader(), CatalogLoader()
+    first.load_rows([{"name": "Товар", "description": "A", "price": 20.0,
+                      "quantity": 2}])
+    second.load_rows([{"name": "ТОВАР", "description": "B", "price": 30.0,
+                       "quantity": 3}])
+
+    merged = CatalogLoader()
+    merged.merge(first.export())
+    merged.merge(second.export())
+
+    product, = merged.categories["Без категории"].products_objects
+    assert product.name == "Товар"
+    assert product.description == "A"
+    assert product.quantity == 5
+    assert product.price == 30.0
+
+
+def test_load_catalog_parallel_csv(csv_feed):
+    """Тест параллельной загрузки CSV с дубликатами в разных частях."""
+    categories, stats = load_catalog_parallel(
+        str(csv_feed), workers=2, chunk_size=1
+    )
+
+    phone, = categories["Смартфоны"].products_objects
+    assert phone.name == "Iphone 15"
+    assert phone.quantity == 10
+    assert phone.price == 215000.0
+    assert stats.rows == 3
@@ -0,0 +1,95 @@
+import pytest
+
+from src.mapped import MappedCatalog, write_mapped_catalog
+from src.models import Category, LawnGrass, Product, Smartphone
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    phone = Smartphone(
+        "Samsung Galaxy S23 Ultra", "256GB, Серый цвет, 200MP камера",
+        180000.0, 5, 95.5, "S23 Ultra", 256, "Серый"
+    )
+    grass = LawnGrass(
+        "Газон", "Элитная трава", 500.0, 20, "Россия", "7 дней", "Зеленый"
+    )
+    product = Product("55\" QLED 4K", "Фоновая подсветка", 123000.0, 7)
+    path = tmp_path / "catalog.map"
+    write_mapped_catalog(str(path), [
+        Category("Смартфоны", "Техника", [phone, product]),
+        Category("Сад", "Растения", [grass, product]),
+    ])
+    return str(path)
+
+
+def test_mapped_catalog_products(catalog_path):
+    """Тест чтения товаров из отображенного каталога."""
+    with MappedCatalog(catalog_path) as catalog:
+        assert len(catalog) == 3
+
+        phone = catalog[0]
+        assert phone.name == "Samsung Galaxy S23 Ultra"
+        assert phone.description == "256GB, Серый цвет, 200MP камера"
+        assert phone.price == 180000.0
+        assert phone.quantity == 5
+        assert phone.product_class == "Smartphone"
+        assert phone.memory == 256
+        assert str(phone) == (
+            "Samsung Galaxy S23 Ultra, 180000.0 руб. Остаток: 5 шт."
+        )
+
+        assert catalog[-1].country == "Россия"
+        assert catalog[1].attributes == {}
+        with pytest.raises(AttributeError):
+            catalog[1].memory
+        with pytest.raises(IndexError):
+            catalog[3]
+
+
+def test_mapped_catalog_keeps_integer_prices(tmp_path):
+    """Тест вывода целой цены так же, как у `Product`."""
+    category = Category("Разное", "Прочее", [
+        Product("Целая", "Desc", 100, 1), Product("Дробная", "Desc", 99.5, 2)
+    ])
+    path = str(tmp_path / "catalog.map")
+    write_mapped_catalog(path, [category])
+
+    with MappedCatalog(path) as catalog:
+        assert type(catalog[0].price) is int
+        assert type(catalog[1].price) is float
+        assert catalog.categories[0].products == category.products
+
+
+def test_mapped_catalog_categories(catalog_path):
+    """Тест категорий отображенного каталога."""
+    with MappedCatalog(catalog_path) as catalog:
+        phones, garden = catalog.categories
+
+        assert phones.name == "Смартфоны"
+        assert len(phones) == 2
+        assert phones.products == [
+            "Samsung Galaxy S23 Ultra, 180000.0 руб. Остаток: 5 шт.",
+            "55\" QLED 4K, 123000.0 руб. Остаток: 7 шт.",
+        ]
+        assert [product.name for product in garden] == [
+            "Газон", "55\" QLED 4K"
+        ]
+        assert str(garden) == "Сад, количество продуктов: 27 шт."
+
+
+def test_mapped_catalog_aggregates(catalog_path):
+    """Тест агрегатов по колонкам отображенного каталога."""
+    with MappedCatalog(catalog_path) as catalog:
+        assert catalog.total_quantity() == 32
+        assert catalog.inventory_value() == (
+            180000.0 * 5 + 123000.0 * 7 + 500.0 * 20
+        )
+
+
+def test_mapped_catalog_rejects_foreign_file(tmp_path):
+    """Тест ошибки при открытии постороннего файла."""
+    path = tmp_path / "other.map"
+    path.write_bytes(b"\0" * 128)
+
+    with pytest.raises(ValueError):
+        MappedCatalog(str(path))
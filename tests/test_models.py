@@ -1,6 +1,18 @@
+import gc
+import logging
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from src.models import Category, LawnGrass, Product, Smartphone
+from src.models import (_RESERVATIONS, Category, CategoryIterator, LawnGrass,
+                        NameChanged, PriceChanged, Product, ProductAdded,
+                        ProductIndex, QuantityChanged, Smartphone,
+                        approve_all, coalesce, event_bus, interactive_policy,
+                        inventory_value, is_verbose, max_drop_policy,
+                        price_policy, quiet, reject_all, reprice,
+                        set_price_policy, set_verbose)
 
 
 def test_product_creation():
@@ -427,4 +439,840 @@ def test_category_iterator_with_subclasses():
     products = list(category.products_objects)
     assert len(products) == 2
     assert isinstance(products[0], Smartphone)
-    assert isinstance(products[1], LawnGrass)
\ No newline at end of file
+    assert isinstance(products[1], LawnGrass)
+
+
+def test_new_product_with_index():
+    """Тест поиска дубликатов через индекс товаров."""
+    product = Product("Same Name", "Desc", 100.0, 5)
+    index = ProductIndex([product])
+
+    product_data = {
+        "name": "SAME name",
+        "description": "Other",
+        "price": 150.0,
+        "quantity": 3
+    }
+    result = Product.new_product(product_data, index)
+
+    assert result is product
+    assert result.quantity == 8
+    assert result.price == 150.0
+    assert len(index) == 1
+
+
+def test_new_product_registers_in_index():
+    """Тест что новый товар добавляется в индекс."""
+    index = ProductIndex()
+    product_data = {
+        "name": "Fresh",
+        "description": "Desc",
+        "price": 100.0,
+        "quantity": 2
+    }
+
+    product = Product.new_product(product_data, index)
+
+    assert "fresh" in index
+    assert index.get("FRESH") is product
+    assert Product.new_product(product_data, index) is product
+    assert product.quantity == 4
+
+
+def test_product_index_keeps_first_duplicate():
+    """Тест что индекс сохраняет первый товар, как и поиск по списку."""
+    first = Product("Dup", "Desc", 100.0, 1)
+    second = Product("dup", "Desc", 200.0, 1)
+    index = ProductIndex([first, second])
+
+    assert index.get("DUP") is first
+    assert list(index) == [first]
+
+
+def test_new_product_for_subclass():
+    """Тест создания смартфона через new_product."""
+    product_data = {
+        "name": "Phone", "description": "Desc", "price": 100.0,
+        "quantity": 1, "efficiency": 90.0, "model": "M1",
+        "memory": 128, "color": "Black"
+    }
+
+    smartphone = Smartphone.new_product(product_data)
+
+    assert isinstance(smartphone, Smartphone)
+    assert smartphone.memory == 128
+    assert smartphone.color == "Black"
+
+
+def test_creation_prints_by_default(capsys):
+    """Тест вывода сообщения о создании товара по умолчанию."""
+    Product("Loud", "Desc", 100.0, 1)
+    assert "Создан объект: Product(" in capsys.readouterr().out
+
+
+def test_quiet_creation_logs_instead_of_print(capsys, caplog):
+    """Тест тихого режима создания товаров."""
+    with caplog.at_level(logging.DEBUG, logger="src.models"):
+        with quiet():
+            assert not is_verbose()
+            Product("Silent", "Desc", 100.0, 1)
+
+    assert capsys.readouterr().out == ""
+    assert "Создан объект: Product('Silent'" in caplog.text
+    assert is_verbose()
+
+
+def test_set_verbose_disables_price_messages(capsys):
+    """Тест отключения вывода сообщений сеттера цены."""
+    product = Product("Test", "Desc", 100.0, 1)
+    capsys.readouterr()
+
+    set_verbose(False)
+    try:
+        product.price = -1
+    finally:
+        set_verbose(True)
+
+    assert capsys.readouterr().out == ""
+    assert product.price == 100.0
+
+
+def test_bulk_create(capsys):
+    """Тест массового создания товаров."""
+    rows = [
+        {"name": "A", "description": "D", "price": 10.0, "quantity": 1},
+        {"name": "B", "description": "D", "price": 20.0, "quantity": 2},
+        {"name": "a", "description": "D", "price": 15.0, "quantity": 3},
+    ]
+
+    products = Product.bulk_create(rows)
+
+    assert capsys.readouterr().out == ""
+    assert [product.name for product in products] == ["A", "B"]
+    assert products[0].quantity == 4
+    assert products[0].price == 15.0
+
+
+def test_price_decrease_interactive_by_default(monkeypatch):
+    """Тест интерактивного подтверждения понижения цены по умолчанию."""
+    product = Product("Test", "Desc", 100.0, 1)
+
+    monkeypatch.setattr("builtins.input", lambda prompt: "n")
+    product.price = 80.0
+    assert product.price == 100.0
+
+    monkeypatch.setattr("builtins.input", lambda prompt: "y")
+    product.price = 80.0
+    assert product.price == 80.0
+
+
+def test_price_policy_context(monkeypatch):
+    """Тест временной смены политики подтверждения."""
+    monkeypatch.setattr("builtins.input", pytest.fail)
+    product = Product("Test", "Desc", 100.0, 1)
+
+    with price_policy(reject_all):
+        product.price = 50.0
+    assert product.price == 100.0
+
+    with price_policy(approve_all):
+        product.price = 50.0
+    assert product.price == 50.0
+
+
+def test_set_price_policy_callback():
+    """Тест установки пользовательской политики для модуля."""
+    calls = []
+
+    def callback(product, old_price, new_price):
+        calls.append((product.name, old_price, new_price))
+        return True
+
+    product = Product("Test", "Desc", 100.0, 1)
+    set_price_policy(callback)
+    try:
+        product.price = 90.0
+    finally:
+        set_price_policy(interactive_policy)
+
+    assert calls == [("Test", 100.0, 90.0)]
+    assert product.price == 90.0
+
+
+def test_max_drop_policy():
+    """Тест политики с ограничением процента понижения."""
+    policy = max_drop_policy(10)
+    product = Product("Test", "Desc", 100.0, 1)
+
+    assert policy(product, 100.0, 90.0)
+    assert not policy(product, 100.0, 89.0)
+
+
+def test_reprice_bulk():
+    """Тест массового изменения цен."""
+    cheap = Product("Cheap", "Desc", 100.0, 1)
+    dear = Product("Dear", "Desc", 100.0, 1)
+    bad = Product("Bad", "Desc", 100.0, 1)
+
+    result = reprice(
+        [(cheap, 50.0), (dear, 95.0), (bad, -1)],
+        policy=max_drop_policy(10)
+    )
+
+    assert [change.product for change in result.applied] == [dear]
+    assert [change.product for change in result.rejected] == [cheap, bad]
+    assert result.rejected[0].old_price == 100.0
+    assert cheap.price == 100.0
+    assert dear.price == 95.0
+    assert str(result) == "Применено: 1, отклонено: 2"
+
+
+def test_reprice_accepts_dict(capsys):
+    """Тест массового изменения цен из словаря без вывода в stdout."""
+    product = Product("Test", "Desc", 100.0, 1)
+    capsys.readouterr()
+
+    result = reprice({product: 150.0})
+
+    assert len(result.applied) == 1
+    assert product.price == 150.0
+    assert capsys.readouterr().out == ""
+
+
+def test_products_have_no_instance_dict():
+    """Тест что товары хранят атрибуты в слотах."""
+    smartphone = Smartphone(
+        "Phone", "Desc", 100000.0, 2, 90.0, "M1", 128, "Black"
+    )
+    grass = LawnGrass("Grass", "Desc", 500.0, 10, "Russia", "7d", "Green")
+
+    assert not hasattr(smartphone, "__dict__")
+    assert not hasattr(grass, "__dict__")
+    with pytest.raises(AttributeError):
+        smartphone.unknown = 1
+
+
+def test_repr_uses_declared_fields():
+    """Тест представления объекта по объявленным полям."""
+    product = Product("Test", "Desc", 100.0, 5)
+    smartphone = Smartphone(
+        "Phone", "Desc", 100000.0, 2, 90.0, "M1", 128, "Black"
+    )
+
+    assert repr(product) == "Product('Test', 'Desc', 100.0, 5)"
+    assert repr(smartphone) == (
+        "Smartphone('Phone', 'Desc', 100000.0, 2, 90.0, 'M1', 128, 'Black')"
+    )
+
+
+def test_columnar_category_aggregates():
+    """Тест агрегатов колоночного хранилища категории."""
+    product1 = Product("A", "Desc", 100.0, 2)
+    product2 = Product("B", "Desc", 300.0, 1)
+    category = Category("Cat", "Desc", [product1], columnar=True)
+    category.add_product(product2)
+
+    columns = category.columns
+    assert len(columns) == 2
+    assert columns.total_stock() == 3
+    assert columns.inventory_value() == 500.0
+    assert columns.min_price() == 100.0
+    assert columns.max_price() == 300.0
+    assert columns.mean_price() == 200.0
+    assert columns.sum_where("quantity", max_price=150.0) == 2
+    assert columns.sum_where("value", min_price=150.0) == 300.0
+
+
+def test_columnar_category_follows_product_changes():
+    """Тест обновления колонок при изменении товара."""
+    product = Product("A", "Desc", 100.0, 2)
+    category = Category("Cat", "Desc", [product], columnar=True)
+
+    product.quantity += 3
+    product.price = 200.0
+
+    assert category.columns.total_stock() == 5
+    assert category.columns.inventory_value() == 1000.0
+
+
+def test_columnar_category_rename():
+    """Тест переименования товара в колоночной категории."""
+    product = Product("A", "Desc", 10.0, 2)
+    category = Category("Cat", "Desc", [product], columnar=True)
+    changes = []
+
+    class Observer:
+        def _product_changed(self, product, field, old, new):
+            changes.append((field, old, new))
+
+    observer = Observer()
+    product._subscribe(observer)
+
+    product.name = "B"
+
+    # Наблюдатели после категории тоже получают уведомление
+    assert changes == [("name", "A", "B")]
+    assert category.find("b") is product
+    assert category.columns.total_stock() == 2
+    assert category.columns.inventory_value() == 20.0
+
+
+def test_columnar_category_empty():
+    """Тест агрегатов пустого колоночного хранилища."""
+    columns = Category("Cat", "Desc", columnar=True).columns
+
+    assert columns.total_stock() == 0
+    assert columns.min_price() is None
+    assert columns.mean_price() is None
+    with pytest.raises(ValueError):
+        columns.sum_where("unknown")
+
+
+def test_category_without_columns():
+    """Тест что колоночное хранилище не создается по умолчанию."""
+    assert Category("Cat", "Desc").columns is None
+
+
+def test_category_running_totals():
+    """Тест итогов категории, обновляемых при изменениях товаров."""
+    product1 = Product("A", "Desc", 100.0, 2)
+    product2 = Product("B", "Desc", 50.0, 4)
+    category = Category("Cat", "Desc", [product1])
+
+    assert category.total_quantity == 2
+    assert category.inventory_value == 200.0
+
+    category.add_product(product2)
+    assert category.total_quantity == 6
+    assert category.inventory_value == 400.0
+
+    product1.quantity = 5
+    product2.price = 75.0
+    assert category.total_quantity == 9
+    assert category.inventory_value == 800.0
+    assert str(category) == "Cat, количество продуктов: 9 шт."
+
+
+def test_product_in_several_categories():
+    """Тест итогов для товара, входящего в несколько категорий."""
+    product = Product("A", "Desc", 10.0, 1)
+    first = Category("First", "Desc", [product])
+    second = Category("Second", "Desc", [product])
+
+    product.quantity = 3
+
+    assert first.total_quantity == 3
+    assert second.total_quantity == 3
+
+
+def test_dropped_category_stops_tracking():
+    """Тест что товар не удерживает удаленную категорию."""
+    product = Product("A", "Desc", 10.0, 1)
+    category = Category("Cat", "Desc", [product])
+    reference = weakref.ref(category)
+
+    del category
+    assert reference() is None
+
+    product.quantity = 2
+    assert product.quantity == 2
+
+
+def test_counters_are_live():
+    """Тест что счетчики класса не устаревают."""
+    before_categories = Category.category_count
+    before_products = Category.product_count
+
+    category = Category("Cat", "Desc", [Product("A", "Desc", 1.0, 1)])
+    category.add_product(Product("B", "Desc", 1.0, 1))
+
+    assert Category.category_count == before_categories + 1
+    assert Category.product_count == before_products + 2
+    assert category.category_count == Category.total_categories
+    assert category.product_count == 2
+
+
+def test_live_category_registry():
+    """Тест реестра существующих категорий."""
+    category = Category("Live", "Desc", [Product("A", "Desc", 1.0, 3)])
+    live_count = Category.live_category_count()
+
+    assert category in Category.live_categories()
+    assert Category.live_product_count() >= 1
+
+    del category
+    gc.collect()
+    assert Category.live_category_count() == live_count - 1
+
+
+def test_counters_under_threads():
+    """Стресс-тест точности счетчиков при работе из нескольких потоков."""
+    threads, tasks, per_task = 8, 50, 20
+    shared = Category("Shared", "Desc")
+    before_categories = Category.total_categories
+    before_products = Category.total_products
+
+    def build(task):
+        with quiet():
+            products = [
+                Product(f"P{task}-{i}", "Desc", 10.0, 1)
+                for i in range(per_task)
+            ]
+        category = Category(f"Cat{task}", "Desc", products[:1])
+        for product in products[1:]:
+            category.add_product(product)
+        for product in products:
+            shared.add_product(product)
+            product.quantity += 1
+        return category
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            categories = list(executor.map(build, range(tasks)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert Category.total_categories == before_categories + tasks
+    assert Category.total_products == before_products + 2 * tasks * per_task
+    assert shared.product_count == tasks * per_task
+    assert shared.total_quantity == 2 * tasks * per_task
+    assert shared.inventory_value == 20.0 * tasks * per_task
+    assert all(category.total_quantity == 2 * per_task
+               for category in categories)
+
+
+def test_product_str_cache_invalidation():
+    """Тест сброса кэша строки товара при изменении полей."""
+    product = Product("Test", "Desc", 100.0, 5)
+    assert str(product) == "Test, 100.0 руб. Остаток: 5 шт."
+
+    product.name = "Renamed"
+    product.price = 120.0
+    product.quantity = 7
+
+    assert str(product) == "Renamed, 120.0 руб. Остаток: 7 шт."
+
+
+def test_products_property_is_cached_copy():
+    """Тест кэширования списка строк категории."""
+    product = Product("A", "Desc", 100.0, 1)
+    category = Category("Cat", "Desc", [product])
+
+    lines = category.products
+    lines.append("external")
+    assert category.products == ["A, 100.0 руб. Остаток: 1 шт."]
+
+    product.quantity = 2
+    category.add_product(Product("B", "Desc", 50.0, 1))
+    assert category.products == [
+        "A, 100.0 руб. Остаток: 2 шт.",
+        "B, 50.0 руб. Остаток: 1 шт.",
+    ]
+
+
+def test_products_view_and_page():
+    """Тест ленивого представления и постраничного вывода товаров."""
+    products = [Product(f"P{i}", "Desc", 10.0, i) for i in range(5)]
+    category = Category("Cat", "Desc", products)
+
+    view = category.products_view
+    assert len(view) == 5
+    assert view[0] == "P0, 10.0 руб. Остаток: 0 шт."
+    assert view[-1] == "P4, 10.0 руб. Остаток: 4 шт."
+    assert view[1:3] == category.products[1:3]
+    assert category.products_page(offset=3) == category.products[3:]
+    assert category.products_page(offset=1, limit=2) == view[1:3]
+
+
+def test_category_find_by_name():
+    """Тест поиска товара категории по названию."""
+    product = Product("Iphone 15", "Desc", 100.0, 1)
+    category = Category("Cat", "Desc", [product])
+
+    assert category.find("IPHONE 15") is product
+    assert category.find("Missing") is None
+
+    product.name = "Iphone 16"
+    assert category.find("iphone 15") is None
+    assert category.find("iphone 16") is product
+
+
+def test_category_rename_keeps_other_duplicate():
+    """Тест что после переименования находится другой товар с названием."""
+    first = Product("Same", "Desc", 100.0, 1)
+    second = Product("same", "Desc", 200.0, 1)
+    category = Category("Cat", "Desc", [first, second])
+
+    first.name = "Other"
+
+    assert category.find("SAME") is second
+    assert category.find("other") is first
+
+
+def test_category_price_range():
+    """Тест запроса товаров по диапазону цен."""
+    cheap = Product("Cheap", "Desc", 10.0, 1)
+    middle = Product("Middle", "Desc", 50.0, 1)
+    dear = Product("Dear", "Desc", 100.0, 1)
+    category = Category("Cat", "Desc", [dear, cheap, middle])
+
+    assert category.products_in_price_range() == [cheap, middle, dear]
+    assert category.products_in_price_range(20.0, 100.0) == [middle, dear]
+    assert category.products_in_price_range(max_price=50.0) == [
+        cheap, middle
+    ]
+
+    cheap.price = 200.0
+    assert category.products_in_price_range(min_price=150.0) == [cheap]
+    assert category.products_in_price_range(max_price=20.0) == []
+
+
+def test_category_price_range_after_bulk_changes():
+    """Тест индекса цен после многих изменений до запроса."""
+    products = [Product(f"P{i}", "Desc", 10.0 + i, 1) for i in range(200)]
+    category = Category("Cat", "Desc", products)
+
+    # Несколько изменений переносятся по одному, в том числе повторные
+    products[0].price = 500.0
+    products[0].price = 600.0
+    assert category.products_in_price_range(min_price=300.0) == [
+        products[0]
+    ]
+
+    # Много изменений применяются пересортировкой
+    with price_policy(approve_all):
+        for product in products:
+            product.price = 1000.0 - product.price
+    prices = [p.price for p in category.products_in_price_range()]
+    assert prices == sorted(prices)
+    assert category.products_in_price_range(max_price=400.0) == [
+        products[0]
+    ]
+
+
+def test_category_price_range_with_repeated_product():
+    """Тест индекса цен для товара, добавленного дважды."""
+    product = Product("X", "Desc", 10.0, 1)
+    # Остальные товары нужны, чтобы изменение применялось без
+    # пересортировки индекса
+    others = [Product(f"P{i}", "Desc", 100.0, 1) for i in range(200)]
+    category = Category("Cat", "Desc", [product, product] + others)
+
+    product.price = 500.0
+
+    assert category.products_in_price_range(0.0, 50.0) == []
+    assert category.products_in_price_range(min_price=500.0) == [
+        product, product
+    ]
+
+
+def test_category_products_by_type():
+    """Тест выборки товаров по типу."""
+    product = Product("Product", "Desc", 100.0, 5)
+    smartphone = Smartphone(
+        "Phone", "Desc", 100000.0, 2, 90.0, "M1", 128, "Black"
+    )
+    grass = LawnGrass("Grass", "Desc", 500.0, 10, "Russia", "7d", "Green")
+    category = Category("Cat", "Desc", [product, smartphone, grass])
+
+    assert category.products_by_type(Smartphone) == [smartphone]
+    assert category.products_by_type(Product, exact=True) == [product]
+    assert len(category.products_by_type(Product)) == 3
+
+
+def test_category_iteration():
+    """Тест перебора товаров категории."""
+    products = [Product(f"P{i}", "Desc", 10.0, i) for i in range(3)]
+    category = Category("Cat", "Desc", products)
+
+    assert list(category) == products
+    assert list(CategoryIterator(category)) == products
+
+
+def test_category_iterator_detects_modification():
+    """Тест ошибки при изменении категории во время перебора."""
+    category = Category("Cat", "Desc", [Product("A", "Desc", 10.0, 1)])
+    iterator = CategoryIterator(category)
+
+    next(iterator)
+    category.add_product(Product("B", "Desc", 10.0, 1))
+
+    with pytest.raises(RuntimeError):
+        next(iterator)
+
+
+def test_category_snapshot_iteration():
+    """Тест перебора снимка категории."""
+    first = Product("A", "Desc", 10.0, 1)
+    category = Category("Cat", "Desc", [first])
+
+    snapshot = category.iter_snapshot()
+    category.add_product(Product("B", "Desc", 10.0, 1))
+
+    assert list(snapshot) == [first]
+
+
+def test_category_filtered_iteration():
+    """Тест фильтрующих итераторов категории."""
+    product = Product("Product", "Desc", 100.0, 0)
+    smartphone = Smartphone(
+        "Phone", "Desc", 100000.0, 2, 90.0, "M1", 128, "Black"
+    )
+    grass = LawnGrass("Grass", "Desc", 500.0, 10, "Russia", "7d", "Green")
+    category = Category("Cat", "Desc", [product, smartphone, grass])
+
+    assert list(category.iter_by_type(LawnGrass)) == [grass]
+    assert list(category.iter_by_type(Product, exact=True)) == [product]
+    assert list(category.iter_price_range(200.0, 1000.0)) == [grass]
+    assert list(category.iter_in_stock()) == [smartphone, grass]
+    assert list(category.iter_filtered(
+        lambda item: item.name.startswith("P")
+    )) == [product, smartphone]
+
+
+def test_sum_of_products():
+    """Тест суммирования стоимости товаров через sum и цепочку +."""
+    product1 = Product("A", "Desc", 100.0, 2)
+    product2 = Product("B", "Desc", 200.0, 3)
+    product3 = Product("C", "Desc", 10.0, 1)
+
+    assert sum([product1, product2, product3]) == 810.0
+    assert product1 + product2 + product3 == 810.0
+
+
+def test_inventory_value_by_class():
+    """Тест стоимости товаров по классам."""
+    product = Product("Product", "Desc", 100.0, 5)
+    smartphone = Smartphone(
+        "Phone", "Desc", 1000.0, 2, 90.0, "M1", 128, "Black"
+    )
+    grass = LawnGrass("Grass", "Desc", 50.0, 10, "Russia", "7d", "Green")
+
+    valuation = inventory_value([product, smartphone, grass])
+
+    assert valuation.total == 3000.0
+    assert valuation.groups == {
+        Product: 500.0, Smartphone: 2000.0, LawnGrass: 500.0
+    }
+    assert inventory_value([product], group_by=None).groups == {}
+
+
+def test_inventory_value_strict():
+    """Тест строгого режима оценки стоимости."""
+    product = Product("Product", "Desc", 100.0, 5)
+    grass = LawnGrass("Grass", "Desc", 50.0, 10, "Russia", "7d", "Green")
+
+    with pytest.raises(TypeError, match="разных классов"):
+        inventory_value([product, grass], strict=True)
+    with pytest.raises(TypeError, match="только объекты класса Product"):
+        inventory_value([product, 1])
+    assert inventory_value([product, product], strict=True).total == 1000.0
+
+
+def test_category_total_value_and_valuation():
+    """Тест стоимости товаров категории."""
+    product = Product("Product", "Desc", 100.0, 5)
+    grass = LawnGrass("Grass", "Desc", 50.0, 10, "Russia", "7d", "Green")
+    category = Category("Cat", "Desc", [product, grass])
+
+    assert category.total_value() == 1000.0
+    with pytest.raises(TypeError):
+        category.total_value(strict=True)
+
+    valuation = category.valuation()
+    assert valuation.total == 1000.0
+    assert valuation.groups == {Product: 500.0, LawnGrass: 500.0}
+
+    by_name = category.valuation(group_by=lambda item: item.name[0])
+    assert by_name.groups == {"P": 500.0, "G": 500.0}
+
+
+def test_repr_cache_follows_field_changes():
+    """Тест повторного использования и обновления кэша представления."""
+    smartphone = Smartphone(
+        "Phone", "Desc", 100000.0, 2, 90.0, "M1", 128, "Black"
+    )
+
+    first = repr(smartphone)
+    assert repr(smartphone) is first
+
+    smartphone.color = "White"
+    assert repr(smartphone) == (
+        "Smartphone('Phone', 'Desc', 100000.0, 2, 90.0, 'M1', 128, 'White')"
+    )
+    smartphone.price = 100001
+    smartphone.quantity += 1
+    assert repr(smartphone) == (
+        "Smartphone('Phone', 'Desc', 100001, 3, 90.0, 'M1', 128, 'White')"
+    )
+
+    # Равные значения другого типа выводятся по-новому
+    smartphone.memory = 128.0
+    smartphone.efficiency = 90
+    assert repr(smartphone) == (
+        "Smartphone('Phone', 'Desc', 100001, 3, 90, 'M1', 128.0, 'White')"
+    )
+
+    # Строка и `repr` хранятся в одном кэше и не вытесняют друг друга
+    line = str(smartphone)
+    assert str(smartphone) is line
+    assert repr(smartphone) is repr(smartphone)
+    assert str(smartphone) is line
+    smartphone.quantity = 1
+    assert str(smartphone) == "Phone, 100001 руб. Остаток: 1 шт."
+
+
+def test_repr_skips_fields_not_set_yet(capsys):
+    """Тест представления при создании подкласса до задания его полей."""
+    set_verbose(True)
+    Smartphone("Phone", "Desc", 100000.0, 2, 90.0, "M1", 128, "Black")
+
+    assert capsys.readouterr().out == (
+        "Создан объект: Smartphone('Phone', 'Desc', 100000.0, 2)\n"
+    )
+
+
+def test_product_reserve_commit_release():
+    """Тест резервирования, списания и снятия резерва товара."""
+    product = Product("Товар", "Desc", 100.0, 5)
+    category = Category("Cat", "Desc", [product])
+
+    assert product.reserve(3)
+    assert not product.reserve(3)
+    assert product.reserved == 3
+    assert product.available == 2
+
+    product.commit(2)
+    product.release(1)
+
+    assert product.quantity == 3
+    assert product.reserved == 0
+    assert product not in _RESERVATIONS
+    assert category.total_quantity == 3
+    with pytest.raises(ValueError):
+        product.commit(1)
+    with pytest.raises(ValueError):
+        product.reserve(0)
+
+
+def test_category_reserve_all_or_nothing():
+    """Тест пакетного резервирования нескольких товаров."""
+    first = Product("A", "Desc", 100.0, 5)
+    second = Product("B", "Desc", 200.0, 1)
+    category = Category("Cat", "Desc", [first, second])
+
+    assert not category.reserve({first: 2, second: 2})
+    assert first.reserved == 0
+
+    assert category.reserve([(first, 2), (second, 1), (first, 1)])
+    assert first.reserved == 3
+    with pytest.raises(ValueError):
+        category.commit({first: 3, second: 2})
+    assert first.reserved == 3
+
+    category.commit({first: 3, second: 1})
+    assert (first.quantity, second.quantity) == (2, 0)
+    assert category.total_quantity == 2
+    assert category.inventory_value == 200.0
+
+
+def test_reserve_from_threads_never_oversells():
+    """Тест резервирования одного товара из нескольких потоков."""
+    product = Product("Товар", "Desc", 100.0, 500)
+    category = Category("Cat", "Desc", [product])
+
+    def checkout(_):
+        sold = 0
+        for _ in range(100):
+            if category.reserve({product: 1}):
+                category.commit({product: 1})
+                sold += 1
+        return sold
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        sold = sum(executor.map(checkout, range(8)))
+
+    assert sold == 500
+    assert product.quantity == 0
+    assert product.reserved == 0
+    assert category.total_quantity == 0
+
+
+def test_new_product_merges_quantity_from_threads():
+    """Тест объединения количеств дубликатов из нескольких потоков."""
+    index = ProductIndex([Product("Товар", "Desc", 100.0, 0)])
+    data = {"name": "товар", "description": "Desc", "price": 100.0,
+            "quantity": 1}
+
+    def merge(_):
+        for _ in range(200):
+            Product.new_product(data, index)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(merge, range(8)))
+
+    assert index.get("Товар").quantity == 1600
+
+
+def test_event_bus_publishes_typed_events():
+    """Тест событий изменения товаров и добавления в категорию."""
+    events = []
+    prices = []
+    event_bus.subscribe(events.append)
+    event_bus.subscribe(prices.append, PriceChanged)
+    try:
+        product = Product("Товар", "Desc", 100.0, 5)
+        category = Category("Cat", "Desc")
+        category.add_product(product)
+        product.price = 120.0
+        product.quantity -= 2
+        product.name = "Новый товар"
+    finally:
+        event_bus.unsubscribe(events.append)
+        event_bus.unsubscribe(prices.append)
+
+    assert events == [
+        ProductAdded(category, product),
+        PriceChanged(product, 100.0, 120.0),
+        QuantityChanged(product, 5, 3),
+        NameChanged(product, "Товар", "Новый товар"),
+    ]
+    assert prices == [PriceChanged(product, 100.0, 120.0)]
+    assert not event_bus.active
+
+    product.price = 130.0
+    assert len(events) == 4
+
+
+def test_coalesce_merges_changes_of_one_field():
+    """Тест объединения изменений одного поля одного товара."""
+    first = Product("A", "Desc", 100.0, 5)
+    second = Product("B", "Desc", 100.0, 5)
+    category = Category("Cat", "Desc")
+
+    events = coalesce([
+        QuantityChanged(first, 5, 4),
+        ProductAdded(category, second),
+        PriceChanged(second, 100.0, 90.0),
+        QuantityChanged(first, 4, 2),
+        PriceChanged(second, 90.0, 100.0),
+        ProductAdded(category, second),
+    ])
+
+    assert events == [
+        ProductAdded(category, second),
+        QuantityChanged(first, 5, 2),
+        ProductAdded(category, second),
+    ]
+
+    # Изменение после добавления товара остается после добавления
+    assert coalesce([
+        PriceChanged(second, 100.0, 90.0),
+        ProductAdded(category, second),
+        PriceChanged(second, 90.0, 80.0),
+    ]) == [
+        ProductAdded(category, second),
+        PriceChanged(second, 100.0, 80.0),
+    ]
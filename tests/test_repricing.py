@@ -0,0 +1,133 @@
+import pytest
+
+from src.models import Category, LawnGrass, Smartphone, reject_all
+from src.repricing import Rule, plan_repricing
+
+
+@pytest.fixture
+def category():
+    return Category("Товары", "Разное", [
+        Smartphone("Iphone 15", "512GB", 200000.0, 8, 98.2, "15", 512,
+                   "Gray space"),
+        Smartphone("Xiaomi", "128GB", 30000.0, 10, 90.0, "Note 11", 128,
+                   "Синий"),
+        LawnGrass("Газон", "Элитная трава", 500.0, 20, "Россия", "7 дней",
+                  "Зеленый"),
+        LawnGrass("Трава", "Для дачи", 300.0, 5, "США", "5 дней",
+                  "Темно-зеленый"),
+    ])
+
+
+@pytest.fixture
+def rules():
+    return [
+        Rule.percent(-10, Smartphone, memory=lambda memory: memory >= 512),
+        Rule.percent(5, LawnGrass, country="Россия"),
+    ]
+
+
+def test_plan_is_dry_run(category, rules):
+    """Тест составления плана без изменения цен."""
+    plan = plan_repricing(category, rules)
+
+    assert len(plan) == 2
+    assert [change.new_price for change in plan.changes] == [
+        180000.0, 525.0
+    ]
+    assert category.products_objects[0].price == 200000.0
+    assert category.products_objects[2].price == 500.0
+    report = plan.report()
+    assert "Iphone 15: 200000.0 -> 180000.0 (-10.0 %) " \
+           "[Smartphone -10 %]" in report
+    assert "Газон: 500.0 -> 525.0 (+5.0 %)" in report
+    assert report.endswith("Изменений цен: 2, отклонено проверкой: 0")
+
+
+def test_plan_apply(category, rules):
+    """Тест применения плана."""
+    result = plan_repricing(category, rules).apply()
+
+    assert len(result.applied) == 2
+    assert result.rejected == []
+    assert category.products_objects[0].price == 180000.0
+    assert category.products_objects[2].price == 525.0
+    assert category.products_objects[1].price == 30000.0
+
+
+def test_plan_apply_with_policy(category, rules):
+    """Тест применения плана с отклонением понижений цены."""
+    result = plan_repricing(category, rules).apply(reject_all)
+
+    assert [change.product.name for change in result.applied] == ["Газон"]
+    assert [change.product.name for change in result.rejected] == [
+        "Iphone 15"
+    ]
+    assert category.products_objects[0].price == 200000.0
+
+
+def test_plan_apply_skips_stale(category, rules):
+    """Тест пропуска товаров, цена которых изменилась после плана."""
+    plan = plan_repricing(category, rules)
+    category.products_objects[2].price = 600.0
+
+    result = plan.apply()
+
+    assert [change.product.name for change in result.rejected] == ["Газон"]
+    assert category.products_objects[2].price == 600.0
+
+
+def test_rules_compound(category):
+    """Тест последовательного применения нескольких правил."""
+    plan = plan_repricing(category, [
+        Rule.percent(10, Smartphone),
+        Rule.percent(-50, Smartphone, model="Note 11", name="Распродажа"),
+    ])
+
+    xiaomi = plan.changes[1]
+    assert xiaomi.new_price == 16500.0
+    assert xiaomi.rules == ["Smartphone +10 %", "Распродажа"]
+
+
+def test_invalid_prices(category):
+    """Тест отклонения нулевых и отрицательных цен."""
+    plan = plan_repricing(category, [
+        Rule("Бесплатно", lambda price: 0.0, LawnGrass, country="США"),
+    ])
+
+    assert len(plan) == 0
+    assert [change.product.name for change in plan.invalid] == ["Трава"]
+    assert "Цена должна быть больше нуля:" in plan.report()
+    plan.apply()
+    assert category.products_objects[3].price == 300.0
+
+
+def test_condition_type_mismatch(category):
+    """Тест сравнения значений разных типов."""
+    plan = plan_repricing(
+        category, [Rule.percent(10, Smartphone, memory="512")]
+    )
+
+    assert len(plan) == 0
+
+
+def test_repeated_product_changed_once(category, rules):
+    """Тест однократного изменения товара, входящего в набор дважды."""
+    phone = category.products_objects[0]
+    category.add_product(phone)
+
+    plan = plan_repricing(category, rules)
+    change = plan.changes[0]
+    assert change.new_price == 180000.0
+    assert change.rules == ["Smartphone -10 %"]
+
+    plan = plan_repricing(category.products_objects + [phone], rules)
+    assert plan.changes[0].new_price == 180000.0
+
+
+def test_plan_for_product_list(category, rules):
+    """Тест составления плана по списку товаров."""
+    products = category.products_objects[1:]
+
+    plan = plan_repricing(products, rules)
+
+    assert [change.product.name for change in plan.changes] == ["Газон"]
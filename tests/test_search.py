@@ -0,0 +1,89 @@
+from src.models import Category, LawnGrass, Product, Smartphone, quiet
+from src.search import SearchIndex, tokenize
+
+
+def make_categories():
+    with quiet():
+        phones = Category("Смартфоны", "Техника", [
+            Smartphone(
+                "Samsung Galaxy S23 Ultra", "256GB, Серый цвет, 200MP камера",
+                180000.0, 5, 95.5, "S23 Ultra", 256, "Серый"
+            ),
+            Smartphone(
+                "Iphone 15", "512GB, Gray space", 210000.0, 8, 98.2, "15",
+                512, "Gray space"
+            ),
+        ])
+        garden = Category("Сад", "Растения", [
+            LawnGrass(
+                "Газонная трава", "Элитная трава для газона", 500.0, 20,
+                "Россия", "7 дней", "Зелёный"
+            ),
+        ])
+    return phones, garden
+
+
+def test_tokenize_folds_case_and_yo():
+    """Тест разбиения текста на слова с приведением регистра и «ё»."""
+    assert tokenize("Зелёный ЦВЕТ, 200MP-камера") == [
+        "зеленый", "цвет", "200mp", "камера"
+    ]
+    assert tokenize(None) == []
+
+
+def test_search_across_categories():
+    """Тест поиска по нескольким категориям."""
+    phones, garden = make_categories()
+    index = SearchIndex([phones, garden])
+
+    samsung, iphone = phones.products_objects
+    grass, = garden.products_objects
+
+    assert len(index) == 3
+    assert index.search("серый") == [samsung]
+    assert index.search("ЗЕЛЕНЫЙ") == []
+    assert index.search("трава") == [grass]
+    assert index.search("gb") == []
+    assert index.search("256gb камера") == [samsung]
+    assert index.search("нет такого") == []
+
+
+def test_search_prefix_and_ranking():
+    """Тест поиска по префиксу и ранжирования результатов."""
+    phones, garden = make_categories()
+    index = SearchIndex([phones, garden])
+    samsung, iphone = phones.products_objects
+    grass, = garden.products_objects
+
+    assert index.search("газон") == [grass]
+    assert index.search("gal") == [samsung]
+    assert index.search("gal", prefix=False) == []
+    # «galaxy» в названии весит больше, чем «gray» в описании
+    assert index.search("g") == [samsung, iphone]
+
+    results = index.search_scored("g", limit=1)
+    assert [product for product, _ in results] == [samsung]
+    assert results[0][1] > 0
+
+
+def test_search_updates_incrementally():
+    """Тест обновления индекса при добавлении и переименовании товаров."""
+    phones, garden = make_categories()
+    index = SearchIndex([phones, garden])
+
+    with quiet():
+        case = Product("Чехол", "Кожаный чехол для смартфона", 1500.0, 3)
+        phones.add_product(case)
+        garden.add_product(case)
+
+    assert len(index) == 4
+    assert index.search("кожан") == [case]
+
+    case.name = "Бампер"
+    assert index.search("чехол") == [case]
+    assert index.search("бамп") == [case]
+
+    case.description = "Силиконовый"
+    index.reindex(case)
+    assert index.search("чехол") == []
+    assert index.search("силикон") == [case]
@@ -0,0 +1,81 @@
+import pytest
+
+from src.models import Category, LawnGrass, Product, Smartphone
+from src.snapshot import load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def catalog():
+    phone = Smartphone(
+        "Iphone 15", "512GB, Gray space", 210000.0, 8,
+        98.2, "15", 512, "Gray space"
+    )
+    grass = LawnGrass(
+        "Газон", "Элитная трава", 500.0, 20, "Россия", "7 дней", "Зеленый"
+    )
+    product = Product("55\" QLED 4K", "Фоновая подсветка", 123000, 7)
+    return [
+        Category("Смартфоны", "Техника", [phone, product], columnar=True),
+        Category("Сад", "Растения", [grass, product]),
+    ]
+
+
+def test_snapshot_roundtrip(tmp_path, catalog):
+    """Тест сохранения и загрузки каталога."""
+    path = tmp_path / "catalog.bin"
+
+    assert save_snapshot(str(path), catalog) == 3
+    phones, garden = load_snapshot(str(path))
+
+    assert phones.name == "Смартфоны"
+    assert garden.description == "Растения"
+    assert phones.products == catalog[0].products
+    assert garden.products == catalog[1].products
+    assert phones.columns is not None
+    assert garden.columns is None
+
+    phone = phones.products_objects[0]
+    assert isinstance(phone, Smartphone)
+    assert (phone.efficiency, phone.model, phone.memory, phone.color) == (
+        98.2, "15", 512, "Gray space"
+    )
+    grass = garden.products_objects[0]
+    assert isinstance(grass, LawnGrass)
+    assert grass.country == "Россия"
+    assert repr(grass) == repr(catalog[1].products_objects[0])
+
+
+def test_snapshot_keeps_shared_products(tmp_path, catalog):
+    """Тест что общий для категорий товар загружается одним объектом."""
+    path = tmp_path / "catalog.bin"
+    save_snapshot(str(path), catalog)
+
+    phones, garden = load_snapshot(str(path))
+    shared = phones.products_objects[1]
+
+    assert shared is garden.products_objects[1]
+    assert shared.price == 123000
+    assert isinstance(shared.price, int)
+    shared.quantity = 10
+    assert phones.total_quantity == 18
+    assert garden.total_quantity == 30
+
+
+def test_snapshot_load_is_silent(tmp_path, catalog, capsys):
+    """Тест что загрузка не вызывает конструкторы товаров."""
+    path = tmp_path / "catalog.bin"
+    save_snapshot(str(path), catalog)
+    capsys.readouterr()
+
+    load_snapshot(str(path))
+
+    assert capsys.readouterr().out == ""
+
+
+def test_snapshot_rejects_foreign_file(tmp_path):
+    """Тест ошибки при загрузке постороннего файла."""
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a catalog")
+
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
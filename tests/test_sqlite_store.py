@@ -0,0 +1,139 @@
+import pytest
+
+from src.models import Category, LawnGrass, Product, Smartphone, quiet
+from src.sqlite_store import SQLiteStore
+
+
+@pytest.fixture
+def category():
+    with quiet():
+        phone = Smartphone(
+            "Samsung Galaxy S23 Ultra", "256GB, Серый цвет, 200MP камера",
+            180000.0, 5, 95.5, "S23 Ultra", 256, "Серый"
+        )
+        grass = LawnGrass(
+            "Газон", "Элитная трава", 500.0, 20, "Россия", "7 дней",
+            "Зеленый"
+        )
+        return Category("Товары", "Разные товары", [phone, grass])
+
+
+def test_store_attach_and_query(category):
+    """Тест сохранения категории и запросов к базе данных."""
+    with SQLiteStore() as store:
+        store.attach(category)
+
+        assert store.category_names() == ["Товары"]
+        assert store.products("Товары") == category.products
+        assert store.total_quantity("Товары") == 25
+        assert store.inventory_value("Товары") == 180000.0 * 5 + 500.0 * 20
+        assert store.find("газон") is category.products_objects[1]
+        assert store.find("Нет такого") is None
+        assert store.products_in_price_range(max_price=1000.0) == [
+            category.products_objects[1]
+        ]
+
+
+def test_store_writes_changes(category):
+    """Тест записи добавления товаров и изменения цен и количеств."""
+    with SQLiteStore() as store:
+        store.attach(category)
+        with quiet():
+            category.add_product(Product("Чехол", "Кожаный", 1500.0, 3))
+            Product.new_product(
+                {"name": "газон", "description": "Элитная трава",
+                 "price": 600.0, "quantity": 5},
+                category.products_objects
+            )
+        phone = category.products_objects[0]
+        phone.name = "Samsung Galaxy S24"
+
+        assert store.products("Товары") == category.products
+        assert store.total_quantity("Товары") == 33
+        assert store.find("samsung galaxy s24") is phone
+
+
+def test_store_attach_is_idempotent(category, tmp_path):
+    """Тест повторного подключения категории."""
+    path = str(tmp_path / "catalog.db")
+    with SQLiteStore(path) as store:
+        store.attach(category)
+    with SQLiteStore(path) as store:
+        loaded = store.load_category("Товары")
+        store.attach(loaded)
+        store.attach(loaded)
+        with quiet():
+            loaded.add_product(Product("Чехол", "Кожаный", 1500.0, 3))
+
+        assert store.products("Товары") == loaded.products
+        assert store.total_quantity("Товары") == loaded.total_quantity
+
+        other = Category("Товары", "Копия")
+        with pytest.raises(ValueError):
+            store.attach(other)
+        with quiet():
+            other.add_product(Product("Лишний", "", 10.0, 1))
+        assert store.products("Товары") == loaded.products
+
+
+def test_store_attach_rejects_stored_name(category, tmp_path):
+    """Тест ошибки при подключении новой категории с сохраненным именем."""
+    path = str(tmp_path / "catalog.db")
+    with SQLiteStore(path) as store:
+        store.attach(Category("Товары", "Старая", [
+            Product("P1", "", 10.0, 1)
+        ]))
+        # Первая категория уже удалена сборщиком мусора
+        with pytest.raises(ValueError):
+            store.attach(category)
+        assert store.products("Товары") == ["P1, 10.0 руб. Остаток: 1 шт."]
+
+    with SQLiteStore(path) as store:
+        with pytest.raises(ValueError):
+            store.attach(category)
+        assert store.products("Товары") == ["P1, 10.0 руб. Остаток: 1 шт."]
+        assert store.load_category("Товары").products == store.products(
+            "Товары"
+        )
+
+
+def test_store_batches_writes(category):
+    """Тест пакетной записи изменений."""
+    with SQLiteStore(batch_size=3) as store:
+        store.attach(category)
+        statements = []
+        store.connection.set_trace_callback(statements.append)
+
+        with quiet():
+            for i in range(3):
+                category.add_product(Product(f"Товар {i}", "", 10.0, 1))
+
+        commits = [sql for sql in statements if sql == "COMMIT"]
+        assert len(commits) == 1
+
+
+def test_store_reload(category, tmp_path):
+    """Тест загрузки категории после повторного открытия базы."""
+    path = str(tmp_path / "catalog.db")
+    with SQLiteStore(path) as store:
+        store.attach(category)
+        category.products_objects[1].quantity = 7
+
+    with SQLiteStore(path) as store:
+        loaded = store.load_category("Товары")
+        phone, grass = loaded.products_objects
+
+        assert loaded.description == "Разные товары"
+        assert loaded.products == category.products
+        assert isinstance(phone, Smartphone)
+        assert phone.memory == 256
+        assert grass.quantity == 7
+        assert store.find("Газон") is grass
+
+        with quiet():
+            loaded.add_product(Product("Чехол", "Кожаный", 1500.0, 3))
+        assert store.products("Товары")[-1] == (
+            "Чехол, 1500.0 руб. Остаток: 3 шт."
+        )
+        with pytest.raises(KeyError):
+            store.load_category("Нет такой")
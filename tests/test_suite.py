@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from benchmarks import suite
+
+
+@pytest.fixture
+def timings(monkeypatch):
+    """Подменяет замеры одним замером с заданным временем."""
+    values = {"stub": 1.0}
+    monkeypatch.setattr(suite, "CASES", [
+        ("stub", True, lambda: (lambda: None)),
+    ])
+    monkeypatch.setattr(suite, "measure", lambda function: values["stub"])
+    return values
+
+
+def test_compare_reports_regressions_over_threshold():
+    """Тест сравнения результатов с базовыми значениями."""
+    baseline = {"fast": 1.0, "slow": 1.0}
+    results = {"fast": 1.1, "slow": 1.3, "new": 5.0}
+
+    assert suite.compare(results, baseline, 0.2) == ["slow"]
+    assert suite.compare(results, baseline, 0.5) == []
+    assert suite.missing(results, baseline) == ["new"]
+
+
+def test_main_exit_codes(timings, tmp_path, capsys):
+    """Тест кодов завершения при сохранении и проверке базовых значений."""
+    path = str(tmp_path / "baseline.json")
+
+    assert suite.main(["--baseline", path]) == 0
+    assert "Нет базовых значений, замеры не проверены: stub" in (
+        capsys.readouterr().out
+    )
+
+    assert suite.main(["--baseline", path, "--save"]) == 0
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["results"] == {"stub": 1.0}
+
+    timings["stub"] = 1.1
+    assert suite.main(["--baseline", path]) == 0
+
+    timings["stub"] = 1.5
+    assert suite.main(["--baseline", path]) == 1
+    assert "Замедление больше 20%: stub" in capsys.readouterr().out
+    assert suite.main(["--baseline", path, "--threshold", "0.6"]) == 0